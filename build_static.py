@@ -7,66 +7,62 @@ For use with GitHub Actions + Netlify
 import os
 import json
 import shutil
-from jinja2 import Environment, FileSystemLoader, select_autoescape
-from datetime import datetime, timedelta
+import argparse
+from jinja2 import Environment, FileSystemLoader, pass_context, select_autoescape
 import sys
 
+from scraper.article import load_articles
+from scraper.dates import normalize_dates, parse_timestamp
+from scraper.fulltext import read_body
+from scraper.slugs import backfill_identities
+from sitegen.api import write_api
+from sitegen.archives import TOPIC_PAGE_SIZE, ArchiveIndex, category_key, separate_articles_by_date
+from sitegen.assets import PAGE_TYPES, AssetPipeline
+from sitegen.deploy import record_build
+from sitegen.fragments import FragmentCache
+from sitegen.incremental import PageCache, publish, stage
+from sitegen.i18n import DEFAULT_LANGUAGE, LANGUAGES, TRANSLATIONS_FILE, install_i18n, load_translations, localize
+from sitegen.ranking import Ranking
+from scraper.topics import TOPIC_LABELS, tag_articles, topic_index
+from scraper import profiling
+
 # --- Configuration ---
 ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
 TEMPLATES_DIR = os.path.join(ROOT_DIR, 'website', 'templates')
 STATIC_SOURCE_DIR = os.path.join(ROOT_DIR, 'website', 'static')
 DATA_FILE = os.path.join(ROOT_DIR, 'data', 'ia_news.json')
 OUTPUT_DIR = os.path.join(ROOT_DIR, 'public')  # Netlify publiera ce dossier
+IMAGE_CACHE_DIR = os.path.join(ROOT_DIR, 'data', 'image_cache')  # Cache adressé par contenu, conservé entre les builds
+DEFAULT_IMAGE = os.path.join(STATIC_SOURCE_DIR, 'images', 'default.png')
+FRAGMENT_CACHE_FILE = os.path.join(ROOT_DIR, 'data', 'fragment_cache.json')  # Cartes HTML rendues, conservées entre les builds
 
 # --- Fonctions utilitaires Jinja ---
 def format_date_filter(value, format_str='%d %B %Y'):
     """
     Filtre Jinja pour formater les dates.
-    S'attend à une chaîne ISO 8601 ou un objet datetime.
+    Accepte l'horodatage canonique, toute chaîne ISO 8601 / RFC 822 ou un objet datetime.
     """
     if not value:
         return "Date non spécifiée"
-    if isinstance(value, str):
-        try:
-            # Gérer les formats ISO avec ou sans 'Z', avec ou sans microsecondes
-            value_cleaned = value.replace('Z', '+00:00')
-            if '.' in value_cleaned and '+' in value_cleaned.split('.')[1]: # Format avec microsecondes et timezone
-                 dt_object = datetime.fromisoformat(value_cleaned)
-            elif '.' in value_cleaned: # Format avec microsecondes sans timezone explicite (on suppose UTC)
-                 dt_object = datetime.strptime(value_cleaned.split('.')[0], '%Y-%m-%dT%H:%M:%S').replace(microsecond=int(value_cleaned.split('.')[1].rstrip('Z')[:6]))
-            else: # Format sans microsecondes
-                 dt_object = datetime.fromisoformat(value_cleaned)
-        except ValueError:
-            return value # Retourner la valeur originale si le parsing échoue
-    elif isinstance(value, datetime):
-        dt_object = value
-    else:
-        return value # Type inconnu
-
+    dt_object = parse_timestamp(value)  # Mis en cache : chaque date n'est parsée qu'une fois
+    if dt_object is None:
+        return value # Retourner la valeur originale si le parsing échoue
     return dt_object.strftime(format_str)
 
-def generate_unique_slug(text, existing_slugs_set):
-    """Génère un slug unique en ajoutant un compteur si nécessaire."""
-    import re
-    # Simple slug generation without slugify
-    base_slug = re.sub(r'[^a-z0-9]+', '-', text.lower())[:80].strip('-')
-    if not base_slug:
-        base_slug = "article"
-    slug = base_slug
-    counter = 1
-    while slug in existing_slugs_set:
-        slug = f"{base_slug}-{counter}"
-        counter += 1
-    existing_slugs_set.add(slug)
-    return slug
-
-def custom_url_for(endpoint, **values):
+@pass_context
+def custom_url_for(context, endpoint, **values):
     """
     Simule url_for pour un site statique.
-    Les chemins sont relatifs à la racine du site.
+    Les chemins sont relatifs à la racine du site ; les pages sont préfixées
+    par la langue de la page en cours (/fr/…, /en/…), les fichiers statiques
+    sont communs aux langues.
     """
     if endpoint == 'static':
         return f"/static/{values['filename']}" # Netlify servira /static/*
+    return f"/{values.pop('lang', None) or context.get('lang') or DEFAULT_LANGUAGE}{page_url(endpoint, **values)}"
+
+def page_url(endpoint, **values):
+    """Chemin d'une page dans l'arborescence de sa langue"""
     if endpoint == 'home':
         query_params = []
         if 'source' in values and values['source']:
@@ -75,7 +71,7 @@ def custom_url_for(endpoint, **values):
             # Ici, on génère un lien qui pourrait être utilisé par du JS.
             query_params.append(f"source={values['source']}")
 
-        base_url = "/" # La page d'accueil est à la racine
+        base_url = "/" # La page d'accueil est à la racine de l'arborescence de la langue
         if query_params:
             return f"{base_url}?{'&'.join(query_params)}"
         return base_url
@@ -91,96 +87,20 @@ def custom_url_for(endpoint, **values):
         category = values.get('category', 'all')
         return f"/archives/{category}/"
 
-    # Fallback pour d'autres endpoints non gérés
-    return f"/{endpoint}/not-configured/"
+    if endpoint == 'archives_month':
+        return f"/archives/{values['category']}/{values['month']}/"
 
-def separate_articles_by_date(articles):
-    """Sépare les articles en récents (< 7 jours) et archives (>= 7 jours)"""
-    now = datetime.now()
-    seven_days_ago = now - timedelta(days=7)
-
-    recent_articles = []
-    archived_articles = []
-
-    for article in articles:
-        try:
-            date_str = article.get('published_date', '')
-            if isinstance(date_str, str):
-                # Parser la date
-                date_obj = datetime.strptime(date_str.split('T')[0], '%Y-%m-%d')
-                if date_obj >= seven_days_ago:
-                    recent_articles.append(article)
-                else:
-                    archived_articles.append(article)
-            else:
-                recent_articles.append(article)
-        except:
-            recent_articles.append(article)
-
-    return recent_articles, archived_articles
-
-def organize_archives(articles):
-    """Organise les articles archivés par catégorie et mois"""
-    organized = {}
-
-    for article in articles:
-        category = article.get('category', 'general')
-        date_str = article.get('published_date', '')
-
-        # Extraire le mois et l'année
-        try:
-            date_obj = datetime.strptime(date_str.split('T')[0], '%Y-%m-%d')
-            month_key = date_obj.strftime('%Y-%m')  # Format: 2024-10
-            month_label = date_obj.strftime('%B %Y')  # Format: October 2024
-        except:
-            month_key = 'unknown'
-            month_label = 'Unknown Date'
-
-        # Créer la structure imbriquée
-        if category not in organized:
-            organized[category] = {}
-        if month_key not in organized[category]:
-            organized[category][month_key] = {
-                'label': month_label,
-                'articles': []
-            }
-
-        organized[category][month_key]['articles'].append(article)
-
-    # Trier par date décroissante
-    for category in organized:
-        for month in organized[category]:
-            organized[category][month]['articles'].sort(
-                key=lambda x: x.get('published_date', ''),
-                reverse=True
-            )
+    if endpoint == 'topics':
+        return "/topics/"
 
-    return organized
-
-# --- Script principal de génération ---
-def build_site():
-    print("Début de la génération du site statique...")
-
-    # 0. Nettoyer/Créer le dossier de sortie
-    if os.path.exists(OUTPUT_DIR):
-        shutil.rmtree(OUTPUT_DIR)
-    os.makedirs(OUTPUT_DIR)
-    articles_output_dir = os.path.join(OUTPUT_DIR, 'article')
-    os.makedirs(articles_output_dir)
-    archives_output_dir = os.path.join(OUTPUT_DIR, 'archives')
-    os.makedirs(archives_output_dir)
-
-    # 1. Charger les données
-    print(f"Chargement des données depuis {DATA_FILE}...")
-    with open(DATA_FILE, 'r', encoding='utf-8') as f:
-        all_news_items = json.load(f)
+    if endpoint == 'topic':
+        return f"/topics/{values['topic']}/"
 
-    # 1.5 Séparer récents et archives
-    recent_articles, archived_articles = separate_articles_by_date(all_news_items)
-    organized_archives = organize_archives(archived_articles)
-    print(f"📊 Articles récents: {len(recent_articles)} | Archives: {len(archived_articles)}")
+    # Fallback pour d'autres endpoints non gérés
+    return f"/{endpoint}/not-configured/"
 
-    # 2. Préparer l'environnement Jinja2
+def create_jinja_env():
+    """Environnement Jinja2 du site statique (filtres et url_for statique)"""
     jinja_env = Environment(
         loader=FileSystemLoader(TEMPLATES_DIR),
         autoescape=select_autoescape(['html', 'xml']),
@@ -190,129 +110,268 @@ def build_site():
     jinja_env.filters['format_date'] = format_date_filter
     jinja_env.filters['capitalize'] = lambda s: str(s).capitalize() if s else ''
     jinja_env.globals['url_for'] = custom_url_for # Rendre url_for disponible dans tous les templates
+    install_i18n(jinja_env)  # Langues et textes d'articles localisés
+    return jinja_env
+
+def render_page(template, lang=DEFAULT_LANGUAGE, **context):
+    """Rend un template de page dans une langue (temps mesuré par template avec --profile)"""
+    strings = load_translations()[lang]
+    with profiling.active().timed('templates', template.name):
+        html = template.render(page_type=PAGE_TYPES.get(template.name), lang=lang, i18n_strings=strings, **context)
+    return localize(html, strings)
 
-    # 3. Pré-traiter les articles (ajouter slugs uniques, etc.)
-    print("Pré-traitement des articles (ajout de slugs)...")
-    processed_recent = []
-    processed_archived = []
-    article_slugs = set()
+def write_page(pages, lang, path, template, **context):
+    """
+    Rend une page et l'écrit dans l'arborescence de sa langue (<lang>/<path> du dossier de build).
+    Page aux entrées inchangées depuis le build précédent : ni rendue ni réécrite.
+    """
+    # Chemin de la page hors préfixe de langue, pour les liens hreflang vers ses autres versions
+    page_path = '/' + (path[:-len('index.html')] if path.endswith('index.html') else path)
+    relative_path = f"{lang}/{path}"
+    digest = pages.digest(relative_path, template.name, dict(context, page_path=page_path))
+    if not pages.unchanged(relative_path, digest):
+        pages.write(relative_path, render_page(template, lang=lang, page_path=page_path, **context), digest)
+
+def write_language_redirect(output_dir):
+    """Page racine : redirige vers l'arborescence de la langue du navigateur (français par défaut)"""
+    alternates = '\n'.join(f'    <link rel="alternate" hreflang="{code}" href="/{code}/">' for code in LANGUAGES)
+    with open(os.path.join(output_dir, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(f"""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>AI News</title>
+{alternates}
+    <link rel="alternate" hreflang="x-default" href="/{DEFAULT_LANGUAGE}/">
+    <meta http-equiv="refresh" content="0; url=/{DEFAULT_LANGUAGE}/">
+    <script>
+        var lang = (navigator.language || '').slice(0, 2);
+        location.replace('/' + ({json.dumps(list(LANGUAGES))}.indexOf(lang) >= 0 ? lang : '{DEFAULT_LANGUAGE}') + '/');
+    </script>
+</head>
+<body><a href="/{DEFAULT_LANGUAGE}/">AI News</a></body>
+</html>
+""")
 
-    for index, item in enumerate(recent_articles):
-        item['id'] = item.get('id', index)
-        title_for_slug = item.get('title_fr') or item.get('title') or f"sans-titre-{item['id']}"
-        item['slug'] = generate_unique_slug(title_for_slug, article_slugs)
-        processed_recent.append(item)
+# --- Script principal de génération ---
+def build_site(optimize_images=False, articles=None, jinja_env=None, bundle_assets=True):
+    """
+    Génère le site dans OUTPUT_DIR.
+    Build incrémental : le site est construit dans un dossier de travail où les pages du build
+    précédent sont liées, seules les pages dont les entrées ont changé sont rendues, puis le
+    dossier remplace OUTPUT_DIR d'un coup (sitegen/incremental.py).
+    'articles' : articles déjà en mémoire (mode démon), sinon lus depuis DATA_FILE.
+    'bundle_assets' : JS/CSS regroupés et minifiés par type de page, CSS critique en ligne.
+    """
+    print("Début de la génération du site statique...")
+    profiler = profiling.active()  # Sans --profile : ne fait rien
 
-    for index, item in enumerate(archived_articles):
-        item['id'] = item.get('id', f"archive-{index}")
-        title_for_slug = item.get('title_fr') or item.get('title') or f"sans-titre-{item['id']}"
-        item['slug'] = generate_unique_slug(title_for_slug, article_slugs)
-        processed_archived.append(item)
+    profiler.step('load')
+    # 0. Dossier de travail à côté de OUTPUT_DIR, qui reste servi intact jusqu'à la fin du build
+    output_dir = stage(OUTPUT_DIR, keep=LANGUAGES)
 
+    # 1. Charger les données
+    if articles is not None:
+        all_news_items = articles
+    else:
+        print(f"Chargement des données depuis {DATA_FILE}...")
+        with open(DATA_FILE, 'r', encoding='utf-8') as f:
+            all_news_items = load_articles(json.load(f))
+
+    # 1.2 Normaliser les dates en une seule passe (horodatage canonique UTC)
+    timestamps = normalize_dates(all_news_items)
+
+    # 1.5 Séparer récents et archives
+    recent_articles, archived_articles = separate_articles_by_date(all_news_items, timestamps)
+    archive_index = ArchiveIndex(archived_articles)  # Une seule passe, un seul tri
+    print(f"📊 Articles récents: {len(recent_articles)} | Archives: {len(archived_articles)}")
+
+    profiler.step('prepare')
+    # 2. Préparer l'environnement Jinja2 (réutilisé tel quel par le mode démon : templates déjà compilés)
+    if jinja_env is None:
+        jinja_env = create_jinja_env()
+    jinja_env.globals['bundle_assets'] = bundle_assets
+
+    # 3. Slugs et IDs : persistés à l'ingestion, seuls les anciens articles en sont dépourvus
+    backfill_identities(all_news_items)
+    # Thèmes : attribués au scraping, seuls les anciens articles sont étiquetés ici
+    tag_articles(all_news_items)
+    processed_recent = recent_articles
+    processed_archived = archived_articles
     all_processed = processed_recent + processed_archived
 
-    # 4. Générer les pages d'articles
-    print(f"Génération des pages d'articles dans {articles_output_dir}...")
+    profiler.step('images')
+    # 3.5 Images locales (optionnel) : cache adressé par contenu + miniatures WebP/AVIF
+    if optimize_images:
+        print("Optimisation des images...")
+        from sitegen.images import process_images
+        jinja_env.globals['default_picture'] = process_images(
+            all_processed, processed_recent, output_dir, IMAGE_CACHE_DIR, default_image=DEFAULT_IMAGE
+        )
+
+    # 3.8 Cache des fragments (cartes, éléments d'archives) : chaque carte n'est rendue qu'une fois
+    fragments = FragmentCache(
+        jinja_env, FRAGMENT_CACHE_FILE,
+        salt='static:' + json.dumps(jinja_env.globals.get('default_picture'), sort_keys=True)
+    ).install()
+    # Empreintes des entrées de chaque page : templates, cartes, traductions, contexte
+    pages = PageCache(output_dir, fragments, extra=[bundle_assets, load_translations()])
+
+    profiler.step('articles')
+    # 4. Générer les pages d'articles (chaque page est écrite une fois par langue : /fr/…, /en/…)
+    print(f"Génération des pages d'articles ({', '.join(LANGUAGES)})...")
     article_template = jinja_env.get_template('article.html')
     for article_data in all_processed:
         related_candidates = [art for art in all_processed if art['id'] != article_data['id']]
         related_articles_list = related_candidates[:min(3, len(related_candidates))]
+        # Texte intégral : lu dans son cache (data/fulltext.sqlite) pour cette page seulement
+        body = read_body(article_data['url']) if article_data.get('url') else None
+
+        for lang in LANGUAGES:
+            write_page(
+                pages, lang, f"article/{article_data['slug']}.html", article_template,
+                article=article_data,
+                body=body,
+                related_articles=related_articles_list
+            )
+    print(f"{len(all_processed)} pages d'articles générées par langue.")
 
-        html_page_content = article_template.render(
-            article=article_data,
-            related_articles=related_articles_list,
-            news=all_processed
-        )
-        with open(os.path.join(articles_output_dir, f"{article_data['slug']}.html"), 'w', encoding='utf-8') as f:
-            f.write(html_page_content)
-    print(f"{len(all_processed)} pages d'articles générées.")
-
-    # 4.5 Générer les pages d'archives par catégorie
+    profiler.step('archives')
+    # 4.5 Générer les archives : index (compteurs seulement) puis une page par catégorie et par mois
     print(f"Génération des pages d'archives...")
     archives_template = jinja_env.get_template('archives.html')
+    archive_summary = archive_index.summary()
+    archive_context = {'archive_index': archive_summary, 'archive_count': len(archive_index)}
+
+    def write_archive_page(path_parts, **context):
+        for lang in LANGUAGES:
+            write_page(pages, lang, '/'.join(['archives', *path_parts, 'index.html']), archives_template,
+                       **archive_context, **context)
+
+    write_archive_page([], category='all', month=None)
+    for category in archive_summary:
+        write_archive_page([category_key(category)], category=category, month=None)
+    month_pages = archive_index.pages()
+    for category, month in month_pages:
+        write_archive_page([category_key(category), month['key']], category=category, month=month)
+
+    print(f"Pages d'archives générées pour {len(archive_summary)} catégories ({len(month_pages)} pages mensuelles)")
+
+    profiler.step('topics')
+    # 4.6 Pages thèmes : une page par thème (articles les plus récents), plus un index des compteurs
+    print("Génération des pages thèmes...")
+    topics_template = jinja_env.get_template('topics.html')
+    by_topic = topic_index(sorted(all_processed, key=lambda a: a.get('published_at') or '', reverse=True))
+    topic_context = {
+        'topic_counts': {name: len(items) for name, items in by_topic.items()},
+        'topic_labels': TOPIC_LABELS,
+    }
+    for lang in LANGUAGES:
+        write_page(pages, lang, 'topics/index.html', topics_template, topic=None, **topic_context)
+        for name, items in by_topic.items():
+            write_page(
+                pages, lang, f'topics/{name}/index.html', topics_template,
+                topic=name, topic_label=TOPIC_LABELS[name], total=len(items),
+                news=items[:TOPIC_PAGE_SIZE], **topic_context
+            )
+    print(f"Pages thèmes générées pour {len(by_topic)} thèmes")
 
-    for category, months in organized_archives.items():
-        # Créer un sous-dossier par catégorie
-        category_dir = os.path.join(archives_output_dir, category.lower().replace(' ', '-'))
-        os.makedirs(category_dir, exist_ok=True)
-
-        # Page d'accueil de la catégorie
-        category_archives = [art for art in processed_archived if art.get('category') == category]
-        archives_content = archives_template.render(
-            category=category,
-            months=months,
-            archives=category_archives,
-            organized_archives=organized_archives
-        )
-        with open(os.path.join(category_dir, 'index.html'), 'w', encoding='utf-8') as f:
-            f.write(archives_content)
-
-    # Page générale des archives
-    archives_main = archives_template.render(
-        category='all',
-        months=organized_archives,
-        archives=processed_archived,
-        organized_archives=organized_archives
-    )
-    with open(os.path.join(archives_output_dir, 'index.html'), 'w', encoding='utf-8') as f:
-        f.write(archives_main)
-
-    print(f"Pages d'archives générées pour {len(organized_archives)} catégories")
-
+    profiler.step('home')
     # 5. Générer la page d'accueil (SEULEMENT articles récents)
-    print(f"Génération de la page d'accueil ({os.path.join(OUTPUT_DIR, 'index.html')})...")
+    print(f"Génération des pages d'accueil ({', '.join(f'/{lang}/' for lang in LANGUAGES)})...")
     home_template = jinja_env.get_template('index.html')
-    home_html_content = home_template.render(
-        news=processed_recent,  # SEULEMENT les articles récents!
-        recent_count=len(processed_recent),
-        archive_count=len(processed_archived)
-    )
-    with open(os.path.join(OUTPUT_DIR, 'index.html'), 'w', encoding='utf-8') as f:
-        f.write(home_html_content)
+    # Ordre et tendances calculés une fois ici : identiques pour tous les visiteurs
+    ranking = Ranking(processed_recent)
+    for lang in LANGUAGES:
+        write_page(
+            pages, lang, 'index.html', home_template,
+            news=ranking.ordered,  # SEULEMENT les articles récents!
+            trending=ranking.trending,
+            recent_count=len(processed_recent),
+            archive_count=len(processed_archived)
+        )
+    # Racine du site : redirection vers la langue du visiteur
+    write_language_redirect(output_dir)
 
+    fragments.save()
+    print(f"🧩 Fragments: {fragments.hits} réutilisés, {fragments.misses} rendus")
+
+    profiler.step('static')
     # 6. Copier les fichiers statiques (CSS, JS, images)
-    print(f"Copie des fichiers statiques de {STATIC_SOURCE_DIR} vers {os.path.join(OUTPUT_DIR, 'static')}...")
+    print(f"Copie des fichiers statiques de {STATIC_SOURCE_DIR} vers {os.path.join(output_dir, 'static')}...")
     if os.path.exists(STATIC_SOURCE_DIR):
-        shutil.copytree(STATIC_SOURCE_DIR, os.path.join(OUTPUT_DIR, 'static'), dirs_exist_ok=True)
+        shutil.copytree(STATIC_SOURCE_DIR, os.path.join(output_dir, 'static'), dirs_exist_ok=True)
     else:
         print(f"AVERTISSEMENT: Le dossier statique source {STATIC_SOURCE_DIR} n'existe pas.")
 
-    # 6.5 Copier translations.json vers static/
-    print("Copie du fichier translations.json...")
-    translations_source = os.path.join(ROOT_DIR, 'website/i18n/translations.json')
-    translations_dest_dir = os.path.join(OUTPUT_DIR, 'static/i18n')
-    os.makedirs(translations_dest_dir, exist_ok=True)
-    shutil.copy(translations_source, os.path.join(translations_dest_dir, 'translations.json'))
-
+    profiler.step('sources')
     # 7. Générer la page des sources
     print("Génération de la page des sources...")
-    sources_stats = {}
-    for article in all_processed:
-        source_name = article.get('source', 'Unknown')
-        if source_name not in sources_stats:
-            sources_stats[source_name] = {
-                'count': 0,
-                'last_update': article.get('published_date', 'N/A'),
-                'category': article.get('category', 'general'),
-                'type': article.get('source_type', 'rss')
-            }
-        sources_stats[source_name]['count'] += 1
-        # Garder la date la plus récente
-        if article.get('published_date', '') > sources_stats[source_name]['last_update']:
-            sources_stats[source_name]['last_update'] = article.get('published_date', 'N/A')
+    # Colonnes NumPy construites une fois : page des sources et stats de l'API
+    from sitegen.analytics import ArticleFrame
+    frame = ArticleFrame(all_processed)
+    sources_stats = frame.sources()
 
     sources_template = jinja_env.get_template('sources.html')
-    sources_html = sources_template.render(sources=sources_stats)
-    sources_dir = os.path.join(OUTPUT_DIR, 'sources')
-    os.makedirs(sources_dir, exist_ok=True)
-    with open(os.path.join(sources_dir, 'index.html'), 'w', encoding='utf-8') as f:
-        f.write(sources_html)
+    for lang in LANGUAGES:
+        write_page(pages, lang, 'sources/index.html', sources_template, sources=sources_stats)
     print(f"Page sources générée avec {len(sources_stats)} sources")
 
+    # Pages du build précédent que ce build ne produit plus (articles retirés, thèmes vides...)
+    removed = pages.prune(LANGUAGES)
+    print(f"📄 Pages: {pages.rendered} rendues, {pages.skipped} inchangées, {removed} supprimées")
+
+    if bundle_assets:
+        profiler.step('assets')
+        # 7.5 Bundles JS/CSS par type de page, CSS élagué et CSS critique en ligne
+        print("Génération des bundles JS/CSS...")
+        pipeline = AssetPipeline(STATIC_SOURCE_DIR, TRANSLATIONS_FILE, output_dir)
+        for page_type, sizes in pipeline.finalize().items():
+            print(f"📦 {page_type}: {sizes['pages']} pages ({sizes['written']} réécrites), JS {sizes['js_bytes'] // 1024} Ko, "
+                  f"CSS {sizes['css_bytes'] // 1024} Ko dont {sizes['critical_bytes'] // 1024} Ko en ligne")
+
+    profiler.step('api')
+    # 8. API JSON statique (listes paginées, articles, stats, manifeste)
+    print("Génération de l'API JSON statique...")
+    manifest = write_api(all_processed, output_dir, frame)
+    print(f"🔌 API: {len(manifest['files'])} fichiers dans {os.path.join(OUTPUT_DIR, 'api', manifest['version'])}")
+
+    profiler.step('manifest')
+    # 9. Manifeste d'empreintes : ce qui a changé depuis le build précédent
+    delta = record_build(output_dir)
+    print(f"🧾 Delta depuis le dernier build: {delta.summary()}")
+
+    # 10. Bascule : le nouveau site remplace l'ancien d'un seul coup
+    pages.forget()  # Interruption pendant la bascule : tout sera rendu au build suivant
+    publish(output_dir, OUTPUT_DIR)
+    pages.save()
+
     print("Génération du site statique terminée !")
     print(f"Le site a été généré dans : {OUTPUT_DIR}")
     print(f"📰 Page d'accueil: {len(processed_recent)} articles récents")
     print(f"📚 Archives: {len(processed_archived)} articles archivés")
 
 if __name__ == '__main__':
-    build_site()
+    parser = argparse.ArgumentParser(description="Génère le site statique dans public/")
+    parser.add_argument(
+        '--images',
+        action='store_true',
+        default=os.environ.get('BUILD_IMAGES') == '1',
+        help="Télécharger les images et générer des miniatures locales (nécessite Pillow)"
+    )
+    parser.add_argument(
+        '--no-bundle',
+        action='store_true',
+        help="Servir les JS/CSS sources tels quels (sans bundles ni CSS critique)"
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help="Profiler le build (cProfile et mémoire par étape, temps par template) dans data/profiles/"
+    )
+    args = parser.parse_args()
+    if args.profile:
+        profiling.start('build')
+    build_site(optimize_images=args.images, bundle_assets=not args.no_bundle)
+    if args.profile:
+        profiling.stop()
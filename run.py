@@ -6,30 +6,49 @@ Scrape AI news and serve on Flask web server
 
 import os
 import sys
+import json
+import time
+import signal
+import hashlib
 import argparse
+import threading
 import subprocess
+from datetime import datetime
 from pathlib import Path
 
 # Add project to path
 PROJECT_ROOT = Path(__file__).parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from scraper.scraper import IANewsScraper
+from scraper.dates import utcnow
+from scraper import profiling
 
-def run_scraper():
-    """Run the scraper"""
+def run_scraper(profile=False, workers=0, budget=None, fulltext=False):
+    """
+    Run the scraper (profile: cProfile/mémoire par phase, temps par source, dans data/profiles/;
+    workers: sources réparties sur autant de processus via la file de travail;
+    budget: durée maximale en secondes, le reste est repris au run suivant;
+    fulltext: corps des nouveaux articles dans data/fulltext.sqlite)
+    """
     print("\n" + "="*70)
     print("🤖 Lancement du Scraper IA News")
     print("="*70 + "\n")
+    if profile:
+        profiling.start('scraper')
     try:
+        from scraper.scraper import IANewsScraper, setup_logging
+        setup_logging()
         scraper = IANewsScraper()
-        count = scraper.run()
+        count = scraper.run(workers=workers, budget=budget, fulltext=fulltext)
         print(f"\n✅ Scraper terminé avec succès!")
         print(f"📊 Total d'articles: {count}")
         return True
     except Exception as e:
         print(f"\n❌ Erreur lors du scraping: {e}")
         return False
+    finally:
+        if profile:
+            profiling.stop()
 
 def run_web_server():
     """Run the Flask web server"""
@@ -57,6 +76,160 @@ def run_web_server():
         print(f"❌ Erreur lors du lancement du serveur: {e}")
         return False
 
+class NewsDaemon:
+    """
+    Processus résident : scraping → traduction → build en boucle, sans relancer Python.
+    Sessions HTTP, index des articles, cache de traduction et templates compilés restent en mémoire.
+    """
+
+    def __init__(self, interval_minutes=60, optimize_images=False):
+        from build_static import create_jinja_env
+        from scraper.scraper import IANewsScraper, setup_logging
+        from scraper.translator import ArticleTranslator
+
+        setup_logging()
+
+        self.interval = interval_minutes * 60
+        self.optimize_images = optimize_images
+        self.scraper = IANewsScraper()
+        self.translator = ArticleTranslator()
+        self.jinja_env = create_jinja_env()
+        self.fingerprint = None  # Empreinte du contenu du dernier build
+        self.stop_event = threading.Event()
+        self.lock = threading.Lock()
+        self.status = {
+            'state': 'starting',
+            'started_at': datetime.now().isoformat(timespec='seconds'),
+            'cycles': 0,
+            'builds': 0,
+            'articles': len(self.scraper.news),
+            'last_cycle': None,
+            'last_error': None,
+            'next_cycle_at': None,
+        }
+
+    def _update_status(self, **values):
+        with self.lock:
+            self.status.update(values)
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.status)
+
+    def content_fingerprint(self, articles):
+        """Empreinte des articles + jour courant (la bascule récents/archives change chaque jour)"""
+        payload = json.dumps(articles, sort_keys=True, ensure_ascii=False)
+        hasher = hashlib.blake2b(payload.encode('utf-8'), digest_size=16)
+        hasher.update(utcnow().strftime('%Y-%m-%d').encode('ascii'))
+        return hasher.hexdigest()
+
+    def run_cycle(self):
+        """Un cycle complet ; le build est sauté si le contenu n'a pas changé"""
+        from build_static import build_site
+        from scraper.article import dump_articles, load_articles
+
+        self._update_status(state='scraping')
+        start = time.time()
+        known_before = len(self.scraper.known_urls)
+        self.scraper.run(translator=self.translator)
+        scrape_seconds = time.time() - start
+
+        articles = dump_articles(self.scraper.news)
+        fingerprint = self.content_fingerprint(articles)
+        built = fingerprint != self.fingerprint
+        build_seconds = 0.0
+        if built:
+            self._update_status(state='building')
+            build_start = time.time()
+            # Copie des articles en mémoire : le build ne relit pas ia_news.json
+            # et ses ajouts (images locales...) ne remontent pas dans les données du scraper.
+            # Build incrémental : seules les pages modifiées sont rendues, public/ reste servi
+            # en entier jusqu'à la bascule finale
+            build_site(
+                optimize_images=self.optimize_images,
+                articles=load_articles(articles),
+                jinja_env=self.jinja_env
+            )
+            build_seconds = time.time() - build_start
+            self.fingerprint = fingerprint
+        else:
+            print("⏭️  Aucun changement depuis le dernier build : génération ignorée")
+
+        with self.lock:
+            self.status['cycles'] += 1
+            self.status['builds'] += int(built)
+            self.status.update(
+                state='idle',
+                articles=len(self.scraper.news),
+                last_error=None,
+                last_cycle={
+                    'finished_at': datetime.now().isoformat(timespec='seconds'),
+                    'new_articles': len(self.scraper.known_urls) - known_before,
+                    'built': built,
+                    'scrape_seconds': round(scrape_seconds, 2),
+                    'build_seconds': round(build_seconds, 2),
+                },
+            )
+
+    def serve_status(self, port):
+        """Endpoint /health (JSON) servi par un thread, sur le port donné"""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        daemon = self
+
+        class StatusHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0].rstrip('/') not in ('/health', '/status'):
+                    self.send_error(404)
+                    return
+                status = daemon.snapshot()
+                status['healthy'] = status['last_error'] is None
+                body = json.dumps(status, ensure_ascii=False).encode('utf-8')
+                self.send_response(200 if status['healthy'] else 503)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Pas de log par requête de supervision
+
+        server = ThreadingHTTPServer(('0.0.0.0', port), StatusHandler)
+        threading.Thread(target=server.serve_forever, name='status-server', daemon=True).start()
+        return server
+
+    def run_forever(self, port=8002):
+        server = self.serve_status(port)
+        print(f"🩺 Statut: http://localhost:{port}/health")
+        print(f"⏰ Un cycle toutes les {self.interval // 60} minutes\n")
+        try:
+            while not self.stop_event.is_set():
+                try:
+                    self.run_cycle()
+                except Exception as e:
+                    print(f"❌ Erreur pendant le cycle: {e}")
+                    self._update_status(state='idle', last_error=str(e)[:300])
+                next_cycle = datetime.fromtimestamp(time.time() + self.interval)
+                self._update_status(next_cycle_at=next_cycle.isoformat(timespec='seconds'))
+                self.stop_event.wait(self.interval)
+        finally:
+            self._update_status(state='stopped')
+            server.shutdown()
+
+    def stop(self, *_):
+        self.stop_event.set()
+
+def run_daemon(interval_minutes=60, port=8002, optimize_images=False):
+    """Run the resident scrape/translate/build daemon"""
+    print("\n" + "="*70)
+    print("♻️  Lancement du démon IA News")
+    print("="*70 + "\n")
+    daemon = NewsDaemon(interval_minutes, optimize_images=optimize_images)
+    signal.signal(signal.SIGTERM, daemon.stop)
+    signal.signal(signal.SIGINT, daemon.stop)
+    daemon.run_forever(port)
+    return True
+
 def run_both():
     """Run scraper and web server"""
     # First run scraper
@@ -71,8 +244,13 @@ def main():
         epilog="""
 Exemples:
   python3 run.py scraper          # Lance le scraper seulement
+  python3 run.py scraper --profile  # Idem, avec profil des phases et des sources
+  python3 run.py scraper --workers 4  # Sources réparties sur 4 processus (file SQLite)
+  python3 run.py scraper --budget 900  # Run limité à 15 minutes, reprise au run suivant
+  python3 run.py scraper --fulltext  # Télécharge aussi le corps des nouveaux articles
   python3 run.py web              # Lance le serveur web seulement
   python3 run.py all              # Lance les deux (scraper puis serveur)
+  python3 run.py daemon           # Démon : scraping + build toutes les heures, statut sur :8002/health
   python3 run.py --help           # Affiche cette aide
         """
     )
@@ -81,7 +259,7 @@ Exemples:
         'command',
         nargs='?',
         default='all',
-        choices=['scraper', 'web', 'all'],
+        choices=['scraper', 'web', 'all', 'daemon'],
         help='Commande à exécuter (défaut: all)'
     )
 
@@ -91,6 +269,52 @@ Exemples:
         help='Mode debug activé'
     )
 
+    parser.add_argument(
+        '--interval',
+        type=int,
+        default=60,
+        help='Démon : minutes entre deux cycles (défaut: 60)'
+    )
+
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=8002,
+        help='Démon : port de l\'endpoint de statut (défaut: 8002)'
+    )
+
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Scraper : profil par phase et temps par source dans data/profiles/'
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=0,
+        help='Scraper : nombre de processus workers (défaut: 0, scraping séquentiel)'
+    )
+
+    parser.add_argument(
+        '--budget',
+        type=float,
+        default=None,
+        help='Scraper : durée maximale du run en secondes (défaut: illimitée)'
+    )
+
+    parser.add_argument(
+        '--fulltext',
+        action='store_true',
+        help='Scraper : télécharger le texte intégral des nouveaux articles (cache data/fulltext.sqlite)'
+    )
+
+    parser.add_argument(
+        '--images',
+        action='store_true',
+        help='Démon : générer les miniatures locales à chaque build'
+    )
+
     args = parser.parse_args()
 
     print("""
@@ -100,8 +324,13 @@ Exemples:
 ╚═══════════════════════════════════════════════════════════════════════╝
     """)
 
+    if args.command == 'daemon':
+        run_daemon(args.interval, args.port, optimize_images=args.images)
+        return
+
     if args.command == 'scraper' or args.command == 'all':
-        success = run_scraper()
+        success = run_scraper(profile=args.profile, workers=args.workers, budget=args.budget,
+                              fulltext=args.fulltext)
         if args.command == 'scraper':
             sys.exit(0 if success else 1)
 
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Compact in-memory representation of an article.
+
+``Article`` replaces the plain dicts passed between the scraper, the
+translator, the Flask store and the static builder:
+
+- fixed ``__slots__`` instead of a per-article dict
+- ``source``, ``category`` and ``source_type`` are interned, so thousands
+  of articles share a handful of string objects
+- timestamps are kept as integer epochs and formatted on access
+
+Long text fields (``description``, ``description_fr``) are plain ``str``
+slots, decoded with the rest of the record: ``json.load`` has already
+decoded them when an ``Article`` is built, and cards, article pages and
+search read them for every article, so deferring their decoding saves
+nothing. CPython stores Latin text in 1 byte per character, less than
+its UTF-8 encoding.
+
+It still behaves like a mapping (``article['title']``, ``article.get(...)``,
+``'slug' in article``) so existing code and templates keep working, and
+``from_dict`` / ``to_dict`` round-trip the JSON format of ``ia_news.json``.
+"""
+
+import calendar
+import sys
+import time
+from typing import Dict, Iterable, List, Optional
+
+from .dates import CANONICAL_FORMAT, parse_timestamp
+
+# Champs à faible cardinalité, internés
+_INTERNED_FIELDS = ('source', 'source_type', 'category')
+
+# Ordre des clés dans le JSON, identique à celui produit historiquement par le scraper
+FIELD_ORDER = (
+    'id', 'slug', 'title', 'url', 'description', 'image_url', 'published_at',
+    'published_date', 'source', 'source_type', 'category', 'collected_at',
+    'description_fr', 'title_fr', 'tags', 'relevance',
+)
+
+
+def _to_epoch(value) -> Optional[int]:
+    dt = parse_timestamp(value)
+    return calendar.timegm(dt.utctimetuple()) if dt else None
+
+
+def _from_epoch(value: Optional[int]) -> Optional[str]:
+    return time.strftime(CANONICAL_FORMAT, time.gmtime(value)) if value is not None else None
+
+
+class Article:
+    """Slotted article record with dict-style access"""
+
+    __slots__ = (
+        'id', 'title', 'url', 'image_url', 'title_fr', 'slug',
+        'source', 'source_type', 'category',
+        'description', 'description_fr',
+        'timestamp', '_collected',
+        'tags', 'relevance',  # Thèmes (scraper/topics.py) : présents sur tous les articles étiquetés
+        'extra',
+    )
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            object.__setattr__(self, name, None)
+        for key, value in fields.items():
+            self[key] = value
+
+    # --- Champs dérivés / compactés ---
+
+    @property
+    def published_at(self) -> Optional[str]:
+        return _from_epoch(self.timestamp)
+
+    @published_at.setter
+    def published_at(self, value):
+        self.timestamp = _to_epoch(value)
+
+    @property
+    def published_date(self) -> Optional[str]:
+        published_at = self.published_at
+        return published_at[:10] if published_at else None
+
+    @published_date.setter
+    def published_date(self, value):
+        # Date seule : ne sert qu'à compléter un article sans horodatage précis
+        if self.timestamp is None:
+            self.timestamp = _to_epoch(value)
+
+    @property
+    def collected_at(self) -> Optional[str]:
+        return _from_epoch(self._collected)
+
+    @collected_at.setter
+    def collected_at(self, value):
+        self._collected = _to_epoch(value)
+
+    # --- Accès de type dict ---
+
+    def __setattr__(self, name, value):
+        if name in _INTERNED_FIELDS and isinstance(value, str):
+            value = sys.intern(value)
+        object.__setattr__(self, name, value)
+
+    def __getitem__(self, key):
+        if key in FIELD_ORDER:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        elif self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in FIELD_ORDER:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __contains__(self, key) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self) -> List[str]:
+        return list(self.to_dict())
+
+    def copy(self) -> 'Article':
+        clone = Article.__new__(Article)
+        for name in self.__slots__:
+            object.__setattr__(clone, name, getattr(self, name))
+        if self.extra:
+            clone.extra = dict(self.extra)
+        return clone
+
+    def __repr__(self) -> str:
+        return f"Article({self.source!r}, {self.title!r})"
+
+    # --- Sérialisation JSON ---
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Article':
+        if isinstance(data, Article):
+            return data
+        article = cls()
+        for key, value in data.items():
+            article[key] = value
+        return article
+
+    def to_dict(self) -> Dict:
+        data = {}
+        for key in FIELD_ORDER:
+            value = getattr(self, key)
+            if value is not None:
+                data[key] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+
+def load_articles(items: Iterable[Dict]) -> List[Article]:
+    """Convert decoded JSON records to ``Article`` objects"""
+    return [Article.from_dict(item) for item in items]
+
+
+def dump_articles(articles: Iterable) -> List[Dict]:
+    """Convert articles (or plain dicts) back to JSON-ready dicts"""
+    return [a.to_dict() if isinstance(a, Article) else a for a in articles]
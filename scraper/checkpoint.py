@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Checkpoints and time budget of a scraping run.
+
+A run writes ``data/run_checkpoint.json`` after each source: the sources
+already scraped and the new articles they produced. If the process crashes
+or is killed before ``save_news``, the next run reloads those articles,
+skips those sources and only scrapes the rest. A run through the work queue
+also records its queue ``run_id``, so that only this run is resumed from the
+queue. The checkpoint is removed
+once the articles are saved; one older than ``MAX_AGE_HOURS`` (the run
+was abandoned) is ignored.
+
+``Budget`` bounds a whole run: the scraper checks it between sources and
+between translation batches, stops cleanly when it is spent, saves what it
+has and leaves the remaining sources in the checkpoint for the next cycle.
+"""
+
+import json
+import logging
+import os
+import time
+from typing import Dict, Iterable, List, Optional
+
+from .dates import format_timestamp, parse_timestamp, utcnow
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'run_checkpoint.json')
+MAX_AGE_HOURS = 12
+
+
+def source_key(kind: str, source: Dict) -> str:
+    return f"{kind}:{source.get('name', source.get('url', '?'))}"
+
+
+class Checkpoint:
+    """Progress of the current run, saved atomically after each source"""
+
+    def __init__(self, path: str = CHECKPOINT_FILE, max_age_hours: float = MAX_AGE_HOURS):
+        self.path = path
+        self.max_age_hours = max_age_hours
+        self.started_at = format_timestamp(utcnow())
+        self.done = set()
+        self.articles: List[Dict] = []
+        self.run_id: Optional[str] = None  # Run de la file de travail (mode --workers)
+        self.resumed = False
+
+    def load(self) -> bool:
+        """Restore an interrupted run; False if there is none (or it is too old)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return False
+        started = parse_timestamp(state.get('started_at'))
+        if started is None or (utcnow() - started).total_seconds() > self.max_age_hours * 3600:
+            logger.info("🗑️  Checkpoint trop ancien ignoré")
+            self.clear()
+            return False
+        self.started_at = state['started_at']
+        self.done = set(state.get('done', []))
+        self.articles = state.get('articles', [])
+        self.run_id = state.get('run_id')
+        self.resumed = True
+        return True
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'started_at': self.started_at, 'done': sorted(self.done), 'articles': self.articles,
+                       'run_id': self.run_id}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def record(self, key: str, articles: Iterable) -> None:
+        """Mark a source as done with the articles it added, and save"""
+        self.done.add(key)
+        self.articles.extend(article.to_dict() if hasattr(article, 'to_dict') else dict(article)
+                             for article in articles)
+        self.save()
+
+    def clear(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class Budget:
+    """Global deadline of a run (``seconds=None``: unlimited)"""
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.seconds = seconds
+        self.deadline = time.monotonic() + seconds if seconds else None
+
+    def remaining(self) -> float:
+        if self.deadline is None:
+            return float('inf')
+        return max(0.0, self.deadline - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Date helpers shared by the scraper, the Flask app and the static build.
+
+Every article carries one canonical UTC timestamp, ``published_at``
+(``YYYY-MM-DDTHH:MM:SSZ``), computed once at ingestion. Because the format is
+fixed, the rest of the pipeline can sort, compare and slice it as a plain
+string instead of parsing dates again in every loop.
+"""
+
+import re
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+CANONICAL_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+_ISO_RE = re.compile(r'^\d{4}-\d{2}-\d{2}')
+_RFC822_RE = re.compile(r'^(?:[A-Za-z]{3},\s*)?\d{1,2}\s+[A-Za-z]{3}\s+\d{2,4}')
+
+# Formats tentés en dernier recours, quand ni ISO 8601 ni RFC 822 ne conviennent
+_FALLBACK_FORMATS = (
+    '%d/%m/%Y %H:%M',
+    '%d/%m/%Y',
+    '%B %d, %Y',
+    '%b %d, %Y',
+    '%d %B %Y',
+    '%Y/%m/%d',
+)
+
+
+def utcnow() -> datetime:
+    """Current time as an aware UTC datetime"""
+    return datetime.now(timezone.utc)
+
+
+def _as_utc(dt: datetime) -> datetime:
+    """Attach UTC to naive datetimes, convert aware ones to UTC"""
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+@lru_cache(maxsize=4096)
+def _parse_string(value: str) -> Optional[datetime]:
+    if _ISO_RE.match(value):
+        iso = value.replace(' ', 'T', 1)
+        if iso.endswith(('Z', 'z')):
+            iso = iso[:-1] + '+00:00'
+        try:
+            return _as_utc(datetime.fromisoformat(iso))
+        except ValueError:
+            # Fractions de seconde non standard (ex: 7 chiffres) : on les ignore
+            try:
+                return _as_utc(datetime.fromisoformat(re.sub(r'\.\d+', '', iso)))
+            except ValueError:
+                pass
+
+    if _RFC822_RE.match(value):
+        try:
+            return _as_utc(parsedate_to_datetime(value))
+        except (TypeError, ValueError, IndexError):
+            pass
+
+    for fmt in _FALLBACK_FORMATS:
+        try:
+            return _as_utc(datetime.strptime(value, fmt))
+        except ValueError:
+            continue
+    return None
+
+
+def parse_timestamp(value) -> Optional[datetime]:
+    """
+    Parse a date into an aware UTC datetime.
+    Tries ISO 8601 and RFC 822 detection first, then a short list of
+    fallback formats. Returns None when nothing matches.
+    """
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return _as_utc(value)
+    if isinstance(value, str):
+        return _parse_string(value.strip())
+    return None
+
+
+def format_timestamp(dt: datetime) -> str:
+    """Format a datetime as the canonical UTC string"""
+    return _as_utc(dt).strftime(CANONICAL_FORMAT)
+
+
+def canonical_timestamp(value, default: Optional[datetime] = None) -> str:
+    """Canonical string for ``value``, or for ``default`` (now) when unparsable"""
+    dt = parse_timestamp(value)
+    if dt is None:
+        dt = default or utcnow()
+    return format_timestamp(dt)
+
+
+def article_timestamp(article: Dict) -> str:
+    """Canonical timestamp of an article, derived from legacy fields if needed"""
+    published_at = article.get('published_at')
+    if published_at:
+        return published_at
+    dt = parse_timestamp(article.get('published_date')) or parse_timestamp(article.get('collected_at'))
+    return format_timestamp(dt) if dt else ''
+
+
+def normalize_dates(articles: Iterable[Dict]) -> List[Optional[datetime]]:
+    """
+    Ensure every article has ``published_at`` and return the parsed datetimes.
+
+    Works as a batch: each distinct date string is parsed only once, which
+    matters because a feed run produces many articles sharing the same day.
+    """
+    parsed: Dict[str, Optional[datetime]] = {}
+    result = []
+    for article in articles:
+        published_at = article.get('published_at')
+        if not published_at:
+            published_at = article_timestamp(article)
+            if published_at:
+                article['published_at'] = published_at
+                article['published_date'] = published_at[:10]
+        if published_at not in parsed:
+            parsed[published_at] = parse_timestamp(published_at)
+        result.append(parsed[published_at])
+    return result
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Declarative per-source extractors for the ``sites`` sources.
+
+Each source in ``sources.json`` may declare an ``extractor``: a selector for
+the list of article cards plus one for each field (title, link, date,
+image, description). Selectors are CSS, or XPath when they start with
+``/``, ``./`` or ``(``. ``selector@attr`` reads an attribute instead of the
+text, ``@attr`` reads it on the card itself, and a list of selectors gives
+alternatives tried in order. Everything is compiled once, then run with lxml.
+
+Run as a module to record HTML fixtures and time every extractor::
+
+    python3 -m scraper.extractors record            # télécharge les pages dans scraper/fixtures/
+    python3 -m scraper.extractors bench --repeat 20 # mesure, non-régression sur les fixtures
+    python3 -m scraper.extractors bench --update    # réécrit les valeurs attendues
+
+Each site that declares an extractor has its page in ``scraper/fixtures/``
+(``<type>.html``) and, next to it, the title, link, date and image the
+extractor must return (``<type>.expected.json``). ``bench`` fails when one
+of these files is missing or when the output differs; after ``record``,
+check the new output and save it with ``--update``.
+
+``fixtures.json`` records where each page comes from: ``recorded`` (saved
+by ``record`` from the live site) or ``synthetic`` (written by hand to the
+site's markup, without network access). On a synthetic page, ``bench`` is a
+regression check and a timing harness: it shows that the selectors still
+read markup written for them, not that they work on the live site.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urljoin
+
+from lxml import etree, html
+
+FIELDS = ('title', 'link', 'description', 'image', 'date')
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+FIXTURES_MANIFEST = 'fixtures.json'  # Origine de chaque page : 'recorded' ou 'synthetic'
+EXPECTED_FIELDS = ('title', 'url', 'date', 'image_url')  # Champs vérifiés par 'bench'
+_ATTR_SUFFIX = re.compile(r'^(.*?)@([\w:-]+)$')
+_SPACES = re.compile(r'\s+')
+_META_CHARSET = re.compile(rb'<meta[^>]+charset', re.I)
+_PARSERS = {}
+
+
+def parse_document(content: bytes, encoding: Optional[str] = None):
+    """
+    Parse an HTML page from bytes. Without a charset in the HTTP headers or a
+    ``<meta charset>``, libxml2 would assume Latin-1: assume UTF-8 instead.
+    """
+    if not encoding and not _META_CHARSET.search(content[:4096]):
+        encoding = 'utf-8'
+    if encoding not in _PARSERS:
+        _PARSERS[encoding] = html.HTMLParser(encoding=encoding) if encoding else html.HTMLParser()
+    return html.document_fromstring(content, parser=_PARSERS[encoding])
+
+
+def _is_xpath(selector: str) -> bool:
+    return selector.startswith(('/', './', '('))
+
+
+class _Selector:
+    """One compiled selector, returning a string value or a list of elements"""
+
+    def __init__(self, selector: str):
+        self.source = selector
+        self.attr = None
+        if not _is_xpath(selector):
+            match = _ATTR_SUFFIX.match(selector)
+            if match:
+                selector, self.attr = match.group(1).strip(), match.group(2)
+        if not selector:
+            self.find = lambda element: [element]
+        elif _is_xpath(selector):
+            self.find = etree.XPath(selector)
+        else:
+            from lxml.cssselect import CSSSelector
+            self.find = CSSSelector(selector)
+
+    def value(self, element) -> Optional[str]:
+        for node in self.find(element):
+            if isinstance(node, str):
+                text = node
+            elif self.attr:
+                text = node.get(self.attr)
+            else:
+                text = node.text_content()
+            text = _SPACES.sub(' ', text or '').strip()
+            if text:
+                return text
+        return None
+
+
+class Extractor:
+    """A compiled extractor: list selector(s) plus per-field alternatives"""
+
+    def __init__(self, spec: Dict):
+        lists = spec['list'] if isinstance(spec['list'], list) else [spec['list']]
+        self.list_selectors = [_Selector(selector) for selector in lists]
+        self.fields = {}
+        for field in FIELDS:
+            value = spec.get(field) or []
+            self.fields[field] = [_Selector(s) for s in (value if isinstance(value, list) else [value])]
+
+    def _field(self, field: str, card) -> Optional[str]:
+        for selector in self.fields[field]:
+            value = selector.value(card)
+            if value:
+                return value
+        return None
+
+    def cards(self, document) -> List:
+        # Comme l'ancienne cascade : le premier sélecteur de liste qui trouve quelque chose gagne
+        for selector in self.list_selectors:
+            found = selector.find(document)
+            if found:
+                return found
+        return []
+
+    def extract(self, content, base_url: str, limit: int = 15, encoding: Optional[str] = None) -> List[Dict]:
+        """
+        Return ``{'title', 'url', 'description', 'image_url', 'date'}`` dicts
+        from page bytes (or an already parsed document).
+        """
+        document = parse_document(content, encoding) if isinstance(content, bytes) else content
+        items = []
+        seen = set()
+        for card in self.cards(document):
+            title = self._field('title', card)
+            link = self._field('link', card)
+            if not title or len(title) < 10 or not link:
+                continue
+            url = urljoin(base_url, link)
+            if url in seen:
+                continue
+            seen.add(url)
+            image = self._field('image', card)
+            items.append({
+                'title': title,
+                'url': url,
+                'description': self._field('description', card) or title,
+                'image_url': urljoin(base_url, image) if image else '',
+                'date': self._field('date', card),
+            })
+            if len(items) >= limit:
+                break
+        return items
+
+
+def compile_extractors(sources: Dict) -> Dict[str, Extractor]:
+    """Compile every declared extractor once, keyed by source type ('default' for the fallback)"""
+    extractors = {'default': Extractor(sources['default_extractor'])}
+    for site in sources.get('sites', []):
+        if site.get('extractor'):
+            extractors[site['type']] = Extractor(site['extractor'])
+    return extractors
+
+
+# --- Harnais : fixtures et mesures ---
+
+def _load_origins(fixtures_dir: str) -> Dict[str, Dict]:
+    try:
+        with open(os.path.join(fixtures_dir, FIXTURES_MANIFEST), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _origin(origins: Dict[str, Dict], site_type: str) -> str:
+    # Page absente du manifeste : pas enregistrée par 'record', donc synthétique
+    return origins.get(site_type, {}).get('origin', 'synthetic')
+
+
+def _record(sources: Dict, fixtures_dir: str):
+    import requests
+    os.makedirs(fixtures_dir, exist_ok=True)
+    origins = _load_origins(fixtures_dir)
+    session = requests.Session()
+    session.headers['User-Agent'] = 'Mozilla/5.0 (compatible; IANewsFixtures/1.0)'
+    for site in sources['sites']:
+        try:
+            response = session.get(site['url'], timeout=20)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"❌ {site['name']}: {e}")
+            continue
+        with open(os.path.join(fixtures_dir, f"{site['type']}.html"), 'wb') as f:
+            f.write(response.content)
+        origins[site['type']] = {'origin': 'recorded', 'url': site['url'],
+                                 'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())}
+        print(f"💾 {site['name']}: {len(response.content) // 1024} Ko")
+    with open(os.path.join(fixtures_dir, FIXTURES_MANIFEST), 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(origins.items())), f, ensure_ascii=False, indent=2)
+        f.write('\n')
+    print("ℹ️  Vérifier la sortie de 'bench' puis l'enregistrer avec 'bench --update'")
+
+
+def _expected(items: List[Dict]) -> List[Dict]:
+    return [{field: item.get(field) for field in EXPECTED_FIELDS} for item in items]
+
+
+def _compare(items: List[Dict], expected: List[Dict]) -> List[str]:
+    """Differences between extracted items and the expected values, one line each"""
+    problems = []
+    if len(items) != len(expected):
+        problems.append(f"{len(items)} articles au lieu de {len(expected)}")
+    for index, (item, wanted) in enumerate(zip(_expected(items), expected), 1):
+        for field in EXPECTED_FIELDS:
+            if item[field] != wanted.get(field):
+                problems.append(f"#{index} {field}: {item[field]!r} au lieu de {wanted.get(field)!r}")
+    return problems
+
+
+def _bench(sources: Dict, fixtures_dir: str, repeat: int, update: bool = False) -> int:
+    extractors = compile_extractors(sources)
+    origins = _load_origins(fixtures_dir)
+    failures = 0
+    synthetic = []
+    print(f"{'Source':<28}{'Extracteur':<12}{'Page':<12}{'Parse (ms)':>12}{'Extract (ms)':>14}{'Articles':>10}")
+    for site in sources['sites']:
+        declared = site['type'] in extractors
+        path = os.path.join(fixtures_dir, f"{site['type']}.html")
+        expected_path = os.path.join(fixtures_dir, f"{site['type']}.expected.json")
+        if not os.path.exists(path):
+            # Extracteur déclaré : sa fixture est obligatoire
+            if declared:
+                failures += 1
+            print(f"{site['name']:<28}(pas de fixture, lancer 'record'){'  ❌' if declared else ''}")
+            continue
+        with open(path, 'rb') as f:
+            content = f.read()
+        extractor = extractors.get(site['type'], extractors['default'])
+        kind = 'déclaré' if declared else 'générique'
+        origin = _origin(origins, site['type'])
+        if origin == 'synthetic':
+            synthetic.append(site['name'])
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            document = parse_document(content)
+        parse_ms = (time.perf_counter() - start) * 1000 / repeat
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            items = extractor.extract(document, site['url'])
+        extract_ms = (time.perf_counter() - start) * 1000 / repeat
+
+        if update:
+            with open(expected_path, 'w', encoding='utf-8') as f:
+                json.dump(_expected(items), f, ensure_ascii=False, indent=2)
+                f.write('\n')
+            problems = []
+        elif os.path.exists(expected_path):
+            with open(expected_path, 'r', encoding='utf-8') as f:
+                problems = _compare(items, json.load(f))
+        elif declared:
+            problems = ["pas de valeurs attendues, lancer 'bench --update'"]
+        else:
+            problems = [] if items else ["aucun article extrait"]
+
+        if problems:
+            failures += 1
+        page = 'synthétique' if origin == 'synthetic' else 'enregistrée'
+        print(f"{site['name']:<28}{kind:<12}{page:<12}{parse_ms:>12.2f}{extract_ms:>14.2f}{len(items):>10}"
+              f"{'  ❌' if problems else ''}")
+        for problem in problems:
+            print(f"    {problem}")
+    if synthetic:
+        print(f"⚠️  Pages synthétiques ({', '.join(synthetic)}) : écrites à la main d'après le balisage des sites, "
+              f"elles détectent les régressions des sélecteurs mais ne les valident pas sur les sites réels "
+              f"(lancer 'record' avec accès réseau)")
+    return failures
+
+
+def main(argv=None) -> int:
+    from .sources import load_sources
+
+    parser = argparse.ArgumentParser(description="Fixtures et mesures des extracteurs par source")
+    parser.add_argument('command', choices=['record', 'bench'])
+    parser.add_argument('--fixtures', default=FIXTURES_DIR, help="Dossier des pages HTML enregistrées")
+    parser.add_argument('--sources', default=None, help="Fichier de sources (défaut: scraper/sources.json)")
+    parser.add_argument('--repeat', type=int, default=10, help="Répétitions par mesure")
+    parser.add_argument('--update', action='store_true', help="bench : enregistrer la sortie comme valeurs attendues")
+    args = parser.parse_args(argv)
+
+    sources = load_sources(args.sources)
+    if args.command == 'record':
+        _record(sources, args.fixtures)
+        return 0
+    # Code de sortie non nul si une fixture manque ou si un extracteur ne rend pas les valeurs attendues
+    return 1 if _bench(sources, args.fixtures, args.repeat, args.update) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Streaming RSS / Atom reader.
+
+``iter_feed_entries`` parses a feed incrementally with ``lxml.etree.iterparse``
+and yields one entry at a time, shaped like feedparser entries (``title``,
+``link``, ``summary``, ``published``, ``content``, ``media_content``...), so
+the scraper can stop reading as soon as it has seen enough: most feeds list
+newest items first, so parse time and memory follow what is actually new.
+
+Malformed documents fall back to a full ``feedparser`` parse of the bytes
+read so far plus the rest of the stream.
+"""
+
+import io
+import logging
+from typing import Dict, Iterator
+
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+_ENTRY_TAGS = {'item', 'entry'}
+_MEDIA_NS = '{http://search.yahoo.com/mrss/}'
+_DATE_TAGS = {
+    'pubDate': 'published',
+    'published': 'published',
+    'issued': 'published',
+    'date': 'published',      # dc:date
+    'updated': 'updated',
+    'modified': 'updated',
+}
+
+
+def _localname(tag) -> str:
+    if not isinstance(tag, str):
+        return ''
+    return tag.rsplit('}', 1)[-1]
+
+
+def _text(elem) -> str:
+    return (elem.text or '').strip()
+
+
+def _inner_markup(elem) -> str:
+    """Texte d'un élément, y compris le HTML embarqué sans CDATA (Atom type="xhtml")"""
+    if len(elem):
+        parts = [elem.text or '']
+        parts.extend(etree.tostring(child, encoding='unicode', with_tail=True) for child in elem)
+        return ''.join(parts).strip()
+    return _text(elem)
+
+
+def _parse_entry(elem) -> Dict:
+    entry = {}
+    media_content = []
+    media_thumbnail = []
+
+    def add_media(media):
+        name = _localname(media.tag)
+        if name == 'content' and media.get('url'):
+            media_content.append({'url': media.get('url')})
+        elif name == 'thumbnail' and media.get('url'):
+            media_thumbnail.append({'url': media.get('url')})
+        elif name == 'group':
+            for child in media:
+                add_media(child)
+
+    for child in elem:
+        if not isinstance(child.tag, str):
+            continue  # commentaires / instructions
+        name = _localname(child.tag)
+        if child.tag.startswith(_MEDIA_NS):
+            add_media(child)
+        elif name == 'title':
+            entry['title'] = _text(child)
+        elif name == 'link':
+            href = child.get('href')
+            if href:
+                # Atom : préférer rel="alternate" (ou sans rel)
+                if child.get('rel', 'alternate') == 'alternate' and 'link' not in entry:
+                    entry['link'] = href.strip()
+            elif _text(child):
+                entry['link'] = _text(child)
+        elif name in ('description', 'summary'):
+            entry['summary'] = _inner_markup(child)
+        elif name in ('encoded', 'content'):
+            entry.setdefault('content', []).append({'value': _inner_markup(child)})
+        elif name in _DATE_TAGS:
+            entry.setdefault(_DATE_TAGS[name], _text(child))
+        elif name == 'enclosure' and (child.get('type') or '').startswith('image/') and child.get('url'):
+            media_content.append({'url': child.get('url')})
+
+    if media_content:
+        entry['media_content'] = media_content
+    if media_thumbnail:
+        entry['media_thumbnail'] = media_thumbnail
+    return entry
+
+
+class _RecordingReader(io.RawIOBase):
+    """File-like wrapper keeping a copy of the bytes read, for the feedparser fallback"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.buffer = io.BytesIO()
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        if data:
+            self.buffer.write(data)
+        return data
+
+    def readinto(self, b):
+        data = self.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+    def consume_all(self) -> bytes:
+        rest = self.stream.read()
+        if rest:
+            self.buffer.write(rest)
+        return self.buffer.getvalue()
+
+
+def iter_feed_entries(stream) -> Iterator[Dict]:
+    """
+    Yield feed entries from a binary stream, one at a time.
+    Stop iterating (or close the generator) to stop reading the stream.
+    """
+    reader = _RecordingReader(stream)
+    yielded = set()
+    try:
+        for _, elem in etree.iterparse(reader, events=('end',), resolve_entities=False, no_network=True):
+            if _localname(elem.tag) not in _ENTRY_TAGS:
+                continue
+            entry = _parse_entry(elem)
+            # Libérer la mémoire de l'entrée et des précédentes
+            elem.clear()
+            parent = elem.getparent()
+            if parent is not None:
+                while elem.getprevious() is not None:
+                    del parent[0]
+            if entry.get('link'):
+                yielded.add(entry['link'])
+            yield entry
+    except etree.XMLSyntaxError as e:
+        logger.debug(f"Flux mal formé ({e}), repli sur feedparser")
+        import feedparser
+        parsed = feedparser.parse(reader.consume_all())
+        for entry in parsed.entries:
+            if entry.get('link') not in yielded:
+                yield entry
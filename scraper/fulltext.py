@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Opt-in full-text stage: article bodies, fetched once and cached.
+
+Feeds only give a short description. With ``--fulltext``, the scraper
+fetches the page of every article it has just added, extracts the body
+(readability-style scoring of the paragraphs, with lxml) and stores it in
+``data/fulltext.sqlite``, never in ``ia_news.json``: listing pages and the
+Flask store keep loading descriptions only, article pages read their body
+from the cache by URL.
+
+- only URLs missing from the cache are fetched (a page without an
+  extractable body is remembered too, so it is not fetched again);
+- pages are fetched concurrently (``WORKERS`` threads) with at most
+  ``PER_HOST`` requests at a time per host;
+- an entry keeps the ``ETag`` / ``Last-Modified`` of its page:
+  ``refresh`` revalidates with a conditional request and a 304 keeps the
+  cached body;
+- the cache is bounded to ``MAX_CACHE_BYTES``: the oldest entries are
+  evicted first.
+
+::
+
+    python3 run.py scraper --fulltext
+    python3 -m scraper.fulltext fetch --limit 50    # Articles du store absents du cache
+    python3 -m scraper.fulltext fetch --refresh     # Revalidation (ETag / Last-Modified)
+    python3 -m scraper.fulltext extract <url>       # Tester l'extraction d'une page
+    python3 -m scraper.fulltext status
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+FULLTEXT_FILE = os.path.join(DATA_DIR, 'fulltext.sqlite')
+WORKERS = 8
+PER_HOST = 2               # Requêtes simultanées par hôte
+TIMEOUT = 15
+MAX_PAGE_BYTES = 3 * 1024 * 1024
+MAX_CACHE_BYTES = 200 * 1024 * 1024
+MIN_PARAGRAPH_CHARS = 25
+MIN_BODY_CHARS = 250       # En dessous : pas de corps exploitable (page vide, paywall, vidéo)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bodies (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    body TEXT,
+    size INTEGER NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS bodies_fetched ON bodies (fetched_at);
+"""
+
+# --- Extraction ---
+
+# Éléments jamais porteurs du corps de l'article
+_STRIP_TAGS = ('script', 'style', 'noscript', 'iframe', 'form', 'nav', 'header', 'footer',
+               'aside', 'svg', 'button', 'figcaption')
+_UNLIKELY = re.compile(r'comment|footer|nav|sidebar|share|social|related|promo|advert|banner|'
+                       r'cookie|newsletter|subscribe|popup|modal|menu|breadcrumb|masthead|widget', re.I)
+_POSITIVE = re.compile(r'article|body|content|entry|main|post|story|text|blog', re.I)
+_NEGATIVE = re.compile(r'comment|footer|sidebar|share|related|promo|meta|byline|caption|author|tags?\b', re.I)
+_BLOCKS = ('p', 'pre', 'blockquote', 'h2', 'h3', 'li')
+_HEADINGS = ('h2', 'h3')
+_SPACES = re.compile(r'\s+')
+
+
+def _text(element) -> str:
+    return _SPACES.sub(' ', element.text_content()).strip()
+
+
+def _class_weight(element) -> int:
+    names = f"{element.get('class') or ''} {element.get('id') or ''}"
+    weight = 0
+    if _POSITIVE.search(names):
+        weight += 25
+    if _NEGATIVE.search(names):
+        weight -= 25
+    return weight
+
+
+def _link_density(element, text: str) -> float:
+    if not text:
+        return 1.0
+    links = sum(len(_text(link)) for link in element.iter('a'))
+    return min(1.0, links / len(text))
+
+
+def _nested(block, container) -> bool:
+    """Block inside another block of the container (li of a blockquote…): taken with its parent"""
+    for ancestor in block.iterancestors():
+        if ancestor is container:
+            return False
+        if ancestor.tag in _BLOCKS:
+            return True
+    return False
+
+
+def extract_body(content: bytes, encoding: Optional[str] = None) -> Optional[str]:
+    """Main text of an article page, paragraphs separated by blank lines; None if none is found"""
+    from lxml import etree
+    from .extractors import parse_document
+
+    document = parse_document(content, encoding)
+    etree.strip_elements(document, etree.Comment, *_STRIP_TAGS, with_tail=False)
+    for element in list(document.iter('div', 'section', 'ul', 'span', 'table')):
+        names = f"{element.get('class') or ''} {element.get('id') or ''}"
+        if _UNLIKELY.search(names) and not _POSITIVE.search(names) and element.getparent() is not None:
+            element.drop_tree()
+
+    # Chaque paragraphe vote pour son parent (et pour moitié pour son grand-parent)
+    scores = {}
+    for paragraph in document.iter('p', 'pre'):
+        text = _text(paragraph)
+        if len(text) < MIN_PARAGRAPH_CHARS:
+            continue
+        points = 1 + text.count(',') + min(len(text) // 100, 3)
+        parent = paragraph.getparent()
+        grandparent = parent.getparent() if parent is not None else None
+        for ancestor, share in ((parent, 1.0), (grandparent, 0.5)):
+            if ancestor is None:
+                continue
+            if ancestor not in scores:
+                scores[ancestor] = _class_weight(ancestor) + (10 if ancestor.tag in ('article', 'main') else 0)
+            scores[ancestor] += points * share
+    if not scores:
+        return None
+    ranked = {element: score * (1 - _link_density(element, _text(element))) for element, score in scores.items()}
+    top = max(ranked, key=ranked.get)
+
+    # Frères du meilleur candidat assez bien notés : article découpé en plusieurs blocs
+    parent = top.getparent()
+    threshold = max(10.0, ranked[top] * 0.2)
+    containers = [sibling for sibling in (parent if parent is not None else [top])
+                  if sibling is top or ranked.get(sibling, 0) >= threshold]
+
+    paragraphs = []
+    for container in containers:
+        for block in container.iter(*_BLOCKS):
+            if _nested(block, container):
+                continue
+            text = _text(block)
+            if not text:
+                continue
+            if block.tag in _HEADINGS or (len(text) >= MIN_PARAGRAPH_CHARS and _link_density(block, text) < 0.5):
+                paragraphs.append(text)
+    # Intertitres en fin de corps (blocs « à lire aussi ») : retirés
+    while paragraphs and len(paragraphs[-1]) < MIN_PARAGRAPH_CHARS:
+        paragraphs.pop()
+    body = '\n\n'.join(paragraphs)
+    return body if len(body) >= MIN_BODY_CHARS else None
+
+
+# --- Cache ---
+
+class FullTextCache:
+    """Article bodies by URL (SQLite), with the validators of their page and a size bound"""
+
+    def __init__(self, path: str = FULLTEXT_FILE, max_bytes: int = MAX_CACHE_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as db:
+            db.execute('PRAGMA journal_mode=WAL')  # Lectures (build, Flask) sans bloquer le scraper
+            db.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            yield db
+            db.commit()
+        finally:
+            db.close()
+
+    def get(self, url: str) -> Optional[str]:
+        """Body of an article, None if it was not fetched or has no extractable body"""
+        with self._connect() as db:
+            row = db.execute("SELECT body FROM bodies WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else None
+
+    def validators(self, url: str) -> Optional[Dict]:
+        """``{'etag', 'last_modified'}`` of a cached page, None if the URL is not in the cache"""
+        with self._connect() as db:
+            row = db.execute("SELECT etag, last_modified FROM bodies WHERE url = ?", (url,)).fetchone()
+        return {'etag': row[0], 'last_modified': row[1]} if row else None
+
+    def missing(self, urls: Iterable[str]) -> List[str]:
+        """URLs not in the cache, in order"""
+        urls = list(dict.fromkeys(urls))
+        known = set()
+        with self._connect() as db:
+            for start in range(0, len(urls), 500):
+                chunk = urls[start:start + 500]
+                known.update(row[0] for row in db.execute(
+                    f"SELECT url FROM bodies WHERE url IN ({','.join('?' * len(chunk))})", chunk))
+        return [url for url in urls if url not in known]
+
+    def put(self, url: str, body: Optional[str], etag: Optional[str] = None,
+            last_modified: Optional[str] = None) -> None:
+        size = len(url) + len((body or '').encode('utf-8'))
+        with self._connect() as db:
+            db.execute("INSERT OR REPLACE INTO bodies (url, etag, last_modified, body, size, fetched_at) "
+                       "VALUES (?, ?, ?, ?, ?, ?)", (url, etag, last_modified, body, size, time.time()))
+
+    def touch(self, url: str) -> None:
+        """Page unchanged (304): the cached body stays valid"""
+        with self._connect() as db:
+            db.execute("UPDATE bodies SET fetched_at = ? WHERE url = ?", (time.time(), url))
+
+    def size(self) -> int:
+        with self._connect() as db:
+            return db.execute("SELECT COALESCE(SUM(size), 0) FROM bodies").fetchone()[0]
+
+    def evict(self) -> int:
+        """Drop the oldest entries until the cache fits in ``max_bytes``; return how many were dropped"""
+        excess = self.size() - self.max_bytes
+        if excess <= 0:
+            return 0
+        dropped = []
+        with self._connect() as db:
+            for url, size in db.execute("SELECT url, size FROM bodies ORDER BY fetched_at"):
+                if excess <= 0:
+                    break
+                dropped.append(url)
+                excess -= size
+            db.executemany("DELETE FROM bodies WHERE url = ?", ((url,) for url in dropped))
+        return len(dropped)
+
+    def counts(self) -> Dict[str, int]:
+        with self._connect() as db:
+            total, with_body, size = db.execute(
+                "SELECT COUNT(*), COUNT(body), COALESCE(SUM(size), 0) FROM bodies").fetchone()
+        return {'entries': total, 'bodies': with_body, 'bytes': size}
+
+
+def read_body(url: str, path: str = FULLTEXT_FILE) -> Optional[str]:
+    """Body of an article for the page renderers: read-only, None without full-text cache"""
+    if not os.path.exists(path):
+        return None
+    db = sqlite3.connect(f'file:{path}?mode=ro', uri=True, timeout=30)
+    try:
+        row = db.execute("SELECT body FROM bodies WHERE url = ?", (url,)).fetchone()
+    except sqlite3.Error:
+        return None
+    finally:
+        db.close()
+    return row[0] if row else None
+
+
+# --- Téléchargement ---
+
+class FullTextFetcher:
+    """Fetch and extract article pages concurrently, at most ``per_host`` requests per host"""
+
+    def __init__(self, cache: Optional[FullTextCache] = None, workers: int = WORKERS,
+                 per_host: int = PER_HOST, session=None, timeout: float = TIMEOUT):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.cache = cache or FullTextCache()
+        self.workers = workers
+        self.per_host = per_host
+        self.timeout = timeout
+        if session is None:
+            session = requests.Session()
+            session.headers['User-Agent'] = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                                             '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+        # Un pool de connexions assez grand pour tous les threads
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        self.session = session
+        self._hosts: Dict[str, threading.Semaphore] = {}
+        self._lock = threading.Lock()
+
+    def _host_slot(self, url: str) -> threading.Semaphore:
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = threading.Semaphore(self.per_host)
+            return self._hosts[host]
+
+    def fetch(self, url: str, revalidate: bool = False) -> str:
+        """Fetch one page into the cache: 'fetched', 'empty' (no body), 'not_modified' or 'failed'"""
+        headers = {}
+        if revalidate:
+            known = self.cache.validators(url) or {}
+            if known.get('etag'):
+                headers['If-None-Match'] = known['etag']
+            if known.get('last_modified'):
+                headers['If-Modified-Since'] = known['last_modified']
+        try:
+            with self._host_slot(url):
+                response = self.session.get(url, headers=headers, timeout=self.timeout, stream=True)
+                try:
+                    if response.status_code == 304:
+                        self.cache.touch(url)
+                        return 'not_modified'
+                    if response.status_code != 200:
+                        logger.debug(f"Texte intégral: status {response.status_code} pour {url}")
+                        return 'failed'
+                    content_type = response.headers.get('Content-Type', 'text/html')
+                    chunks, size = [], 0
+                    if 'html' in content_type:
+                        for chunk in response.iter_content(chunk_size=64 * 1024):
+                            chunks.append(chunk)
+                            size += len(chunk)
+                            if size >= MAX_PAGE_BYTES:
+                                break
+                    encoding = response.encoding if 'charset' in content_type.lower() else None
+                    etag = response.headers.get('ETag')
+                    last_modified = response.headers.get('Last-Modified')
+                finally:
+                    response.close()
+            body = extract_body(b''.join(chunks), encoding) if chunks else None
+        except Exception as e:
+            logger.debug(f"Texte intégral: {url}: {str(e)[:100]}")
+            return 'failed'
+        # Page sans corps exploitable : mémorisée aussi, pour ne pas la retélécharger à chaque run
+        self.cache.put(url, body, etag, last_modified)
+        return 'fetched' if body else 'empty'
+
+    def fetch_all(self, urls: Iterable[str], refresh: bool = False, budget=None) -> Dict[str, int]:
+        """
+        Fetch the URLs missing from the cache (``refresh``: revalidate the cached ones too)
+        With a ``budget`` (scraper.checkpoint.Budget), pages not started when it is spent are left
+        for the next run. Returns the count of each outcome.
+        """
+        urls = list(dict.fromkeys(urls))
+        missing = set(self.cache.missing(urls))
+        todo = [url for url in urls if refresh or url in missing]
+        stats = {'fetched': 0, 'empty': 0, 'not_modified': 0, 'failed': 0, 'skipped': 0,
+                 'cached': len(urls) - len(todo)}
+
+        def task(url):
+            if budget is not None and budget.expired():
+                return 'skipped'
+            return self.fetch(url, revalidate=url not in missing)
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='fulltext') as executor:
+            for outcome in executor.map(task, todo):
+                stats[outcome] += 1
+        stats['evicted'] = self.cache.evict()
+        return stats
+
+
+def fetch_bodies(urls: Iterable[str], budget=None) -> Dict[str, int]:
+    """Full-text stage of a scraping run: bodies of the new articles"""
+    stats = FullTextFetcher().fetch_all(urls, budget=budget)
+    logger.info(f"📄 Texte intégral: {stats['fetched']} extraits, {stats['empty']} sans corps, "
+                f"{stats['failed']} échecs, {stats['cached']} déjà en cache"
+                + (f", {stats['skipped']} reportés" if stats['skipped'] else ""))
+    return stats
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Texte intégral des articles (cache data/fulltext.sqlite)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    fetch_parser = subparsers.add_parser('fetch', help="Télécharger le corps des articles du store")
+    fetch_parser.add_argument('--limit', type=int, default=None, help="Articles les plus récents seulement")
+    fetch_parser.add_argument('--refresh', action='store_true',
+                              help="Revalider aussi les pages en cache (requêtes conditionnelles)")
+    fetch_parser.add_argument('--workers', type=int, default=WORKERS)
+    fetch_parser.add_argument('--per-host', type=int, default=PER_HOST)
+    extract_parser = subparsers.add_parser('extract', help="Extraire le corps d'une page (sans cache)")
+    extract_parser.add_argument('url')
+    subparsers.add_parser('status', help="Taille et contenu du cache")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.command == 'status':
+        print(json.dumps(FullTextCache().counts()))
+        return 0
+    if args.command == 'extract':
+        import requests
+        response = requests.get(args.url, timeout=TIMEOUT)
+        body = extract_body(response.content)
+        print(body or "Aucun corps d'article trouvé")
+        return 0 if body else 1
+
+    with open(os.path.join(DATA_DIR, 'ia_news.json'), 'r', encoding='utf-8') as f:
+        articles = json.load(f)
+    articles.sort(key=lambda a: a.get('published_at') or '', reverse=True)
+    urls = [a['url'] for a in articles[:args.limit] if a.get('url', '').startswith(('http://', 'https://'))]
+    fetcher = FullTextFetcher(workers=args.workers, per_host=args.per_host)
+    print(json.dumps(fetcher.fetch_all(urls, refresh=args.refresh)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Cold-import benchmark of the entry points (``python -X importtime``).
+
+Each entry point is imported in a fresh interpreter, several times, and the
+best cumulative import time is kept. The report lists the heaviest
+top-level imports of each one. ``--check`` turns it into a regression test:
+it fails when an entry point loads a dependency it must only load on demand
+(``requests``, ``bs4``, ``feedparser``, the translator, ``numpy``; for
+the web workers, also the build modules, the profiler and the full-text
+store), or when an import exceeds ``--budget-ms``::
+
+    python3 -m scraper.importbench
+    python3 -m scraper.importbench --check --budget-ms 400
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Chargées à la demande (scraping, /refresh, stats) : jamais à l'import d'un point d'entrée
+LAZY_MODULES = ('requests', 'bs4', 'feedparser', 'scraper.translator', 'numpy')
+# Workers Flask : ni la chaîne de build, ni le profilage, ni le texte intégral à l'import
+WEB_LAZY_MODULES = LAZY_MODULES + ('build_static', 'sitegen.assets', 'sitegen.deploy', 'sitegen.incremental',
+                                   'scraper.fulltext', 'cProfile', 'tracemalloc')
+
+# Nom -> (module importé, modules interdits à l'import)
+ENTRY_POINTS = {
+    'web': ('app', WEB_LAZY_MODULES),               # website/app.py (workers Flask)
+    'build': ('build_static', LAZY_MODULES),
+    'cli': ('run', LAZY_MODULES),
+    'scraper': ('scraper.scraper', LAZY_MODULES),
+    'cron': ('update_news', LAZY_MODULES),
+}
+DEFAULT_RUNS = 5
+TOP_IMPORTS = 5
+
+
+def parse_importtime(output: str) -> List[Dict]:
+    """``-X importtime`` lines as ``{'module', 'self_us', 'cumulative_us', 'depth'}``"""
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+            rows.append({
+                'module': name.strip(),
+                'self_us': int(self_us),
+                'cumulative_us': int(cumulative_us),
+                # Indentation de deux espaces par niveau, après le séparateur
+                'depth': (len(name) - len(name.lstrip()) - 1) // 2,
+            })
+        except ValueError:
+            continue
+    return rows
+
+
+def measure(module: str) -> Dict:
+    """Import ``module`` in a fresh interpreter and return its timings"""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [
+        PROJECT_ROOT, os.path.join(PROJECT_ROOT, 'website'), env.get('PYTHONPATH'),
+    ]))
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} a échoué :\n{result.stderr[-2000:]}")
+    rows = parse_importtime(result.stderr)
+    end = next(i for i, r in enumerate(rows) if r['module'] == module and r['depth'] == 0)
+    # Les imports d'un module sont listés avant lui : ses enfants directs sont
+    # les lignes de profondeur 1 qui le précèdent, jusqu'à l'import de tête précédent
+    children = []
+    for row in reversed(rows[:end]):
+        if row['depth'] == 0:
+            break
+        if row['depth'] == 1:
+            children.append(row)
+    return {
+        'total_us': rows[end]['cumulative_us'],
+        'modules': {r['module'] for r in rows},
+        'top': sorted(children, key=lambda r: r['cumulative_us'], reverse=True)[:TOP_IMPORTS],
+    }
+
+
+def benchmark(entry_points: Dict = ENTRY_POINTS, runs: int = DEFAULT_RUNS) -> Dict[str, Dict]:
+    """Best of ``runs`` cold imports for every entry point"""
+    measure(next(iter(entry_points.values()))[0])  # Préchauffage : fichiers .pyc et cache disque
+    results = {}
+    for name, (module, _) in entry_points.items():
+        samples = [measure(module) for _ in range(runs)]
+        results[name] = min(samples, key=lambda s: s['total_us'])
+        results[name]['module'] = module
+    return results
+
+
+def check(results: Dict[str, Dict], entry_points: Dict = ENTRY_POINTS,
+          budget_ms: Optional[float] = None) -> List[str]:
+    """Problems found: lazy modules loaded at import time, budget exceeded"""
+    problems = []
+    for name, result in results.items():
+        for lazy in entry_points[name][1]:
+            if lazy in result['modules']:
+                problems.append(f"{name}: '{lazy}' est chargé à l'import de {result['module']}")
+        if budget_ms is not None and result['total_us'] / 1000 > budget_ms:
+            problems.append(f"{name}: {result['total_us'] / 1000:.0f} ms > budget de {budget_ms:.0f} ms")
+    return problems
+
+
+def format_report(results: Dict[str, Dict]) -> str:
+    lines = []
+    for name, result in results.items():
+        lines.append(f"{name:<8} {result['module']:<16} {result['total_us'] / 1000:>8.1f} ms")
+        for row in result['top']:
+            lines.append(f"           {row['cumulative_us'] / 1000:>8.1f} ms  {row['module']}")
+    return '\n'.join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Temps d'import à froid des points d'entrée (-X importtime)")
+    parser.add_argument('entries', nargs='*', metavar='entry',
+                        help=f"Points d'entrée à mesurer parmi {', '.join(ENTRY_POINTS)} (défaut : tous)")
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS, help="Imports par point d'entrée (meilleur temps retenu)")
+    parser.add_argument('--check', action='store_true', help="Échouer si un import paresseux régresse")
+    parser.add_argument('--budget-ms', type=float, default=None, help="Avec --check : temps d'import maximal")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.entries if name not in ENTRY_POINTS]
+    if unknown:
+        parser.error(f"point d'entrée inconnu : {', '.join(unknown)}")
+
+    entry_points = {name: ENTRY_POINTS[name] for name in (args.entries or ENTRY_POINTS)}
+    results = benchmark(entry_points, args.runs)
+    print(format_report(results))
+    if not args.check:
+        return 0
+    problems = check(results, entry_points, args.budget_ms)
+    for problem in problems:
+        print(f"❌ {problem}")
+    if not problems:
+        print("✅ Imports paresseux respectés")
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
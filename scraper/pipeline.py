@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Streaming scraping pipeline: fetch → filter → translate → persist.
+
+Stages run in their own threads and are joined by bounded queues. When a
+downstream stage falls behind, its queue fills up and the upstream stage
+blocks on ``put`` (backpressure), so memory stays bounded by the queue
+sizes instead of growing with the number of sources:
+
+- ``fetch`` (``STAGE_WORKERS['fetch']`` threads): one source at a time,
+  read through ``IANewsScraper.iter_source``: each item is emitted as soon
+  as its feed entry (or sitemap page) is parsed, before the rest of the
+  source is read;
+- ``filter`` (one thread): dedup, age and topic filters, slug and ID
+  (``IANewsScraper.accept_item``);
+- ``translate`` (``STAGE_WORKERS['translate']`` threads): only the new
+  articles, never the whole store; articles waiting in the queue are
+  translated together (``TRANSLATE_BATCH``) so they share requests;
+- ``persist`` (one thread, the only one touching ``scraper.news``): adds
+  each article to the run checkpoint as soon as it arrives and saves the
+  store at most every ``PERSIST_INTERVAL`` seconds. The checkpoint file is
+  written when a source is done and with each store save (which empties
+  its article list), not for every article.
+
+An article is therefore saved a few seconds after its feed is read, whatever
+the slowest source. A source is marked done in the checkpoint once all its
+accepted articles are persisted. When the run budget is spent, fetchers stop
+taking sources and translators let articles through untranslated (they are
+translated by the next run).
+"""
+
+import logging
+import queue
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+from . import profiling
+from .checkpoint import Budget, Checkpoint, source_key
+
+logger = logging.getLogger(__name__)
+
+STAGE_WORKERS = {'fetch': 4, 'translate': 2}
+QUEUE_SIZES = {'items': 200, 'translate': 50, 'persist': 50}
+TRANSLATE_BATCH = 10  # Articles en attente traduits par les mêmes requêtes
+PERSIST_INTERVAL = 5.0
+SOURCE_PAUSE = {'rss': (0.5, 1.5), 'site': (1, 2)}  # Politesse entre deux sources d'un même fetcher
+
+_STOP = object()
+
+
+class StreamingPipeline:
+    """One scraping run through the fetch → filter → translate → persist stages"""
+
+    def __init__(self, scraper, translator=None, checkpoint: Optional[Checkpoint] = None,
+                 budget: Optional[Budget] = None, workers: Optional[Dict[str, int]] = None,
+                 queue_sizes: Optional[Dict[str, int]] = None, persist_interval: float = PERSIST_INTERVAL):
+        self.scraper = scraper
+        self.translator = translator
+        self.checkpoint = checkpoint or Checkpoint()
+        self.budget = budget or Budget()
+        self.workers = dict(STAGE_WORKERS, **(workers or {}))
+        sizes = dict(QUEUE_SIZES, **(queue_sizes or {}))
+        self.persist_interval = persist_interval
+
+        self.sources = queue.Queue()
+        self.items = queue.Queue(maxsize=sizes['items'])
+        self.to_translate = queue.Queue(maxsize=sizes['translate'])
+        self.to_persist = queue.Queue(maxsize=sizes['persist'])
+        self.complete = True
+        self.stats = {'sources': 0, 'accepted': 0, 'translated': 0, 'persisted': 0, 'saves': 0}
+        self._lock = threading.Lock()
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self.stats[key] += n
+
+    # --- Étapes ---
+
+    def _fetch(self) -> None:
+        profiler = profiling.active()
+        while True:
+            try:
+                kind, source = self.sources.get_nowait()
+            except queue.Empty:
+                return
+            if self.budget.expired():
+                self.complete = False
+                return
+            key = source_key(kind, source)
+            label = source['name'] if kind == 'rss' else f"{source['name']} (web)"
+            try:
+                with profiler.timed('sources', label):
+                    for item in self.scraper.iter_source(kind, source):
+                        self.items.put(('item', key, source, item))
+            except Exception as e:
+                logger.error(f"❌ {label}: {str(e)[:100]}")
+            self.items.put(('end', key, source, None))
+            self._count('sources')
+            time.sleep(random.uniform(*SOURCE_PAUSE[kind]))
+
+    def _filter(self) -> None:
+        accepted = {}
+        while True:
+            message = self.items.get()
+            if message is _STOP:
+                return
+            kind, key, source, item = message
+            if kind == 'end':
+                # Le persisteur marque la source terminée quand ses articles sont tous enregistrés
+                self.to_persist.put(('expect', key, accepted.pop(key, 0)))
+                continue
+            try:
+                article = self.scraper.accept_item(item, source)
+            except Exception as e:
+                logger.debug(f"Article rejeté ({key}): {e}")
+                continue
+            if article is not None:
+                accepted[key] = accepted.get(key, 0) + 1
+                self._count('accepted')
+                self.to_translate.put((key, article))
+
+    def _translate(self) -> None:
+        stopped = False
+        while not stopped:
+            message = self.to_translate.get()
+            if message is _STOP:
+                return
+            # Articles déjà en attente traduits ensemble : leurs phrases partagent les requêtes
+            batch = [message]
+            while len(batch) < TRANSLATE_BATCH:
+                try:
+                    message = self.to_translate.get_nowait()
+                except queue.Empty:
+                    break
+                if message is _STOP:
+                    stopped = True
+                    break
+                batch.append(message)
+            if self.translator is not None and not self.budget.expired():
+                try:
+                    self.translator.translate_batch([article for _, article in batch])
+                    # Traduction échouée : l'article part sans title_fr, retraduit au run suivant
+                    self._count('translated', sum('title_fr' in article for _, article in batch))
+                except Exception as e:
+                    logger.debug(f"Traduction impossible: {e}")
+            for key, article in batch:
+                self.to_persist.put(('article', key, article))
+
+    def _persist(self) -> None:
+        expected, persisted = {}, {}
+        last_save = time.monotonic()
+        dirty = False
+        while True:
+            message = self.to_persist.get()
+            if message is _STOP:
+                break
+            try:
+                kind, key, value = message
+                if kind == 'article':
+                    self.scraper.news.append(value)
+                    self.checkpoint.articles.append(value.to_dict())
+                    persisted[key] = persisted.get(key, 0) + 1
+                    self._count('persisted')
+                    dirty = True
+                else:
+                    expected[key] = value
+                if key in expected and persisted.get(key, 0) >= expected[key]:
+                    self.checkpoint.done.add(key)
+                    del expected[key]
+                    self.checkpoint.save()
+                if dirty and time.monotonic() - last_save >= self.persist_interval:
+                    self._save()
+                    last_save = time.monotonic()
+                    dirty = False
+            except Exception as e:
+                logger.error(f"❌ Enregistrement: {str(e)[:100]}")
+        if dirty:
+            self._save()
+
+    def _save(self) -> None:
+        """Save the store; the articles it now holds leave the checkpoint"""
+        if self.scraper.save_news():
+            self.checkpoint.articles = []
+            self.checkpoint.save()
+            if self.translator is not None:
+                self.translator.checkpoint()
+            self._count('saves')
+
+    # --- Exécution ---
+
+    def _start(self, target, count: int, name: str):
+        profiler = profiling.active()
+
+        def run():
+            # Avec --profile : chaque étape est profilée dans son thread, fusionnée dans la phase
+            with profiler.thread():
+                target()
+
+        threads = [threading.Thread(target=run, name=f'{name}-{i}', daemon=True) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        return threads
+
+    def run(self) -> bool:
+        """Run every source not done yet through the stages; False if the budget ran out"""
+        for kind, key in (('rss', 'rss_feeds'), ('site', 'sites')):
+            for source in self.scraper.sources.get(key, []):
+                if source_key(kind, source) not in self.checkpoint.done:
+                    self.sources.put((kind, source))
+
+        fetchers = self._start(self._fetch, self.workers['fetch'], 'fetch')
+        filterer = self._start(self._filter, 1, 'filter')
+        translators = self._start(self._translate, self.workers['translate'], 'translate')
+        persister = self._start(self._persist, 1, 'persist')
+
+        # Arrêt en cascade : chaque étape s'arrête quand celle d'avant a tout livré
+        for thread in fetchers:
+            thread.join()
+        self.items.put(_STOP)
+        filterer[0].join()
+        for _ in translators:
+            self.to_translate.put(_STOP)
+        for thread in translators:
+            thread.join()
+        self.to_persist.put(_STOP)
+        persister[0].join()
+
+        logger.info(f"🚰 Pipeline: {self.stats['sources']} sources, {self.stats['accepted']} articles nouveaux, "
+                    f"{self.stats['translated']} traduits, {self.stats['saves']} sauvegardes")
+        return self.complete
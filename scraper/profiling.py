@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Opt-in profiling of scraper and build runs (``--profile``).
+
+A run is split into phases (``profiler.step('rss')``...). Each phase gets its
+own cProfile capture, wall time and tracemalloc peak; named timings (one per
+template, one per source...) are accumulated on the side. Worker threads
+(the scraping pipeline stages) run under ``profiler.thread()``: their own
+capture is merged into the phase when they finish. ``finish()`` writes,
+under ``data/profiles/<run>-<timestamp>/``:
+
+- ``<phase>.prof``: pstats files (``python -m pstats``, snakeviz...);
+- ``report.json``: phases, timings and top functions, to compare runs;
+- ``summary.txt``: the same, short and readable.
+
+When profiling is off, ``active()`` returns a no-op profiler, so call sites
+cost nothing in normal runs, and cProfile, pstats and tracemalloc are not
+even imported (the Flask app reaches this module through the fragment cache). Compare two runs with::
+
+    python3 -m scraper.profiling compare data/profiles/build-A data/profiles/build-B
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+PROFILES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'profiles')
+TOP_FUNCTIONS = 15
+
+
+class _NullProfiler:
+    """Profiler used when profiling is off: every call is a no-op"""
+
+    enabled = False
+
+    def step(self, name: str):
+        pass
+
+    @contextmanager
+    def timed(self, group: str, key: str):
+        yield
+
+    @contextmanager
+    def thread(self):
+        yield
+
+    def finish(self):
+        return None
+
+
+class Profiler:
+    """cProfile + tracemalloc per phase, plus named wall-time counters"""
+
+    enabled = True
+
+    def __init__(self, run_name: str, output_dir: str = PROFILES_DIR):
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        self.run_name = run_name
+        self.output_dir = os.path.join(output_dir, f"{run_name}-{stamp}")
+        self.phases = []
+        self.timings = {}
+        self._current = None
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()  # timed() et thread() sont appelés depuis plusieurs threads
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def step(self, name: str):
+        """End the current phase (if any) and start the next one"""
+        import cProfile
+        import tracemalloc
+
+        self._end_phase()
+        tracemalloc.reset_peak()
+        profile = cProfile.Profile()
+        self._current = {
+            'name': name,
+            'profile': profile,
+            'start': time.perf_counter(),
+            'memory_start': tracemalloc.get_traced_memory()[0],
+            'threads': [],
+        }
+        profile.enable()
+
+    def _end_phase(self):
+        if self._current is None:
+            return
+        import pstats
+        import tracemalloc
+
+        phase = self._current
+        phase['profile'].disable()
+        current, peak = tracemalloc.get_traced_memory()
+        stats = pstats.Stats(phase['profile'])
+        with self._lock:
+            threads = list(phase['threads'])
+        if threads:
+            stats.add(*threads)
+        self.phases.append({
+            'name': phase['name'],
+            'wall_seconds': round(time.perf_counter() - phase['start'], 4),
+            'memory_peak_kb': peak // 1024,
+            'memory_delta_kb': (current - phase['memory_start']) // 1024,
+            'profile': stats,
+        })
+        self._current = None
+
+    @contextmanager
+    def thread(self):
+        """Profile the calling worker thread and merge its capture into the current phase"""
+        import cProfile
+
+        phase = self._current
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+ : cProfile passe par sys.monitoring, commun à tous les threads ;
+            # le profil de la phase voit déjà ce thread et un second profil est refusé
+            yield
+            return
+        try:
+            yield
+        finally:
+            profile.disable()
+            if phase is not None:
+                with self._lock:
+                    phase['threads'].append(profile)
+
+    @contextmanager
+    def timed(self, group: str, key: str):
+        """Accumulate the wall time of a block under ``timings[group][key]``"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                entry = self.timings.setdefault(group, {}).setdefault(key, {'count': 0, 'total': 0.0, 'max': 0.0})
+                entry['count'] += 1
+                entry['total'] += elapsed
+                entry['max'] = max(entry['max'], elapsed)
+
+    def finish(self) -> str:
+        """Write the profile files and the summary; return the output directory"""
+        import tracemalloc
+
+        self._end_phase()
+        os.makedirs(self.output_dir, exist_ok=True)
+        report = {
+            'run': self.run_name,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'total_seconds': round(time.perf_counter() - self._started, 4),
+            'memory_peak_kb': tracemalloc.get_traced_memory()[1] // 1024,
+            'phases': [],
+            'timings': {},
+        }
+        for index, phase in enumerate(self.phases):
+            prof_file = f"{index:02d}-{phase['name']}.prof"
+            phase['profile'].dump_stats(os.path.join(self.output_dir, prof_file))
+            report['phases'].append({
+                'name': phase['name'],
+                'wall_seconds': phase['wall_seconds'],
+                'memory_peak_kb': phase['memory_peak_kb'],
+                'memory_delta_kb': phase['memory_delta_kb'],
+                'profile': prof_file,
+                'top_functions': _top_functions(phase['profile']),
+            })
+        for group, entries in self.timings.items():
+            ordered = sorted(entries.items(), key=lambda item: item[1]['total'], reverse=True)
+            report['timings'][group] = {
+                key: {'count': e['count'], 'total': round(e['total'], 4), 'max': round(e['max'], 4)}
+                for key, e in ordered
+            }
+
+        with open(os.path.join(self.output_dir, 'report.json'), 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        summary = format_summary(report)
+        with open(os.path.join(self.output_dir, 'summary.txt'), 'w', encoding='utf-8') as f:
+            f.write(summary)
+        tracemalloc.stop()
+        print(summary)
+        print(f"📈 Profil enregistré dans {self.output_dir}")
+        return self.output_dir
+
+
+def _top_functions(profile, limit: int = TOP_FUNCTIONS) -> List[Dict]:
+    """Functions with the most own time (tottime) of a ``pstats.Stats``"""
+    stats = profile.stats
+    rows = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)[:limit]
+    top = []
+    for (filename, line, function), (_, calls, tottime, cumtime, _) in rows:
+        top.append({
+            'function': f"{function} ({os.path.basename(filename)}:{line})",
+            'calls': calls,
+            'tottime': round(tottime, 4),
+            'cumtime': round(cumtime, 4),
+        })
+    return top
+
+
+def format_summary(report: Dict, top: int = 5) -> str:
+    lines = [f"=== Profil {report['run']} : {report['total_seconds']:.2f}s, "
+             f"pic mémoire {report['memory_peak_kb'] / 1024:.1f} Mo ==="]
+    for phase in report['phases']:
+        lines.append(f"\n[{phase['name']}] {phase['wall_seconds']:.2f}s, pic {phase['memory_peak_kb'] / 1024:.1f} Mo")
+        for fn in phase['top_functions'][:top]:
+            lines.append(f"   {fn['tottime']:>8.3f}s propre  {fn['cumtime']:>8.3f}s cumulé  {fn['calls']:>8} appels  {fn['function']}")
+    for group, entries in report['timings'].items():
+        lines.append(f"\n[{group}] les plus lents")
+        for key, entry in list(entries.items())[:top]:
+            lines.append(f"   {entry['total']:>8.3f}s  x{entry['count']:<6} max {entry['max']:.3f}s  {key}")
+    return '\n'.join(lines) + '\n'
+
+
+_active = _NullProfiler()
+
+
+def start(run_name: str, output_dir: str = PROFILES_DIR) -> Profiler:
+    """Enable profiling for this process and return the profiler"""
+    global _active
+    _active = Profiler(run_name, output_dir)
+    return _active
+
+
+def active():
+    """The running profiler, or a no-op one"""
+    return _active
+
+
+def stop() -> Optional[str]:
+    """Finish the running profiler (if any) and disable profiling"""
+    global _active
+    output_dir = _active.finish()
+    _active = _NullProfiler()
+    return output_dir
+
+
+def _load_report(path: str) -> Dict:
+    if os.path.isdir(path):
+        path = os.path.join(path, 'report.json')
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare(before: Dict, after: Dict) -> str:
+    """Per-phase and per-timing deltas between two reports"""
+    lines = [f"Total: {before['total_seconds']:.2f}s -> {after['total_seconds']:.2f}s "
+             f"({after['total_seconds'] - before['total_seconds']:+.2f}s)"]
+    old_phases = {p['name']: p for p in before['phases']}
+    for phase in after['phases']:
+        old = old_phases.get(phase['name'])
+        if old:
+            lines.append(f"  {phase['name']:<20} {old['wall_seconds']:>8.2f}s -> {phase['wall_seconds']:>8.2f}s "
+                         f"({phase['wall_seconds'] - old['wall_seconds']:+.2f}s)   "
+                         f"pic {old['memory_peak_kb']} -> {phase['memory_peak_kb']} Ko")
+    for group, entries in after['timings'].items():
+        old_entries = before['timings'].get(group, {})
+        deltas = [
+            (entry['total'] - old_entries[key]['total'], key, old_entries[key]['total'], entry['total'])
+            for key, entry in entries.items() if key in old_entries
+        ]
+        deltas.sort(reverse=True)
+        if deltas:
+            lines.append(f"[{group}] plus fortes hausses")
+            for delta, key, old_total, new_total in deltas[:10]:
+                lines.append(f"  {key:<40} {old_total:>8.3f}s -> {new_total:>8.3f}s ({delta:+.3f}s)")
+    return '\n'.join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Outils pour les profils enregistrés avec --profile")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    compare_parser = subparsers.add_parser('compare', help="Comparer deux profils (dossiers ou report.json)")
+    compare_parser.add_argument('before')
+    compare_parser.add_argument('after')
+    summary_parser = subparsers.add_parser('summary', help="Afficher le résumé d'un profil")
+    summary_parser.add_argument('path')
+    args = parser.parse_args(argv)
+
+    if args.command == 'compare':
+        print(compare(_load_report(args.before), _load_report(args.after)))
+    else:
+        print(format_summary(_load_report(args.path)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
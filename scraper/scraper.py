@@ -1,102 +1,74 @@
-import requests
 import json
-import re
 import os
-from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
+import calendar
+from datetime import datetime, timedelta, timezone
 import time
 import random
-from urllib.parse import urlparse, urljoin
-import feedparser
+from urllib.parse import urlparse
 import logging
-from .translator import translate_articles
-
-# Configuration du logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+from .article import Article, dump_articles, load_articles
+from .slugs import assign_identity, backfill_identities
+from .store import write_store
+from .feeds import iter_feed_entries
+from .sitemaps import candidate_sitemaps, fetch_head_metadata, iter_sitemap
+from .sources import load_sources
+from .extractors import compile_extractors
+from .topics import MIN_RELEVANCE, tag_article, tag_articles
+from . import profiling
+from .checkpoint import Budget, Checkpoint
+from .dates import canonical_timestamp, format_timestamp, normalize_dates, parse_timestamp, utcnow
+
+# Les dépendances lourdes (requests, bs4, feedparser, traducteur) sont importées
+# là où elles servent : importer ce module ne coûte presque rien, et le logging
+# est configuré par les points d'entrée (setup_logging), pas à l'import.
 logger = logging.getLogger(__name__)
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
 
 # Configuration du filtre de date
 MAX_ARTICLE_AGE_HOURS = 168  # Ne garder que les articles des 7 derniers jours (7 * 24h)
+MAX_FEED_ENTRIES = 30  # Nombre maximum d'entrées lues par flux RSS
+
+def setup_logging(**kwargs):
+    """Configuration du logging pour les scripts (sans effet si elle est déjà faite)"""
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT, **kwargs)
 
 class IANewsScraper:
-    def __init__(self):
+    def __init__(self, sources_file=None):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         }
+        import requests
+
+        # Session HTTP partagée : connexions réutilisées entre les requêtes vers un même hôte
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
         self.data_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
         os.makedirs(self.data_dir, exist_ok=True)
         self.news_file = os.path.join(self.data_dir, 'ia_news.json')
 
-        # 🎯 SOURCES LLM & IA ACCESSIBLES - FOCUS SUR L'ACTUALITÉ RÉCENTE
-        self.sources = {
-            'rss_feeds': [
-                # 🤖 SOURCES PRINCIPALES LLM & IA
-                {'url': 'https://openai.com/blog/rss.xml', 'category': 'llms', 'type': 'openai', 'name': 'OpenAI Blog'},
-                {'url': 'https://www.anthropic.com/news/rss.xml', 'category': 'llms', 'type': 'anthropic', 'name': 'Anthropic News'},
-                {'url': 'https://blog.google/technology/ai/rss/', 'category': 'llms', 'type': 'google', 'name': 'Google AI Blog'},
-                {'url': 'https://huggingface.co/blog/feed.xml', 'category': 'llms', 'type': 'huggingface', 'name': 'Hugging Face Blog'},
-
-                # 📰 TECH NEWS - IA FOCUS
-                {'url': 'https://www.theverge.com/rss/ai-artificial-intelligence/index.xml', 'category': 'general', 'type': 'theverge', 'name': 'The Verge AI'},
-                {'url': 'https://techcrunch.com/category/artificial-intelligence/feed/', 'category': 'general', 'type': 'techcrunch', 'name': 'TechCrunch AI'},
-                {'url': 'https://venturebeat.com/category/ai/feed/', 'category': 'general', 'type': 'venturebeat', 'name': 'VentureBeat AI'},
-                {'url': 'https://www.technologyreview.com/topic/artificial-intelligence/feed', 'category': 'general', 'type': 'mittr', 'name': 'MIT Technology Review AI'},
-
-                # 🔬 TECH & SCIENCE
-                {'url': 'https://feeds.arstechnica.com/arstechnica/technology-lab', 'category': 'tech', 'type': 'arstechnica', 'name': 'Ars Technica'},
-                {'url': 'https://www.wired.com/feed/tag/ai/latest/rss', 'category': 'general', 'type': 'wired', 'name': 'Wired AI'},
-                {'url': 'https://www.artificialintelligence-news.com/feed/', 'category': 'general', 'type': 'ainews', 'name': 'AI News'},
-
-                # 🎮 NVIDIA & HARDWARE
-                {'url': 'https://blogs.nvidia.com/feed/', 'category': 'hardware', 'type': 'nvidia', 'name': 'NVIDIA Blog'},
-
-                # 🇫🇷 SOURCES FRANÇAISES IA
-                {'url': 'https://www.journaldunet.com/intelligence-artificielle/rss', 'category': 'general', 'type': 'jdn', 'name': 'Journal du Net - IA'},
-                {'url': 'https://www.siecledigital.fr/tag/intelligence-artificielle/feed/', 'category': 'general', 'type': 'siecledigital', 'name': 'Siècle Digital - IA'},
-                {'url': 'https://www.maddyness.com/feed/?tag=intelligence-artificielle', 'category': 'general', 'type': 'maddyness', 'name': 'Maddyness - IA'},
-
-                # 🎨 GÉNÉRATION D'IMAGES, VIDÉOS & MUSIQUE
-                {'url': 'https://petapixel.com/feed/', 'category': 'creative', 'type': 'petapixel', 'name': 'PetaPixel - AI'},
-                {'url': 'https://runwayml.com/blog/feed.xml', 'category': 'creative', 'type': 'runwayml', 'name': 'RunwayML Blog'},
-
-                # 💻 NO-CODE & AUTOMATION
-                {'url': 'https://webflow.com/blog/feed.xml', 'category': 'nocode', 'type': 'webflow', 'name': 'Webflow Blog'},
-                {'url': 'https://bubble.io/blog/feed.xml', 'category': 'nocode', 'type': 'bubble', 'name': 'Bubble Blog'},
-                {'url': 'https://zapier.com/blog/feed', 'category': 'nocode', 'type': 'zapier', 'name': 'Zapier Blog'},
-                {'url': 'https://www.make.com/en/blog/feed', 'category': 'nocode', 'type': 'make', 'name': 'Make.com Blog'},
-            ],
-
-            'sites': [
-                # Sites web à scraper (backup si RSS ne fonctionne pas)
-                {'url': 'https://openai.com/blog/', 'category': 'llms', 'type': 'openai', 'name': 'OpenAI Blog'},
-                {'url': 'https://www.anthropic.com/news', 'category': 'llms', 'type': 'anthropic', 'name': 'Anthropic News'},
-                {'url': 'https://blog.google/technology/ai/', 'category': 'llms', 'type': 'google', 'name': 'Google AI'},
-                {'url': 'https://huggingface.co/blog', 'category': 'llms', 'type': 'huggingface', 'name': 'Hugging Face'},
-                {'url': 'https://www.theverge.com/ai-artificial-intelligence', 'category': 'general', 'type': 'theverge', 'name': 'The Verge AI'},
-
-                # Sources françaises
-                {'url': 'https://www.journaldunet.com/intelligence-artificielle/', 'category': 'general', 'type': 'jdn', 'name': 'Journal du Net - IA'},
-                {'url': 'https://www.siecledigital.fr/intelligence-artificielle/', 'category': 'general', 'type': 'siecledigital', 'name': 'Siècle Digital'},
-
-                # Créatif & No-Code
-                {'url': 'https://petapixel.com/', 'category': 'creative', 'type': 'petapixel', 'name': 'PetaPixel'},
-                {'url': 'https://webflow.com/blog', 'category': 'nocode', 'type': 'webflow', 'name': 'Webflow Blog'},
-                {'url': 'https://zapier.com/blog', 'category': 'nocode', 'type': 'zapier', 'name': 'Zapier Blog'},
-            ]
-        }
+        # 🎯 SOURCES LLM & IA : déclarées dans sources.json, extracteurs compilés une seule fois
+        self.sources = load_sources(sources_file)
+        self.extractors = compile_extractors(self.sources)
+        self.min_relevance = self.sources.get('min_relevance', MIN_RELEVANCE)
 
-        # Charger les actualités existantes
+        # Charger les actualités existantes (et leurs slugs, attribués une fois pour toutes)
         self.news = self.load_news()
+        self.slugs = backfill_identities(self.news)
+        self.known_urls = {article['url'] for article in self.news if article.get('url')}
+        # URLs restaurées d'un checkpoint : leur source a pu s'arrêter avant de tout livrer
+        self.resumed_urls = set()
 
     def load_news(self):
         """Charger les actualités existantes depuis le fichier JSON"""
         if os.path.exists(self.news_file):
             try:
                 with open(self.news_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                    news = load_articles(json.load(f))
+                # Compléter 'published_at' pour les articles enregistrés avant son introduction
+                normalize_dates(news)
+                # Étiqueter les articles enregistrés avant l'introduction des thèmes
+                tag_articles(news)
+                return news
             except Exception as e:
                 logger.error(f"Erreur lors du chargement des actualités: {e}")
         return []
@@ -104,133 +76,174 @@ class IANewsScraper:
     def save_news(self):
         """Sauvegarder les actualités dans le fichier JSON"""
         try:
-            # Trier par date (plus récent en premier)
-            self.news.sort(key=lambda x: x.get('published_date', ''), reverse=True)
+            # Trier par date (plus récent en premier) - 'published_at' est en UTC canonique
+            self.news.sort(key=lambda x: x.get('published_at') or x.get('published_date', ''), reverse=True)
             # Garder seulement les 500 derniers articles
             self.news = self.news[:500]
             with open(self.news_file, 'w', encoding='utf-8') as f:
-                json.dump(self.news, f, ensure_ascii=False, indent=2)
+                json.dump(dump_articles(self.news), f, ensure_ascii=False, indent=2)
+            # Store indexé (slug / URL / id -> offset) pour les lectures unitaires
+            write_store(self.news, self.data_dir)
             logger.info(f"✅ News sauvegardées: {len(self.news)} articles")
+            return True
         except Exception as e:
             logger.error(f"Erreur lors de la sauvegarde: {e}")
+            return False
+
+    def restore(self, items):
+        """Réintégrer les articles d'un checkpoint (déjà filtrés et identifiés) ; retourne le nombre restauré"""
+        restored = 0
+        for item in items:
+            if not item.get('url') or item['url'] in self.known_urls:
+                continue
+            if item.get('slug'):
+                self.slugs.add(item['slug'])
+            self.news.append(Article.from_dict(item))
+            self.known_urls.add(item['url'])
+            self.resumed_urls.add(item['url'])
+            restored += 1
+        return restored
 
     def is_recent_article(self, published_date, max_hours=MAX_ARTICLE_AGE_HOURS):
         """Vérifier si un article a été publié dans les dernières max_hours heures"""
-        if not published_date:
-            logger.debug("❌ Article rejeté: pas de date disponible")
-            return False
-        
-        try:
-            # Parser la date de publication
-            if isinstance(published_date, str):
-                # Essayer différents formats
-                formats = [
-                    "%Y-%m-%d",
-                    "%Y-%m-%dT%H:%M:%S",
-                    "%Y-%m-%dT%H:%M:%S.%f",
-                    "%Y-%m-%dT%H:%M:%S%z",
-                    "%Y-%m-%d %H:%M:%S",
-                ]
-                
-                article_date = None
-                for fmt in formats:
-                    try:
-                        # Nettoyer la date pour enlever les timezone si présentes
-                        clean_date = published_date.split('+')[0].split('Z')[0].strip()
-                        article_date = datetime.strptime(clean_date, fmt)
-                        break
-                    except:
-                        continue
-                
-                if not article_date:
-                    logger.debug(f"❌ Article rejeté: format de date non reconnu ({published_date})")
-                    return False
-            else:
-                article_date = published_date
-            
-            # Calculer la différence avec maintenant
-            now = datetime.now()
-            time_diff = now - article_date
-            
-            # Vérifier si l'article est dans la fenêtre de temps
-            if time_diff.total_seconds() < 0:
-                # Article dans le futur (peut arriver avec des timezone)
-                logger.debug(f"⚠️  Article dans le futur ignoré: {published_date}")
-                return False
-            
-            hours_old = time_diff.total_seconds() / 3600
-            
-            if hours_old <= max_hours:
-                return True
-            else:
-                logger.debug(f"❌ Article trop vieux: {hours_old:.1f}h ({published_date})")
-                return False
-                
-        except Exception as e:
-            logger.debug(f"❌ Erreur validation date: {e}")
+        article_date = parse_timestamp(published_date)
+        if not article_date:
+            logger.debug(f"❌ Article rejeté: date absente ou non reconnue ({published_date})")
             return False
 
-    def add_news_item(self, item):
-        """Ajouter un nouvel article s'il n'existe pas déjà et s'il est récent"""
-        if not item.get('url'):
+        # Les deux dates sont en UTC : plus besoin de retirer les fuseaux horaires
+        time_diff = utcnow() - article_date
+
+        if time_diff.total_seconds() < 0:
+            # Article dans le futur (horloge de l'éditeur en avance)
+            logger.debug(f"⚠️  Article dans le futur ignoré: {published_date}")
             return False
 
-        # Vérifier si l'article existe déjà
-        if any(existing['url'] == item['url'] for existing in self.news):
+        hours_old = time_diff.total_seconds() / 3600
+
+        if hours_old <= max_hours:
+            return True
+        else:
+            logger.debug(f"❌ Article trop vieux: {hours_old:.1f}h ({published_date})")
             return False
 
-        # Enrichir l'item
-        item['collected_at'] = datetime.now().isoformat()
-        if 'published_date' not in item or not item['published_date']:
-            item['published_date'] = datetime.now().strftime("%Y-%m-%d")
-        
-        # Vérifier si l'article est récent (filtre 24h)
-        if not self.is_recent_article(item['published_date']):
+    def accept_item(self, item, source=None):
+        """
+        Filtrer un article (doublon, âge, pertinence) et lui attribuer son identité.
+        Retourne l'Article à enregistrer (son URL est réservée) ou None s'il est rejeté.
+        """
+        if not item.get('url'):
+            return None
+
+        # Vérifier si l'article existe déjà
+        if item['url'] in self.known_urls:
+            return None
+
+        # Enrichir l'item : un seul horodatage canonique UTC, calculé une fois
+        now = utcnow()
+        item['collected_at'] = format_timestamp(now)
+        if not item.get('published_at'):
+            item['published_at'] = canonical_timestamp(item.get('published_date'), default=now)
+        item['published_date'] = item['published_at'][:10]
+
+        # Vérifier si l'article est récent (filtre MAX_ARTICLE_AGE_HOURS)
+        if not self.is_recent_article(item['published_at']):
             logger.debug(f"⏰ Article ignoré (trop vieux): {item.get('title', 'N/A')[:60]}")
-            return False
+            return None
+
+        # Thèmes et pertinence en une passe ; les sources généralistes ne gardent que l'IA
+        tag_article(item)
+        if source and source.get('topic_filter') and item['relevance'] < self.min_relevance:
+            logger.debug(f"🚫 Article hors sujet ignoré: {item.get('title', 'N/A')[:60]}")
+            return None
+
+        # Slug et ID définitifs, persistés avec l'article
+        assign_identity(item, self.slugs, title=item.get('title'))
 
-        self.news.append(item)
+        self.known_urls.add(item['url'])
         logger.info(f"✅ {item.get('source', 'N/A')}: {item.get('title', 'N/A')[:60]}")
+        return Article.from_dict(item)
+
+    def add_news_item(self, item, source=None):
+        """Ajouter un nouvel article s'il n'existe pas déjà, s'il est récent et (source généraliste) s'il parle d'IA"""
+        article = self.accept_item(item, source)
+        if article is None:
+            return False
+        self.news.append(article)
         return True
 
+    def merge_items(self, items, source=None):
+        """Fusionner les articles produits par un scraping ; retourne le nombre d'articles ajoutés"""
+        return sum(1 for item in items if self.add_news_item(item, source))
+
     def parse_date(self, date_string):
-        """Parser une date depuis différents formats"""
-        if not date_string:
-            return datetime.now().strftime("%Y-%m-%d")
-        
+        """Parser une date (RFC 822, ISO 8601...) vers l'horodatage canonique UTC"""
+        return canonical_timestamp(date_string)
+
+    def entry_timestamp(self, entry):
+        """Horodatage canonique d'une entrée RSS, via la date déjà décodée par feedparser si possible"""
+        for key in ('published_parsed', 'updated_parsed'):
+            parsed = entry.get(key)
+            if parsed:
+                return format_timestamp(datetime.fromtimestamp(calendar.timegm(parsed), timezone.utc))
+        return self.parse_date(entry.get('published') or entry.get('updated'))
+
+    def iter_new_entries(self, feed):
+        """
+        Lire un flux en streaming et produire (entrée, horodatage) pour les entrées nouvelles.
+        La lecture s'arrête après MAX_FEED_ENTRIES entrées, à la première URL déjà connue
+        ou au premier article plus vieux que MAX_ARTICLE_AGE_HOURS (flux triés du plus récent au plus ancien).
+        """
+        response = None
+        if feed['url'].startswith(('http://', 'https://')):
+            response = self.session.get(feed['url'], timeout=15, stream=True)
+            if response.status_code != 200:
+                response.close()
+                logger.warning(f"⚠️  Status {response.status_code} pour {feed['name']}")
+                return
+            response.raw.decode_content = True
+            entries = iter_feed_entries(response.raw)
+        else:
+            # Fichier local : pas de streaming, lecture complète par feedparser
+            import feedparser
+            entries = iter(feedparser.parse(feed['url']).entries)
+
+        cutoff = format_timestamp(utcnow() - timedelta(hours=MAX_ARTICLE_AGE_HOURS))
+        count = 0
         try:
-            # Essayer différents formats
-            formats = [
-                "%a, %d %b %Y %H:%M:%S %z",
-                "%a, %d %b %Y %H:%M:%S %Z",
-                "%Y-%m-%dT%H:%M:%S%z",
-                "%Y-%m-%d %H:%M:%S",
-                "%Y-%m-%d",
-            ]
-            
-            for fmt in formats:
-                try:
-                    dt = datetime.strptime(date_string[:25], fmt)
-                    return dt.strftime("%Y-%m-%d")
-                except:
-                    continue
-            
-            # Si aucun format ne fonctionne, retourner la date actuelle
-            return datetime.now().strftime("%Y-%m-%d")
-        except:
-            return datetime.now().strftime("%Y-%m-%d")
+            for entry in entries:
+                count += 1
+                if count > MAX_FEED_ENTRIES:
+                    break
+                url = (entry.get('link') or '').strip()
+                if url in self.known_urls and url not in self.resumed_urls:
+                    logger.debug(f"⏹️  {feed['name']}: URL déjà connue, fin de lecture après {count} entrées")
+                    break
+                published_at = self.entry_timestamp(entry)
+                if published_at < cutoff:
+                    logger.debug(f"⏹️  {feed['name']}: entrée trop ancienne, fin de lecture après {count} entrées")
+                    break
+                yield entry, published_at
+        finally:
+            if hasattr(entries, 'close'):
+                entries.close()
+            if response is not None:
+                response.close()
+
+        if count == 0:
+            logger.warning(f"⚠️  Aucune entrée trouvée pour {feed['name']}")
 
     def scrape_rss_feed(self, feed):
-        """Scraper un flux RSS pour récupérer les actualités"""
-        logger.info(f"📡 RSS: {feed['name']}")
-        try:
-            news_feed = feedparser.parse(feed['url'])
+        """Scraper un flux RSS ; retourne les articles lus (fusionnés ensuite par merge_items)"""
+        return list(self.iter_rss_items(feed))
 
-            if not news_feed.entries:
-                logger.warning(f"⚠️  Aucune entrée trouvée pour {feed['name']}")
-                return
+    def iter_rss_items(self, feed):
+        """Produire les articles d'un flux RSS un à un, au fil de la lecture du flux"""
+        from bs4 import BeautifulSoup
 
-            for entry in news_feed.entries[:30]:  # Limiter à 30 articles par feed
+        logger.info(f"📡 RSS: {feed['name']}")
+        try:
+            for entry, published_at in self.iter_new_entries(feed):
                 try:
                     title = entry.get('title', '').strip()
                     url = entry.get('link', '').strip()
@@ -250,33 +263,23 @@ class IANewsScraper:
                     if not description:
                         description = title
 
-                    # Récupérer la date
-                    published_date = ''
-                    if 'published' in entry:
-                        published_date = self.parse_date(entry['published'])
-                    elif 'updated' in entry:
-                        published_date = self.parse_date(entry['updated'])
-                    else:
-                        published_date = datetime.now().strftime("%Y-%m-%d")
-
                     # Chercher une image
                     image_url = ''
                     
                     # Méthode 1: media_content
-                    if hasattr(entry, 'media_content') and entry.media_content:
-                        for media in entry.media_content:
-                            if 'url' in media:
-                                image_url = media['url']
-                                break
-                    
+                    for media in entry.get('media_content') or []:
+                        if 'url' in media:
+                            image_url = media['url']
+                            break
+
                     # Méthode 2: media_thumbnail
-                    if not image_url and hasattr(entry, 'media_thumbnail') and entry.media_thumbnail:
-                        image_url = entry.media_thumbnail[0].get('url', '')
-                    
+                    if not image_url and entry.get('media_thumbnail'):
+                        image_url = entry['media_thumbnail'][0].get('url', '')
+
                     # Méthode 3: chercher dans le contenu
                     if not image_url and 'content' in entry:
-                        for content in entry.content:
-                            soup = BeautifulSoup(content.value, 'html.parser')
+                        for content in entry['content']:
+                            soup = BeautifulSoup(content.get('value', ''), 'html.parser')
                             img = soup.find('img')
                             if img and img.get('src'):
                                 image_url = img['src']
@@ -294,121 +297,153 @@ class IANewsScraper:
                         'url': url,
                         'description': description,
                         'image_url': image_url,
-                        'published_date': published_date,
+                        'published_at': published_at,
+                        'published_date': published_at[:10],
                         'source': feed.get('name', 'RSS'),
                         'source_type': 'rss',
                         'category': feed.get('category', 'general')
                     }
 
-                    self.add_news_item(news_item)
-
                 except Exception as e:
                     logger.debug(f"Erreur parsing entrée RSS: {e}")
                     continue
+                yield news_item
 
         except Exception as e:
             logger.error(f"❌ Erreur RSS {feed['name']}: {str(e)[:100]}")
 
+    def scrape_sitemap(self, site, max_articles=15):
+        """
+        Découvrir les nouveaux articles d'un site via son sitemap (news de préférence),
+        puis lire uniquement le <head> de chaque nouvelle page (OpenGraph / JSON-LD).
+        Retourne les articles lus, ou None si aucun sitemap exploitable n'a été trouvé.
+        """
+        candidates = self.sitemap_candidates(site, max_articles)
+        return None if candidates is None else list(self.iter_sitemap_items(site, candidates))
+
+    def sitemap_candidates(self, site, max_articles=15):
+        """Nouvelles URLs du sitemap d'un site, les plus récentes d'abord ; None sans sitemap exploitable"""
+        since = format_timestamp(utcnow() - timedelta(hours=MAX_ARTICLE_AGE_HOURS))
+        # Hors sitemap « news », ne garder que les URLs sous le chemin de la source
+        prefix = site.get('sitemap_prefix', urlparse(site['url']).path.rstrip('/'))
+
+        candidates = []
+        for sitemap_url in candidate_sitemaps(self.session, site):
+            for entry in iter_sitemap(self.session, sitemap_url, since):
+                if entry['url'] in self.known_urls:
+                    continue
+                if entry['news'] or urlparse(entry['url']).path.startswith(prefix):
+                    candidates.append(entry)
+            if candidates:
+                logger.info(f"   🗺️  Sitemap: {sitemap_url} ({len(candidates)} nouvelles URLs)")
+                break
+        if not candidates:
+            return None
+        candidates.sort(key=lambda entry: entry['lastmod'], reverse=True)
+        return candidates[:max_articles]
+
+    def iter_sitemap_items(self, site, candidates):
+        """Produire un article par URL du sitemap, dès que son <head> est lu"""
+        for entry in candidates:
+            try:
+                meta = fetch_head_metadata(self.session, entry['url'])
+                if not meta:
+                    continue
+                title = meta['title'] or entry.get('title', '')
+                if len(title) < 10:
+                    continue
+                published_at = self.parse_date(meta.get('published') or entry['lastmod'])
+                news_item = {
+                    'title': title[:200],
+                    'url': entry['url'],
+                    'description': (meta.get('description') or title)[:400],
+                    'image_url': meta.get('image_url') or '',
+                    'published_at': published_at,
+                    'published_date': published_at[:10],
+                    'source': site.get('name', 'Web'),
+                    'source_type': 'website',
+                    'category': site.get('category', 'general')
+                }
+            except Exception as e:
+                logger.debug(f"Erreur lecture {entry['url']}: {e}")
+                continue
+            yield news_item
+
     def scrape_website(self, site):
-        """Scraper un site web pour récupérer les actualités"""
+        """Scraper un site web ; retourne les articles lus (fusionnés ensuite par merge_items)"""
+        return list(self.iter_website_items(site))
+
+    def iter_website_items(self, site):
+        """Produire les articles d'un site web un à un (sitemap : dès que chaque page est lue)"""
         logger.info(f"🌐 Web: {site['name']}")
         try:
-            response = requests.get(site['url'], headers=self.headers, timeout=15)
+            # Découverte par sitemap d'abord : petites lectures ciblées et dates exactes
+            candidates = self.sitemap_candidates(site)
+        except Exception as e:
+            logger.debug(f"Sitemap indisponible pour {site['name']}: {e}")
+            candidates = None
+        if candidates is not None:
+            yield from self.iter_sitemap_items(site, candidates)
+            return
+
+        # Repli : analyse heuristique de la page d'accueil
+        try:
+            response = self.session.get(site['url'], timeout=15)
             if response.status_code != 200:
                 logger.warning(f"⚠️  Status {response.status_code} pour {site['name']}")
                 return
 
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # Stratégies de scraping selon le type de site
-            articles = []
-            
-            # Chercher les articles avec différentes stratégies
-            selectors = [
-                'article',
-                '[class*="post"]',
-                '[class*="article"]',
-                '[class*="entry"]',
-                '[class*="story"]',
-                '[class*="card"]',
-            ]
-            
-            for selector in selectors:
-                found = soup.select(selector)
-                if found:
-                    articles.extend(found[:20])
-                    break
-
-            if not articles:
+            # Extracteur déclaré pour la source, sinon l'extracteur générique
+            extractor = self.extractors.get(site['type'], self.extractors['default'])
+            charset = 'charset=' in response.headers.get('Content-Type', '').lower()
+            items = extractor.extract(response.content, site['url'], limit=15,
+                                      encoding=response.encoding if charset else None)
+            if not items:
                 logger.warning(f"⚠️  Aucun article trouvé pour {site['name']}")
                 return
 
-            for article in articles[:15]:  # Limiter à 15 articles par site
-                try:
-                    # Chercher le titre
-                    title_tag = article.find(['h1', 'h2', 'h3', 'h4'])
-                    if not title_tag:
-                        title_tag = article.find('a')
-                    
-                    if not title_tag:
-                        continue
-
-                    title = title_tag.get_text(strip=True)
-                    if len(title) < 10:
-                        continue
-
-                    # Chercher l'URL
-                    url_tag = article.find('a', href=True)
-                    if not url_tag:
-                        continue
-
-                    url = url_tag['href']
-                    if not url.startswith('http'):
-                        url = urljoin(site['url'], url)
-
-                    # Chercher la description
-                    desc_tag = article.find(['p', 'div'], class_=re.compile(r'excerpt|summary|description|subtitle|deck', re.I))
-                    description = desc_tag.get_text(strip=True)[:400] if desc_tag else title
-
-                    # Chercher une image
-                    img_tag = article.find('img')
-                    image_url = ''
-                    if img_tag:
-                        image_url = img_tag.get('src', img_tag.get('data-src', ''))
-                        if image_url and not image_url.startswith('http'):
-                            image_url = urljoin(site['url'], image_url)
-
-                    # Chercher la date
-                    date_tag = article.find(['time', 'span'], class_=re.compile(r'date|time|published', re.I))
-                    published_date = datetime.now().strftime("%Y-%m-%d")
-                    if date_tag:
-                        date_str = date_tag.get('datetime', date_tag.get_text(strip=True))
-                        published_date = self.parse_date(date_str)
-
-                    news_item = {
-                        'title': title[:200],
-                        'url': url,
-                        'description': description,
-                        'image_url': image_url,
-                        'published_date': published_date,
-                        'source': site.get('name', 'Web'),
-                        'source_type': 'website',
-                        'category': site.get('category', 'general')
-                    }
-
-                    self.add_news_item(news_item)
-
-                except Exception as e:
-                    logger.debug(f"Erreur parsing article: {e}")
-                    continue
+            for item in items:
+                published_at = self.parse_date(item['date'])
+                news_item = {
+                    'title': item['title'][:200],
+                    'url': item['url'],
+                    'description': item['description'][:400],
+                    'image_url': item['image_url'],
+                    'published_at': published_at,
+                    'published_date': published_at[:10],
+                    'source': site.get('name', 'Web'),
+                    'source_type': 'website',
+                    'category': site.get('category', 'general')
+                }
+                yield news_item
 
             time.sleep(random.uniform(1, 2))
 
         except Exception as e:
             logger.error(f"❌ Erreur {site['name']}: {str(e)[:100]}")
 
-    def run(self):
-        """Exécuter le scraper complet"""
+    def scrape_source(self, kind, source):
+        """Scraper une source de la file de travail ('rss' ou 'site') sans rien fusionner"""
+        return list(self.iter_source(kind, source))
+
+    def iter_source(self, kind, source):
+        """Produire les articles d'une source ('rss' ou 'site') au fil de sa lecture (pipeline en flux)"""
+        if kind == 'rss':
+            return self.iter_rss_items(source)
+        return self.iter_website_items(source)
+
+    def run(self, translator=None, workers=0, budget=None, checkpoint=None, fulltext=False):
+        """
+        Exécuter le scraper complet (translator : traducteur déjà chargé, en mode démon).
+        Par défaut, les sources passent par le pipeline en flux (scraper/pipeline.py) : chaque
+        article est filtré, traduit et enregistré dès qu'il est lu, sans attendre les autres sources.
+        Avec workers > 0, les sources passent par la file de travail (scraper/workqueue.py) :
+        des processus workers les scrapent et ce processus fusionne seul leurs résultats.
+        budget : durée maximale du run en secondes ; les sources non traitées à l'échéance
+        restent dans le checkpoint (scraper/checkpoint.py) et passent au run suivant.
+        fulltext : télécharger ensuite le corps des nouveaux articles (scraper/fulltext.py),
+        stocké à part dans data/fulltext.sqlite.
+        """
         logger.info("\n" + "="*70)
         logger.info("🚀 SCRAPER IA NEWS - FOCUS LLM & ACTUALITÉS RÉCENTES")
         logger.info(f"⏰ Filtre: Articles des dernières {MAX_ARTICLE_AGE_HOURS}h uniquement")
@@ -416,31 +451,76 @@ class IANewsScraper:
 
         start_time = time.time()
         initial_count = len(self.news)
+        initial_urls = set(self.known_urls)
         rejected_count = 0
 
-        # PHASE 1: Scraper les flux RSS (prioritaire pour avoir des dates précises)
-        logger.info("\n📡 PHASE 1: Flux RSS (sources principales)")
-        for feed in self.sources['rss_feeds']:
-            self.scrape_rss_feed(feed)
-            time.sleep(random.uniform(0.5, 1.5))
+        profiler = profiling.active()  # Sans --profile : ne fait rien
+        budget = budget if isinstance(budget, Budget) else Budget(budget)
+        checkpoint = checkpoint or Checkpoint()
 
-        # PHASE 2: Scraper les sites web (backup)
-        logger.info("\n🌐 PHASE 2: Sites Web (backup)")
-        for site in self.sources['sites']:
-            self.scrape_website(site)
-            time.sleep(random.uniform(1, 2))
+        # Reprise d'un run interrompu : articles déjà collectés et sources déjà traitées
+        if checkpoint.load():
+            restored = self.restore(checkpoint.articles)
+            logger.info(f"♻️  Reprise du run du {checkpoint.started_at}: "
+                        f"{len(checkpoint.done)} sources déjà traitées, {restored} articles restaurés")
 
-        # PHASE 3: Traduire les articles en français
-        logger.info("\n🌍 PHASE 3: Traduction en français")
         try:
-            self.news = translate_articles(self.news)
-            logger.info("✅ Traduction terminée")
+            from .translator import ArticleTranslator
+            translator = translator or ArticleTranslator()
         except Exception as e:
-            logger.error(f"⚠️  Erreur traduction: {str(e)[:100]}")
-            logger.info("ℹ️  Continuant sans traduction...")
+            logger.error(f"⚠️  Traducteur indisponible: {str(e)[:100]}")
+            translator = None
+
+        if workers:
+            # Sources réparties : file SQLite, workers en parallèle, fusion ici
+            from .workqueue import coordinate
+
+            logger.info(f"\n📬 Sources réparties sur {workers} workers")
+            profiler.step('queue')
+            complete = coordinate(self, workers, budget=budget, checkpoint=checkpoint)
+        else:
+            # Flux RSS puis sites web, en flux : lecture → filtre → traduction → enregistrement
+            from .pipeline import StreamingPipeline
+
+            logger.info("\n🚰 Pipeline: flux RSS et sites web")
+            profiler.step('pipeline')
+            complete = StreamingPipeline(self, translator, checkpoint, budget).run()
+        if not complete:
+            logger.warning("⏱️  Budget de temps épuisé : sources restantes reportées au prochain run")
+
+        # Traduction des articles qui n'en ont pas encore (file de travail, run précédent interrompu)
+        pending = sorted((a for a in self.news if 'title_fr' not in a),
+                         key=lambda a: a.get('published_at') or '', reverse=True)
+        if pending and translator is not None:
+            logger.info(f"\n🌍 Traduction de {len(pending)} articles")
+            profiler.step('translation')
+            try:
+                from .translator import translate_articles
+                translate_articles(pending, translator, budget=budget)
+            except Exception as e:
+                logger.error(f"⚠️  Erreur traduction: {str(e)[:100]}")
+                logger.info("ℹ️  Continuant sans traduction...")
+        elif translator is not None:
+            translator.finalize()
 
         # Sauvegarder les actualités
-        self.save_news()
+        profiler.step('save')
+        if self.save_news():
+            if complete:
+                checkpoint.clear()
+            else:
+                # Articles sauvegardés : le checkpoint ne garde que les sources déjà traitées
+                checkpoint.articles = []
+                checkpoint.save()
+
+        # Texte intégral (optionnel) : seulement les articles ajoutés par ce run, après la sauvegarde
+        if fulltext:
+            profiler.step('fulltext')
+            try:
+                from .fulltext import fetch_bodies
+                fetch_bodies([a['url'] for a in self.news if a.get('url') not in initial_urls], budget=budget)
+            except Exception as e:
+                logger.error(f"⚠️  Erreur texte intégral: {str(e)[:100]}")
 
         elapsed_time = time.time() - start_time
         new_articles = len(self.news) - initial_count
@@ -457,5 +537,6 @@ class IANewsScraper:
 
 # Fonction principale pour exécuter le scraper
 if __name__ == "__main__":
+    setup_logging()
     scraper = IANewsScraper()
     scraper.run()
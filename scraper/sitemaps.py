@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Sitemap-driven discovery for the ``sites`` sources.
+
+Instead of downloading a homepage and guessing articles from its DOM, the
+scraper reads the site's (news) sitemap as a stream, keeps only URLs whose
+``<lastmod>`` / ``<news:publication_date>`` is recent and that are not known
+yet, then fetches just the ``<head>`` of each new page to read its
+OpenGraph and JSON-LD metadata (title, description, image, exact date).
+"""
+
+import json
+import logging
+import re
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import urljoin, urlparse
+
+from lxml import etree, html
+
+from .dates import format_timestamp, parse_timestamp
+
+logger = logging.getLogger(__name__)
+
+SITEMAP_CANDIDATES = ('/news-sitemap.xml', '/sitemap_news.xml', '/sitemap-news.xml', '/sitemap.xml')
+MAX_CHILD_SITEMAPS = 5          # Sous-sitemaps suivis par index
+MAX_HEAD_BYTES = 256 * 1024     # On n'attend pas plus loin la fin du <head>
+_HEAD_END = re.compile(rb'</head\s*>', re.I)
+
+
+def _localname(tag) -> str:
+    return tag.rsplit('}', 1)[-1] if isinstance(tag, str) else ''
+
+
+def _stream(session, url: str, timeout: int = 15):
+    response = session.get(url, timeout=timeout, stream=True)
+    if response.status_code != 200:
+        response.close()
+        return None
+    response.raw.decode_content = True
+    return response
+
+
+def robots_sitemaps(session, site_url: str) -> List[str]:
+    """Sitemaps declared in robots.txt"""
+    parsed = urlparse(site_url)
+    response = _stream(session, f"{parsed.scheme}://{parsed.netloc}/robots.txt", timeout=10)
+    if response is None:
+        return []
+    try:
+        text = response.raw.read(64 * 1024).decode('utf-8', 'replace')
+    finally:
+        response.close()
+    return [line.split(':', 1)[1].strip() for line in text.splitlines() if line.lower().startswith('sitemap:')]
+
+
+def candidate_sitemaps(session, site: Dict) -> List[str]:
+    """Sitemaps to try for a site, most specific first"""
+    if site.get('sitemap'):
+        return [site['sitemap']]
+    parsed = urlparse(site['url'])
+    root = f"{parsed.scheme}://{parsed.netloc}"
+    declared = robots_sitemaps(session, site['url'])
+    # Les sitemaps « news » d'abord : courts et datés précisément
+    declared.sort(key=lambda url: 'news' not in url.lower())
+    candidates = declared + [root + path for path in SITEMAP_CANDIDATES]
+    return list(dict.fromkeys(candidates))
+
+
+def iter_sitemap(session, sitemap_url: str, since: str, depth: int = 0) -> Iterator[Dict]:
+    """
+    Stream ``{'url', 'lastmod', 'title', 'news'}`` entries of a sitemap (or
+    sitemap index) modified after ``since`` (canonical timestamp).
+    """
+    response = _stream(session, sitemap_url)
+    if response is None:
+        return
+    children = []
+    try:
+        for _, elem in etree.iterparse(response.raw, events=('end',), resolve_entities=False, no_network=True):
+            name = _localname(elem.tag)
+            if name not in ('url', 'sitemap'):
+                continue
+            entry = {'news': False}
+            for child in elem.iter():
+                child_name = _localname(child.tag)
+                text = (child.text or '').strip()
+                if child_name == 'loc' and 'url' not in entry:
+                    entry['url'] = text
+                elif child_name in ('lastmod', 'publication_date') and text:
+                    # La date de publication « news » prime sur lastmod
+                    if child_name == 'publication_date' or 'lastmod' not in entry:
+                        entry['lastmod'] = text
+                elif child_name == 'title' and text:
+                    entry['title'] = text
+                elif child_name == 'news':
+                    entry['news'] = True
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+
+            lastmod = parse_timestamp(entry.get('lastmod'))
+            entry['lastmod'] = format_timestamp(lastmod) if lastmod else None
+            if not entry.get('url'):
+                continue
+            if name == 'sitemap':
+                if entry['lastmod'] is None or entry['lastmod'] >= since:
+                    children.append(entry)
+            elif entry['lastmod'] and entry['lastmod'] >= since:
+                yield entry
+    except etree.XMLSyntaxError as e:
+        logger.debug(f"Sitemap illisible {sitemap_url}: {e}")
+    finally:
+        response.close()
+
+    if depth < 2:
+        # Sous-sitemaps les plus récents d'abord
+        children.sort(key=lambda c: c['lastmod'] or '', reverse=True)
+        for child in children[:MAX_CHILD_SITEMAPS]:
+            yield from iter_sitemap(session, child['url'], since, depth + 1)
+
+
+def _jsonld_objects(data) -> Iterator[Dict]:
+    if isinstance(data, list):
+        for item in data:
+            yield from _jsonld_objects(item)
+    elif isinstance(data, dict):
+        yield data
+        if '@graph' in data:
+            yield from _jsonld_objects(data['@graph'])
+
+
+def _jsonld_image(value) -> Optional[str]:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list) and value:
+        return _jsonld_image(value[0])
+    if isinstance(value, dict):
+        return value.get('url') or value.get('contentUrl')
+    return None
+
+
+def fetch_head_metadata(session, url: str) -> Optional[Dict]:
+    """
+    Download a page only up to ``</head>`` and read its metadata.
+    Returns ``{'title', 'description', 'image_url', 'published'}`` or None.
+    """
+    response = _stream(session, url)
+    if response is None:
+        return None
+    chunks = []
+    size = 0
+    try:
+        for chunk in response.iter_content(chunk_size=16 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if _HEAD_END.search(b''.join(chunks[-2:])) or size >= MAX_HEAD_BYTES:
+                break
+    finally:
+        response.close()
+
+    head_bytes = b''.join(chunks)
+    match = _HEAD_END.search(head_bytes)
+    if match:
+        head_bytes = head_bytes[:match.end()]
+    if not head_bytes.strip():
+        return None
+    document = html.fromstring(head_bytes + b'<body></body></html>')
+
+    meta = {}
+    for tag in document.iter('meta'):
+        key = (tag.get('property') or tag.get('name') or '').lower()
+        if key and tag.get('content') and key not in meta:
+            meta[key] = tag.get('content').strip()
+
+    info = {
+        'title': meta.get('og:title') or meta.get('twitter:title'),
+        'description': meta.get('og:description') or meta.get('description') or meta.get('twitter:description'),
+        'image_url': meta.get('og:image') or meta.get('twitter:image'),
+        'published': meta.get('article:published_time') or meta.get('date') or meta.get('pubdate'),
+    }
+
+    for script in document.iter('script'):
+        if (script.get('type') or '').lower() != 'application/ld+json' or not script.text:
+            continue
+        try:
+            data = json.loads(script.text)
+        except ValueError:
+            continue
+        for obj in _jsonld_objects(data):
+            kind = obj.get('@type')
+            kinds = kind if isinstance(kind, list) else [kind]
+            if not any(k in ('NewsArticle', 'Article', 'BlogPosting', 'TechArticle', 'ReportageNewsArticle') for k in kinds):
+                continue
+            info['title'] = info['title'] or obj.get('headline')
+            info['description'] = info['description'] or obj.get('description')
+            info['image_url'] = info['image_url'] or _jsonld_image(obj.get('image'))
+            # La date JSON-LD est la plus fiable : elle prime sur les balises meta
+            info['published'] = obj.get('datePublished') or info['published']
+            break
+
+    if not info['title']:
+        title = document.find('.//title')
+        info['title'] = title.text_content().strip() if title is not None else None
+    if info['image_url']:
+        info['image_url'] = urljoin(url, info['image_url'])
+    return info if info['title'] else None
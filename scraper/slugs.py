@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Stable article identity: slug and ID are assigned once, when an article is
+ingested, and then persisted with it. Builds never recompute them, so URLs
+survive articles moving between the home page and the archives.
+"""
+
+import hashlib
+import re
+from typing import Dict, Iterable, Optional, Set
+
+
+def base_slug(text: str) -> str:
+    """Slug tiré d'un titre (même règle que les pages déjà publiées)"""
+    slug = re.sub(r'[^a-z0-9]+', '-', (text or '').lower())[:80].strip('-')
+    return slug or 'article'
+
+
+def article_id(url: str) -> str:
+    """Identifiant stable dérivé de l'URL d'origine"""
+    return hashlib.blake2b(url.encode('utf-8'), digest_size=6).hexdigest()
+
+
+class SlugRegistry:
+    """
+    Set of taken slugs with O(1) collision suffixes.
+
+    Instead of counting up from ``-1`` on every collision, the registry
+    remembers the next free suffix for each base slug.
+    """
+
+    def __init__(self, slugs: Iterable[str] = ()):
+        self.taken: Set[str] = set()
+        self.next_suffix: Dict[str, int] = {}
+        for slug in slugs:
+            self.add(slug)
+
+    def add(self, slug: str):
+        self.taken.add(slug)
+
+    def assign(self, text: str) -> str:
+        base = base_slug(text)
+        slug = base
+        if slug in self.taken:
+            counter = self.next_suffix.get(base, 1)
+            slug = f"{base}-{counter}"
+            # Ne boucle que si un slug suffixé a été pris explicitement
+            while slug in self.taken:
+                counter += 1
+                slug = f"{base}-{counter}"
+            self.next_suffix[base] = counter + 1
+        self.taken.add(slug)
+        return slug
+
+
+def assign_identity(article, registry: SlugRegistry, title: Optional[str] = None) -> bool:
+    """Give ``article`` an ID and a slug if it has none yet. Returns True if changed."""
+    changed = False
+    if not article.get('id') and article.get('url'):
+        article['id'] = article_id(article['url'])
+        changed = True
+    if not article.get('slug'):
+        title = title or article.get('title_fr') or article.get('title') or f"sans-titre-{article.get('id', '')}"
+        article['slug'] = registry.assign(title)
+        changed = True
+    return changed
+
+
+def backfill_identities(articles: Iterable, registry: Optional[SlugRegistry] = None) -> SlugRegistry:
+    """
+    Assign slugs and IDs to articles saved before they were persisted.
+    Existing slugs are registered first so they are never reused.
+    """
+    articles = list(articles)
+    if registry is None:
+        registry = SlugRegistry()
+    for article in articles:
+        if article.get('slug'):
+            registry.add(article['slug'])
+    for article in articles:
+        assign_identity(article, registry)
+    return registry
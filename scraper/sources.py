@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Source registry: RSS feeds and websites are declared in ``sources.json``
+(or the file named by ``IA_NEWS_SOURCES``) instead of being hard-coded in
+the scraper.
+"""
+
+import json
+import os
+from typing import Dict, Optional
+
+SOURCES_FILE = os.path.join(os.path.dirname(__file__), 'sources.json')
+
+
+def load_sources(path: Optional[str] = None) -> Dict:
+    """Load the source registry; keys starting with '_' are comments"""
+    path = path or os.environ.get('IA_NEWS_SOURCES') or SOURCES_FILE
+    with open(path, 'r', encoding='utf-8') as f:
+        sources = json.load(f)
+    sources = {key: value for key, value in sources.items() if not key.startswith('_')}
+    sources.setdefault('rss_feeds', [])
+    sources.setdefault('sites', [])
+    return sources
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Offset-indexed article store.
+
+Alongside ``ia_news.json`` the pipeline writes two files:
+
+- ``articles.jsonl``: one compact JSON record per line
+- ``articles.idx``: an open-addressing hash table mapping ``slug:<slug>``,
+  ``url:<url>`` and ``id:<id>`` keys to the byte offset and length of the
+  record in ``articles.jsonl``
+
+Both files are opened with ``mmap``, so fetching a single article reads and
+decodes one line instead of the whole JSON array, and memory per lookup
+stays flat regardless of the archive size.
+
+An ``ArticleStore`` can be shared by threads (Flask requests): when the
+files are rewritten, the new maps are built under a lock and swapped in as
+one tuple; a lookup works on the tuple it started with, and the old maps are
+released once no lookup uses them any more.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+from .article import Article
+
+STORE_FILE = 'articles.jsonl'
+INDEX_FILE = 'articles.idx'
+
+_MAGIC = b'IANX'
+_VERSION = 1
+_HEADER = struct.Struct('<4sHHI')   # magic, version, réservé, nombre de cases
+_SLOT = struct.Struct('<QQI')       # hash de clé, offset, longueur
+_EMPTY = 0
+
+
+def _key_hash(key: str) -> int:
+    value = int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little')
+    return value or 1  # 0 est réservé aux cases vides
+
+
+def _record_keys(record: Dict):
+    if record.get('slug'):
+        yield f"slug:{record['slug']}"
+    if record.get('url'):
+        yield f"url:{record['url']}"
+    if record.get('id') is not None:
+        yield f"id:{record['id']}"
+
+
+def _atomic_write(path: str, data: bytes):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def write_store(articles: Iterable, data_dir: str):
+    """Write ``articles.jsonl`` and its hash index into ``data_dir``"""
+    os.makedirs(data_dir, exist_ok=True)
+
+    lines = []
+    entries = []
+    offset = 0
+    for article in articles:
+        record = article.to_dict() if isinstance(article, Article) else dict(article)
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+        for key in _record_keys(record):
+            entries.append((_key_hash(key), offset, len(line) - 1))
+        lines.append(line)
+        offset += len(line)
+
+    # Taux de remplissage <= 50% : les sondages linéaires restent très courts
+    slot_count = 8
+    while slot_count < len(entries) * 2:
+        slot_count *= 2
+    mask = slot_count - 1
+
+    table = bytearray(_HEADER.size + slot_count * _SLOT.size)
+    _HEADER.pack_into(table, 0, _MAGIC, _VERSION, 0, slot_count)
+    for key_hash, record_offset, length in entries:
+        slot = key_hash & mask
+        while True:
+            position = _HEADER.size + slot * _SLOT.size
+            existing_hash = _SLOT.unpack_from(table, position)[0]
+            if existing_hash in (_EMPTY, key_hash):
+                # Clé en double (ex: slug répété) : le premier article gagne
+                if existing_hash == _EMPTY:
+                    _SLOT.pack_into(table, position, key_hash, record_offset, length)
+                break
+            slot = (slot + 1) & mask
+
+    # Les données d'abord, l'index ensuite : un lecteur ne voit jamais d'offsets orphelins
+    _atomic_write(os.path.join(data_dir, STORE_FILE), b''.join(lines))
+    _atomic_write(os.path.join(data_dir, INDEX_FILE), bytes(table))
+
+
+class ArticleStore:
+    """Read-only, mmap-backed access to the article store"""
+
+    def __init__(self, data_dir: str):
+        self.data_dir = data_dir
+        self.store_path = os.path.join(data_dir, STORE_FILE)
+        self.index_path = os.path.join(data_dir, INDEX_FILE)
+        self.lock = threading.Lock()  # Remappage (et reconstruction par l'appelant) une seule fois
+        self._maps = None  # (signature, index, données, nombre de cases), remplacé d'un bloc
+
+    def exists(self) -> bool:
+        return os.path.exists(self.store_path) and os.path.exists(self.index_path)
+
+    def _current_signature(self):
+        stat = os.stat(self.index_path)
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _open(self, signature) -> Tuple:
+        with open(self.index_path, 'rb') as f:
+            index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, slot_count = _HEADER.unpack_from(index, 0)
+        if magic != _MAGIC or version != _VERSION:
+            index.close()
+            raise ValueError(f"Index invalide: {self.index_path}")
+        with open(self.store_path, 'rb') as f:
+            # mmap refuse les fichiers vides
+            store = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else b''
+        return signature, index, store, slot_count
+
+    def _current_maps(self) -> Optional[Tuple]:
+        """Maps of the current files, remapped if they were rewritten since the last lookup"""
+        if not self.exists():
+            self._maps = None
+            return None
+        maps = self._maps
+        signature = self._current_signature()
+        if maps is not None and maps[0] == signature:
+            return maps
+        with self.lock:
+            # Un autre thread a pu remapper pendant l'attente du verrou
+            if self._maps is None or self._maps[0] != signature:
+                self._maps = self._open(signature)
+            return self._maps
+
+    def close(self):
+        """Drop the maps; they are unmapped once the lookups still using them return"""
+        self._maps = None
+
+    def _lookup(self, key: str, field: str, value) -> Optional[Article]:
+        maps = self._current_maps()
+        if maps is None or not maps[3]:
+            return None
+        _, index, store, slot_count = maps
+        key_hash = _key_hash(key)
+        mask = slot_count - 1
+        slot = key_hash & mask
+        for _ in range(slot_count):
+            slot_hash, offset, length = _SLOT.unpack_from(index, _HEADER.size + slot * _SLOT.size)
+            if slot_hash == _EMPTY:
+                return None
+            if slot_hash == key_hash:
+                record = json.loads(store[offset:offset + length])
+                # Vérification contre les collisions de hash (64 bits, très improbables)
+                if str(record.get(field)) == str(value):
+                    return Article.from_dict(record)
+            slot = (slot + 1) & mask
+        return None
+
+    def get_by_slug(self, slug: str) -> Optional[Article]:
+        return self._lookup(f"slug:{slug}", 'slug', slug)
+
+    def get_by_url(self, url: str) -> Optional[Article]:
+        return self._lookup(f"url:{url}", 'url', url)
+
+    def get_by_id(self, article_id) -> Optional[Article]:
+        return self._lookup(f"id:{article_id}", 'id', article_id)
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Topic tagging and AI relevance scoring.
+
+All FR/EN keywords are compiled once into an Aho-Corasick automaton (a full
+transition table), so each article is tagged in a single linear pass over
+its title and description, whatever the number of keywords. Text and
+keywords are normalized the same way (lowercase, no accents, punctuation as
+spaces) and padded with spaces, which makes every match a whole-word match.
+
+The relevance score adds the weight of each distinct keyword found, doubled
+when it appears in the title; broad sources keep only articles reaching
+``MIN_RELEVANCE``.
+"""
+
+import re
+import unicodedata
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+MIN_RELEVANCE = 3
+
+# Thème -> (poids de chaque mot-clé, mots-clés FR/EN). Le thème 'ai' compte
+# pour la pertinence mais n'est pas une étiquette.
+TOPICS = {
+    'ai': (2, [
+        'ai', 'a i', 'artificial intelligence', 'intelligence artificielle', 'ia', 'genai', 'generative ai',
+        'ia generative', 'machine learning', 'apprentissage automatique', 'deep learning', 'apprentissage profond',
+        'neural network', 'neural networks', 'reseau de neurones', 'reseaux de neurones', 'ai powered', 'ai model',
+        'ai models', 'modele d ia', 'modeles d ia', 'openai', 'anthropic', 'deepmind', 'hugging face', 'mistral ai',
+    ]),
+    'llm': (3, [
+        'llm', 'llms', 'large language model', 'large language models', 'language model', 'language models',
+        'grand modele de langage', 'grands modeles de langage', 'modele de langage', 'modeles de langage',
+        'chatgpt', 'gpt', 'gpt 4', 'gpt 4o', 'gpt 5', 'claude', 'gemini', 'llama', 'mistral', 'mixtral', 'copilot',
+        'chatbot', 'chatbots', 'agent conversationnel', 'prompt', 'prompts', 'fine tuning', 'rag', 'tokens',
+    ]),
+    'agents': (3, [
+        'ai agent', 'ai agents', 'agentic', 'agent ia', 'agents ia', 'autonomous agent', 'autonomous agents',
+        'agents autonomes', 'computer use', 'tool use', 'mcp', 'model context protocol',
+    ]),
+    'image': (3, [
+        'text to image', 'image generation', 'image generator', 'generation d images', 'generateur d images',
+        'midjourney', 'dall e', 'stable diffusion', 'diffusion model', 'imagen', 'firefly',
+        'generative fill', 'remplissage generatif', 'ai image', 'ai images', 'image ia', 'images ia', 'deepfake',
+        'deepfakes',
+    ]),
+    'video': (3, [
+        'text to video', 'video generation', 'generation de video', 'generation video', 'sora', 'veo', 'runway',
+        'gen 3', 'kling', 'pika', 'ai video', 'video ia',
+    ]),
+    'audio': (3, [
+        'text to speech', 'speech recognition', 'reconnaissance vocale', 'synthese vocale', 'voice cloning',
+        'clonage de voix', 'ai music', 'musique ia', 'suno', 'udio', 'elevenlabs', 'whisper',
+    ]),
+    'research': (3, [
+        'benchmark', 'benchmarks', 'arxiv', 'transformer', 'transformers', 'reinforcement learning',
+        'apprentissage par renforcement', 'training data', 'donnees d entrainement', 'inference', 'reasoning model',
+        'modele de raisonnement', 'multimodal', 'alignment', 'alignement', 'interpretability',
+    ]),
+    'open_source': (1, [
+        'open source', 'open weights', 'open weight', 'poids ouverts', 'github', 'hugging face hub', 'apache 2 0',
+    ]),
+    'hardware': (1, [
+        'gpu', 'gpus', 'nvidia', 'h100', 'h200', 'b200', 'blackwell', 'tpu', 'npu', 'cuda', 'data center',
+        'data centers', 'datacenter', 'centre de donnees', 'centres de donnees', 'semiconductor', 'semi conducteurs',
+        'puce', 'puces', 'chip', 'chips', 'supercomputer', 'supercalculateur',
+    ]),
+    'robotics': (1, [
+        'robot', 'robots', 'robotics', 'robotique', 'humanoid', 'humanoide', 'self driving', 'autonomous driving',
+        'voiture autonome', 'vehicules autonomes',
+    ]),
+    'policy': (1, [
+        'ai act', 'regulation', 'reglementation', 'regulateur', 'copyright', 'droit d auteur', 'lawsuit', 'proces',
+        'cnil', 'rgpd', 'gdpr', 'ai safety', 'securite de l ia', 'ethics', 'ethique',
+    ]),
+    'automation': (1, [
+        'automation', 'automatisation', 'workflow', 'workflows', 'no code', 'low code', 'zapier', 'make com', 'n8n',
+    ]),
+    'business': (1, [
+        'funding', 'raises', 'levee de fonds', 'startup', 'startups', 'acquisition', 'rachat', 'valuation',
+        'valorisation', 'ipo', 'investment', 'investissement',
+    ]),
+}
+
+TOPIC_LABELS = {
+    'llm': 'LLMs & Chatbots',
+    'agents': 'AI Agents',
+    'image': 'Image Generation',
+    'video': 'Video Generation',
+    'audio': 'Voice & Music',
+    'research': 'Research',
+    'open_source': 'Open Source',
+    'hardware': 'Hardware & Chips',
+    'robotics': 'Robotics',
+    'policy': 'Policy & Regulation',
+    'automation': 'Automation',
+    'business': 'Business & Funding',
+}
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents, punctuation to single spaces, padded with spaces"""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    return f" {_NON_ALNUM.sub(' ', text).strip()} "
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton compiled into a full transition table"""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = list(keywords)
+        goto = [{}]
+        outputs = [[]]
+        for index, keyword in enumerate(self.keywords):
+            state = 0
+            for ch in keyword:
+                if ch not in goto[state]:
+                    goto.append({})
+                    outputs.append([])
+                    goto[state][ch] = len(goto) - 1
+                state = goto[state][ch]
+            outputs[state].append(index)
+
+        # Liens d'échec en largeur, puis table de transitions complète : la
+        # recherche ne fait plus qu'une consultation de dictionnaire par caractère
+        alphabet = {ch for keyword in self.keywords for ch in keyword}
+        fail = [0] * len(goto)
+        self.delta = [dict() for _ in goto]
+        self.delta[0] = {ch: goto[0].get(ch, 0) for ch in alphabet}
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            for ch in alphabet:
+                child = goto[state].get(ch)
+                if child is None:
+                    self.delta[state][ch] = self.delta[fail[state]][ch]
+                else:
+                    fail[child] = self.delta[fail[state]][ch]
+                    self.delta[state][ch] = child
+                    queue.append(child)
+        # Les transitions vers la racine sont implicites (valeur par défaut 0)
+        self.delta = [{ch: target for ch, target in row.items() if target} for row in self.delta]
+        self.outputs = outputs
+
+    def matches(self, text: str) -> Iterable[Tuple[int, int]]:
+        """Yield ``(keyword index, end position)`` for every occurrence, overlapping included"""
+        delta = self.delta
+        outputs = self.outputs
+        state = 0
+        for position, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                for index in outputs[state]:
+                    yield index, position
+
+
+class TopicTagger:
+    """Tags an article with topics and an AI relevance score in one pass"""
+
+    def __init__(self, topics: Optional[Dict] = None):
+        topics = topics or TOPICS
+        self.entries = []  # (thème, poids) par mot-clé
+        keywords = []
+        for topic, (weight, words) in topics.items():
+            for word in words:
+                keywords.append(normalize(word))
+                self.entries.append((topic, weight))
+        self.matcher = KeywordMatcher(keywords)
+
+    def tag(self, title: str, description: str = '') -> Tuple[List[str], int]:
+        """Return ``(tags sorted by score, relevance)``"""
+        title_text = normalize(title)
+        text = title_text + normalize(description)[1:]
+        title_end = len(title_text)
+        found = {}
+        for index, end in self.matcher.matches(text):
+            # Un mot-clé ne compte qu'une fois ; présent dans le titre, il compte double
+            factor = 2 if end < title_end else 1
+            if found.get(index, 0) < factor:
+                found[index] = factor
+
+        relevance = 0
+        topic_scores = {}
+        for index, factor in found.items():
+            topic, weight = self.entries[index]
+            relevance += weight * factor
+            if topic != 'ai':
+                topic_scores[topic] = topic_scores.get(topic, 0) + weight * factor
+        tags = sorted(topic_scores, key=lambda t: (-topic_scores[t], t))
+        return tags, relevance
+
+
+_default_tagger = None
+
+
+def default_tagger() -> TopicTagger:
+    """Tagger over ``TOPICS``, compiled on first use"""
+    global _default_tagger
+    if _default_tagger is None:
+        _default_tagger = TopicTagger()
+    return _default_tagger
+
+
+def tag_article(article, tagger: Optional[TopicTagger] = None) -> List[str]:
+    """Set ``tags`` and ``relevance`` on an article (dict or Article) and return the tags"""
+    tags, relevance = (tagger or default_tagger()).tag(article.get('title', ''), article.get('description', ''))
+    article['tags'] = tags
+    article['relevance'] = relevance
+    return tags
+
+
+def tag_articles(articles: Iterable, only_missing: bool = True) -> None:
+    """Tag every article (by default only those tagged by no previous run)"""
+    tagger = default_tagger()
+    for article in articles:
+        if not only_missing or article.get('tags') is None:
+            tag_article(article, tagger)
+
+
+def topic_index(articles: Iterable) -> Dict[str, List]:
+    """``{topic: [articles]}`` in ``TOPIC_LABELS`` order, articles kept in input order"""
+    index = {topic: [] for topic in TOPIC_LABELS}
+    for article in articles:
+        for tag in article.get('tags') or []:
+            if tag in index:
+                index[tag].append(article)
+    return {topic: items for topic, items in index.items() if items}
@@ -3,24 +3,81 @@
 Translator module for article content
 Uses free translation APIs to translate article descriptions to French
 Supports fallback mechanisms
+
+Texts are translated sentence by sentence through a translation memory:
+each sentence is normalized and hashed, so recurring sentences (feed
+footers, "appeared first on ...", publisher taglines) are translated once
+and reused across articles and runs. The sentences the memory does not
+know are packed, one per line, into as few MyMemory requests as its size
+limit allows, then split back and reassembled.
+
+The memory is bounded to ``MAX_MEMORY_SEGMENTS``: it is kept in recency
+order (a reused sentence moves to the end) and the least recently used
+sentences are evicted first when it is saved, so the file, and the cost
+of loading and rewriting it, stop growing with every run.
 """
 
 import os
+import re
 import json
 import time
+import hashlib
+import threading
 import requests
-from typing import Optional, Dict
+from itertools import islice
+from typing import Optional, Dict, List
+
+BATCH_SIZE = 10  # Articles translated between two cache saves
+MAX_QUERY_BYTES = 500  # MyMemory limit for the 'q' parameter
+SEGMENT_DELIMITER = '\n'  # Line breaks survive translation: one segment per line
+MIN_TEXT_LENGTH = 10
+MAX_MEMORY_SEGMENTS = 50000  # Phrases gardées en mémoire de traduction (quelques Mo de JSON)
+
+# Fin de phrase suivie d'un espace ; les retours à la ligne séparent aussi les segments
+_SENTENCE_END = re.compile(r'(?<=[.!?…])\s+|\s*\n\s*')
+_WHITESPACE = re.compile(r'\s+')
+_HAS_LETTER = re.compile(r'[^\W\d_]')
+
+
+def split_segments(text: str) -> List[str]:
+    """Split ``text`` into sentences and the separators between them (alternating)"""
+    parts = []
+    position = 0
+    for match in _SENTENCE_END.finditer(text):
+        parts.append(text[position:match.start()])
+        parts.append(match.group())
+        position = match.end()
+    parts.append(text[position:])
+    return parts
+
+
+def normalize_segment(segment: str) -> str:
+    return _WHITESPACE.sub(' ', segment).strip()
+
+
+def segment_key(segment: str, source_lang: str = 'en', target_lang: str = 'fr') -> str:
+    normalized = normalize_segment(segment)
+    return hashlib.blake2b(f"{source_lang}-{target_lang}:{normalized}".encode('utf-8'), digest_size=12).hexdigest()
+
 
 class ArticleTranslator:
     """Translate article content to French using multiple fallback methods"""
 
-    def __init__(self, cache_file: str = 'data/translation_cache.json'):
+    def __init__(self, cache_file: str = 'data/translation_memory.json', max_segments: int = MAX_MEMORY_SEGMENTS):
         self.cache_file = cache_file
+        self.max_segments = max_segments
+        # Mémoire de traduction : empreinte du segment -> traduction, de la moins à la plus récemment utilisée
         self.cache = self.load_cache()
         self.translation_count = 0
+        self.saved_count = 0
+        self.request_count = 0
+        self.memory_hits = 0
+        self.lock = threading.Lock()
+        # Pooled connections to the translation API, kept across calls
+        self.session = requests.Session()
 
     def load_cache(self) -> Dict:
-        """Load cached translations to avoid re-translating"""
+        """Load the translation memory to avoid re-translating"""
         if os.path.exists(self.cache_file):
             try:
                 with open(self.cache_file, 'r', encoding='utf-8') as f:
@@ -30,40 +87,140 @@ class ArticleTranslator:
         return {}
 
     def save_cache(self):
-        """Save cache to file"""
+        """Save cache to file (atomically: a run killed mid-write keeps the previous cache)"""
         os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
-        with open(self.cache_file, 'w', encoding='utf-8') as f:
-            json.dump(self.cache, f, ensure_ascii=False, indent=2)
+        tmp_file = f"{self.cache_file}.tmp"
+        with self.lock:
+            self._evict()
+            snapshot = dict(self.cache)
+            count = self.translation_count
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_file, self.cache_file)
+        self.saved_count = count
+
+    def _evict(self) -> int:
+        """Drop the least recently used segments beyond ``max_segments`` (caller holds the lock)"""
+        excess = len(self.cache) - self.max_segments
+        for key in list(islice(self.cache, max(excess, 0))):
+            del self.cache[key]
+        return max(excess, 0)
+
+    def checkpoint(self):
+        """Save the cache if anything was translated since the last save"""
+        if self.translation_count != self.saved_count:
+            self.save_cache()
 
     def translate_text(self, text: str, source_lang: str = 'en', target_lang: str = 'fr') -> Optional[str]:
         """
         Translate text using multiple fallback methods
-        1. Check cache first
-        2. Try MyMemory free API (no key needed)
-        3. Return original if all fail
+        1. Check the translation memory, sentence by sentence
+        2. Try MyMemory free API (no key needed) for unknown sentences
+        3. Keep the original sentence if all fail
         """
-        if not text or len(text.strip()) < 10:
-            return text
+        return self.translate_texts([text], source_lang, target_lang)[0]
 
-        # Create cache key
-        cache_key = f"{source_lang}-{target_lang}:{text[:100]}"
+    def translate_texts(self, texts: List[str], source_lang: str = 'en', target_lang: str = 'fr',
+                        partial: bool = True) -> List[Optional[str]]:
+        """
+        Translate several texts at once: their unknown sentences share the same requests.
+        Sentences that could not be translated are kept in the original language, or,
+        with ``partial=False``, the whole text is None (to be retried later).
+        """
+        splits = []
+        missing = {}
+        for text in texts:
+            if not text or len(text.strip()) < MIN_TEXT_LENGTH:
+                splits.append(None)
+                continue
+            parts = split_segments(text)
+            splits.append(parts)
+            for segment in parts[::2]:
+                if not _HAS_LETTER.search(segment):
+                    continue
+                key = segment_key(segment, source_lang, target_lang)
+                with self.lock:
+                    if key in self.cache:
+                        # Phrase réutilisée : passe en fin d'ordre, évincée en dernier
+                        self.cache[key] = self.cache.pop(key)
+                        self.memory_hits += 1
+                        continue
+                missing.setdefault(key, normalize_segment(segment))
 
-        # Check cache
-        if cache_key in self.cache:
-            return self.cache[cache_key]
+        if missing:
+            translated = self._translate_segments(list(missing.values()), source_lang, target_lang)
+            with self.lock:
+                for key, translation in zip(missing, translated):
+                    if translation is not None:
+                        self.cache[key] = translation
+                        self.translation_count += 1
 
-        # Try translation
-        translated = self._translate_with_mymemory(text, source_lang, target_lang)
+        results = []
+        for text, parts in zip(texts, splits):
+            if parts is None:
+                results.append(text)
+                continue
+            complete = True
+            for index in range(0, len(parts), 2):
+                segment = parts[index]
+                if _HAS_LETTER.search(segment):
+                    translation = self.cache.get(segment_key(segment, source_lang, target_lang))
+                    if translation is None:
+                        complete = False
+                    else:
+                        parts[index] = translation
+            results.append(''.join(parts) if complete or partial else None)
+        return results
 
-        if translated and translated != text:
-            self.cache[cache_key] = translated
-            self.translation_count += 1
-            # Auto-save every 10 translations
-            if self.translation_count % 10 == 0:
-                self.save_cache()
-            return translated
+    def _translate_segments(self, segments: List[str], source_lang: str, target_lang: str) -> List[Optional[str]]:
+        """Pack segments into requests of at most MAX_QUERY_BYTES; None where translation failed"""
+        results: List[Optional[str]] = []
+        batch: List[str] = []
+        size = 0
+        for segment in segments:
+            length = len(segment.encode('utf-8'))
+            if batch and size + len(SEGMENT_DELIMITER) + length > MAX_QUERY_BYTES:
+                results.extend(self._translate_batch(batch, source_lang, target_lang))
+                batch, size = [], 0
+            batch.append(segment)
+            size += length + (len(SEGMENT_DELIMITER) if len(batch) > 1 else 0)
+        if batch:
+            results.extend(self._translate_batch(batch, source_lang, target_lang))
+        return results
 
-        return text
+    def _translate_batch(self, batch: List[str], source_lang: str, target_lang: str) -> List[Optional[str]]:
+        """
+        One request for the whole batch; split in halves if the lines do not come back one for one.
+        A failed request (API down, quota) fails the whole batch: retrying halves would only multiply timeouts.
+        """
+        if len(batch) == 1 and len(batch[0].encode('utf-8')) > MAX_QUERY_BYTES:
+            return [self._translate_long(batch[0], source_lang, target_lang)]
+        translated = self._translate_with_mymemory(SEGMENT_DELIMITER.join(batch), source_lang, target_lang)
+        if translated is None:
+            return [None] * len(batch)
+        lines = translated.split(SEGMENT_DELIMITER)
+        if len(lines) == len(batch):
+            return [line.strip() or segment for line, segment in zip(lines, batch)]
+        if len(batch) == 1:
+            return [translated.strip() or None]
+        middle = len(batch) // 2
+        return (self._translate_batch(batch[:middle], source_lang, target_lang)
+                + self._translate_batch(batch[middle:], source_lang, target_lang))
+
+    def _translate_long(self, segment: str, source_lang: str, target_lang: str) -> Optional[str]:
+        """A single sentence over the API limit: translated by word-boundary chunks"""
+        chunks, current = [], ''
+        for word in segment.split(' '):
+            candidate = f"{current} {word}" if current else word
+            if current and len(candidate.encode('utf-8')) > MAX_QUERY_BYTES:
+                chunks.append(current)
+                candidate = word
+            current = candidate
+        chunks.append(current)
+        translated = [self._translate_with_mymemory(chunk, source_lang, target_lang) for chunk in chunks]
+        if any(part is None for part in translated):
+            return None
+        return ' '.join(translated)
 
     def _translate_with_mymemory(self, text: str, source_lang: str = 'en', target_lang: str = 'fr') -> Optional[str]:
         """
@@ -71,30 +228,20 @@ class ArticleTranslator:
         No rate limiting for reasonable use
         """
         try:
-            # Split text if too long (API limit ~500 chars)
-            if len(text) > 500:
-                # Translate in chunks, respecting sentence boundaries
-                sentences = text.split('. ')
-                translated_sentences = []
-                for sentence in sentences:
-                    if sentence.strip():
-                        trans = self._translate_with_mymemory(sentence, source_lang, target_lang)
-                        translated_sentences.append(trans if trans else sentence)
-                return '. '.join(translated_sentences)
-
             url = 'https://api.mymemory.translated.net/get'
             params = {
                 'q': text,
                 'langpair': f'{source_lang}|{target_lang}'
             }
 
-            response = requests.get(url, params=params, timeout=5)
+            self.request_count += 1
+            response = self.session.get(url, params=params, timeout=5)
 
             if response.status_code == 200:
                 data = response.json()
                 if data.get('responseStatus') == 200:
                     translated = data.get('responseData', {}).get('translatedText', '')
-                    if translated and translated != text:
+                    if translated:
                         return translated
 
             return None
@@ -103,48 +250,63 @@ class ArticleTranslator:
             return None
 
     def translate_article(self, article: Dict) -> Dict:
-        """Translate article description and title"""
-        article_copy = article.copy()
-
-        # Translate description
-        if article.get('description'):
-            translated_desc = self.translate_text(article['description'])
-            article_copy['description_fr'] = translated_desc
-
-        # Translate title (if we want to be thorough)
-        if article.get('title'):
-            translated_title = self.translate_text(article['title'])
-            article_copy['title_fr'] = translated_title
+        """
+        Translate article description and title in place
+        Works on plain dicts and Article records; no field is copied
+        """
+        self.translate_batch([article])
+        return article
 
-        return article_copy
+    def translate_batch(self, articles: List) -> List:
+        """
+        Translate titles and descriptions of several articles with shared requests.
+        An article gets its ``*_fr`` fields only if all of them were translated:
+        the others stay without ``title_fr`` and are retried by the next run.
+        """
+        fields = [(article, field) for article in articles
+                  for field in ('description', 'title') if article.get(field)]
+        translated = self.translate_texts([article[field] for article, field in fields], partial=False)
+        failed = {id(article) for (article, _), text in zip(fields, translated) if text is None}
+        for (article, field), text in zip(fields, translated):
+            if id(article) not in failed:
+                article[f'{field}_fr'] = text
+        return articles
 
     def finalize(self):
         """Save final cache before exit"""
-        self.save_cache()
-        print(f"✅ Translated {self.translation_count} article descriptions")
+        self.checkpoint()
+        print(f"✅ Translated {self.translation_count} new sentences in {self.request_count} requests "
+              f"({self.memory_hits} reused from memory)")
 
 
-def translate_articles(articles: list) -> list:
-    """Main function to translate all articles"""
+def translate_articles(articles: list, translator: Optional[ArticleTranslator] = None,
+                       budget=None, batch_size: int = BATCH_SIZE) -> list:
+    """
+    Main function to translate all articles
+    A long-lived translator (daemon mode) keeps its memory and HTTP session warm.
+    Articles go by batches sharing their requests; the memory is saved after each
+    batch and, with a ``budget`` (scraper.checkpoint.Budget), translation stops
+    between batches once it is spent, the rest waits for the next run.
+    """
     print("🌍 Starting article translation to French...")
 
-    translator = ArticleTranslator()
-    translated_articles = []
+    translator = translator or ArticleTranslator()
 
-    for i, article in enumerate(articles):
-        # Show progress
-        if (i + 1) % 10 == 0:
-            print(f"   Translated {i + 1}/{len(articles)} articles...")
+    for start in range(0, len(articles), batch_size):
+        if start:
+            translator.checkpoint()
+            print(f"   Translated {start}/{len(articles)} articles...")
+            if budget is not None and budget.expired():
+                print(f"   ⏱️  Time budget spent: {len(articles) - start} articles left for the next run")
+                break
 
-        translated = translator.translate_article(article)
-        translated_articles.append(translated)
+        translator.translate_batch(articles[start:start + batch_size])
 
         # Small delay to avoid rate limiting
-        if i % 5 == 0:
-            time.sleep(0.1)
+        time.sleep(0.1)
 
     translator.finalize()
-    return translated_articles
+    return articles
 
 
 if __name__ == '__main__':
@@ -155,7 +317,7 @@ if __name__ == '__main__':
     }
 
     translator = ArticleTranslator()
+    print("Original:", dict(test_article))
     translated = translator.translate_article(test_article)
-    print("Original:", test_article)
     print("Translated:", translated)
     translator.finalize()
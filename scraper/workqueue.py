@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Durable work queue for distributed scraping (SQLite, leases, visibility timeout).
+
+The coordinator puts one task per source in ``data/work_queue.sqlite``.
+Workers (processes on this host, or ``python3 -m scraper.workqueue worker``
+started elsewhere on the same data directory) lease a task, fetch and parse
+the source, and store the normalized items as a result. They never touch
+the article store: the coordinator is the single writer, it merges results
+as they arrive through ``IANewsScraper.merge_items`` (URL dedup, date and
+topic filters, slugs).
+
+A lease lasts ``LEASE_SECONDS`` and is renewed by a heartbeat while the
+worker is busy. When a worker crashes or stalls, its lease expires and the
+task becomes visible to the other workers again, up to ``MAX_ATTEMPTS``
+times. A result is only accepted from the current lease holder, so a late
+worker cannot deliver a task twice. If every worker process dies, the
+coordinator runs the remaining tasks itself::
+
+    python3 run.py scraper --workers 4
+    python3 -m scraper.workqueue worker --wait     # Worker supplémentaire
+    python3 -m scraper.workqueue status
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+from .checkpoint import source_key
+
+logger = logging.getLogger(__name__)
+
+QUEUE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'work_queue.sqlite')
+LEASE_SECONDS = 120      # Délai de visibilité : tâche rendue aux autres workers après expiration
+MAX_ATTEMPTS = 3
+POLL_SECONDS = 0.5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_token TEXT,
+    lease_expires REAL,
+    error TEXT,
+    UNIQUE (run_id, kind, name)
+);
+CREATE INDEX IF NOT EXISTS tasks_state ON tasks (state, lease_expires);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    task_id INTEGER NOT NULL REFERENCES tasks (id),
+    items TEXT NOT NULL,
+    merged INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+class Task:
+    """A leased task: the source to scrape and the lease that proves ownership"""
+
+    def __init__(self, task_id: int, run_id: str, kind: str, source: Dict, token: str, attempts: int):
+        self.id = task_id
+        self.run_id = run_id
+        self.kind = kind
+        self.source = source
+        self.token = token
+        self.attempts = attempts
+
+    @property
+    def name(self) -> str:
+        return self.source.get('name', '?')
+
+
+class WorkQueue:
+    """SQLite-backed task queue; each call opens its own connection (threads and processes)"""
+
+    def __init__(self, path: str = QUEUE_FILE, lease_seconds: float = LEASE_SECONDS,
+                 max_attempts: int = MAX_ATTEMPTS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as db:
+            db.execute('PRAGMA journal_mode=WAL')  # Lectures des workers sans bloquer l'écrivain
+            db.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # isolation_level=None : transactions explicites (BEGIN IMMEDIATE = verrou d'écriture pris d'emblée)
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @contextmanager
+    def _transaction(self):
+        with self._connect() as db:
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                yield db
+            except BaseException:
+                db.execute('ROLLBACK')
+                raise
+            db.execute('COMMIT')
+
+    # --- Coordinateur ---
+
+    def start_run(self, sources: Dict, skip: Iterable[str] = ()) -> str:
+        """
+        Enqueue one task per source, except the ``skip`` source keys (already done by the run
+        being resumed); tasks left over by an earlier run are cancelled, its results dropped.
+        """
+        skip = set(skip)
+        run_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        with self._transaction() as db:
+            db.execute("UPDATE tasks SET state = 'cancelled', lease_token = NULL "
+                       "WHERE state IN ('pending', 'leased')")
+            # Résultats des runs précédents : fusionnés, ou jamais lus (run annulé) puisque
+            # seuls ceux du run en cours sont fusionnés
+            db.execute("DELETE FROM results")
+            for kind, key in (('rss', 'rss_feeds'), ('site', 'sites')):
+                for source in sources.get(key, []):
+                    if source_key(kind, source) in skip:
+                        continue
+                    db.execute("INSERT OR IGNORE INTO tasks (run_id, kind, name, payload) VALUES (?, ?, ?, ?)",
+                               (run_id, kind, source['name'], json.dumps(source, ensure_ascii=False)))
+        return run_id
+
+    def resume_run(self, run_id: Optional[str]) -> Optional[str]:
+        """``run_id`` if it still has work in the queue, its leases released (their workers are gone); else None"""
+        if run_id is None or self.finished(run_id):
+            return None
+        with self._transaction() as db:
+            db.execute("UPDATE tasks SET state = 'pending', lease_token = NULL "
+                       "WHERE run_id = ? AND state = 'leased'", (run_id,))
+        return run_id
+
+    def take_results(self, run_id: str) -> List:
+        """Results not merged yet, as ``(result id, kind, source, items)``"""
+        with self._connect() as db:
+            rows = db.execute(
+                "SELECT results.id, tasks.kind, tasks.payload, results.items FROM results "
+                "JOIN tasks ON tasks.id = results.task_id "
+                "WHERE results.merged = 0 AND tasks.run_id = ? ORDER BY results.id",
+                (run_id,),
+            ).fetchall()
+        return [(result_id, kind, json.loads(payload), json.loads(items))
+                for result_id, kind, payload, items in rows]
+
+    def mark_merged(self, result_ids: List[int]) -> None:
+        with self._transaction() as db:
+            db.executemany("UPDATE results SET merged = 1 WHERE id = ?", [(i,) for i in result_ids])
+
+    def counts(self, run_id: Optional[str] = None) -> Dict[str, int]:
+        query = "SELECT state, COUNT(*) FROM tasks"
+        args = ()
+        if run_id:
+            query += " WHERE run_id = ?"
+            args = (run_id,)
+        with self._connect() as db:
+            return dict(db.execute(query + " GROUP BY state", args).fetchall())
+
+    def latest_run(self) -> Optional[str]:
+        with self._connect() as db:
+            row = db.execute("SELECT run_id FROM tasks ORDER BY id DESC LIMIT 1").fetchone()
+        return row[0] if row else None
+
+    def finished(self, run_id: str) -> bool:
+        """No task of the run is pending or leased any more"""
+        self._expire()
+        counts = self.counts(run_id)
+        return not counts.get('pending') and not counts.get('leased')
+
+    # --- Workers ---
+
+    def _expire(self) -> None:
+        """Tasks out of attempts (lease expired, or released by a resume) are marked failed"""
+        with self._transaction() as db:
+            db.execute("UPDATE tasks SET state = 'failed', lease_token = NULL, error = 'lease expirée' "
+                       "WHERE (state = 'pending' OR (state = 'leased' AND lease_expires < ?)) AND attempts >= ?",
+                       (time.time(), self.max_attempts))
+
+    def lease(self, worker_id: str) -> Optional[Task]:
+        """Take the oldest visible task (pending, or leased with an expired lease)"""
+        now = time.time()
+        token = uuid.uuid4().hex
+        with self._transaction() as db:
+            row = db.execute(
+                "SELECT id, run_id, kind, payload, attempts FROM tasks "
+                "WHERE (state = 'pending' OR (state = 'leased' AND lease_expires < ?)) AND attempts < ? "
+                "ORDER BY id LIMIT 1",
+                (now, self.max_attempts),
+            ).fetchone()
+            if row is None:
+                return None
+            task_id, run_id, kind, payload, attempts = row
+            db.execute("UPDATE tasks SET state = 'leased', attempts = attempts + 1, lease_owner = ?, "
+                       "lease_token = ?, lease_expires = ? WHERE id = ?",
+                       (worker_id, token, now + self.lease_seconds, task_id))
+        return Task(task_id, run_id, kind, json.loads(payload), token, attempts + 1)
+
+    def heartbeat(self, task: Task) -> bool:
+        """Extend the lease; False if the task was handed to another worker meanwhile"""
+        with self._transaction() as db:
+            updated = db.execute("UPDATE tasks SET lease_expires = ? WHERE id = ? AND lease_token = ?",
+                                 (time.time() + self.lease_seconds, task.id, task.token)).rowcount
+        return bool(updated)
+
+    def complete(self, task: Task, items: List[Dict]) -> bool:
+        """Store the result; refused (False) if the lease was lost"""
+        with self._transaction() as db:
+            updated = db.execute("UPDATE tasks SET state = 'done', lease_token = NULL, error = NULL "
+                                 "WHERE id = ? AND lease_token = ?", (task.id, task.token)).rowcount
+            if updated:
+                db.execute("INSERT INTO results (task_id, items) VALUES (?, ?)",
+                           (task.id, json.dumps(items, ensure_ascii=False)))
+        return bool(updated)
+
+    def fail(self, task: Task, error: str) -> None:
+        """Give the task back (retried by any worker) or mark it failed after the last attempt"""
+        state = 'failed' if task.attempts >= self.max_attempts else 'pending'
+        with self._transaction() as db:
+            db.execute("UPDATE tasks SET state = ?, lease_token = NULL, error = ? WHERE id = ? AND lease_token = ?",
+                       (state, error[:500], task.id, task.token))
+
+
+def default_worker_id(index: int = 0) -> str:
+    return f"{socket.gethostname()}-{os.getpid()}-{index}"
+
+
+def process_task(queue: WorkQueue, task: Task, scraper) -> bool:
+    """Scrape one leased task, renewing the lease while it runs"""
+    stop = threading.Event()
+
+    def keep_alive():
+        while not stop.wait(queue.lease_seconds / 3):
+            if not queue.heartbeat(task):
+                return
+
+    heartbeat = threading.Thread(target=keep_alive, name=f'lease-{task.id}', daemon=True)
+    heartbeat.start()
+    try:
+        items = scraper.scrape_source(task.kind, task.source)
+    except Exception as e:
+        logger.error(f"❌ {task.name}: {str(e)[:100]} (tentative {task.attempts}/{queue.max_attempts})")
+        queue.fail(task, str(e))
+        return False
+    finally:
+        stop.set()
+    if not queue.complete(task, items):
+        logger.warning(f"⚠️  {task.name}: lease perdue, résultat ignoré")
+        return False
+    return True
+
+
+def work(queue: WorkQueue, worker_id: str, scraper=None, wait: bool = False,
+         stop_event: Optional[threading.Event] = None) -> int:
+    """
+    Worker loop: lease, scrape, deliver. Returns the number of tasks done.
+    Without ``wait`` the worker exits as soon as no task is visible.
+    """
+    if scraper is None:
+        from .scraper import IANewsScraper
+        scraper = IANewsScraper()
+    done = 0
+    while not (stop_event and stop_event.is_set()):
+        task = queue.lease(worker_id)
+        if task is None:
+            if not wait:
+                break
+            time.sleep(POLL_SECONDS * 4)
+            continue
+        done += process_task(queue, task, scraper)
+        time.sleep(random.uniform(0.5, 1.5))  # Politesse envers les sources, comme le scraping séquentiel
+    return done
+
+
+def _worker_process(path: str, worker_id: str, sources_file: Optional[str], lease_seconds: float) -> None:
+    from .scraper import IANewsScraper, setup_logging
+
+    setup_logging()
+    work(WorkQueue(path, lease_seconds), worker_id, IANewsScraper(sources_file))
+
+
+def merge_results(queue: WorkQueue, run_id: str, scraper, checkpoint=None) -> int:
+    """Single writer: merge delivered items into the scraper's articles; return the number added"""
+    results = queue.take_results(run_id)
+    added = 0
+    for _, kind, source, items in results:
+        before = len(scraper.news)
+        added += scraper.merge_items(items, source)
+        if checkpoint is not None:
+            # Checkpoint avant de marquer le résultat fusionné : une reprise ne perd rien
+            checkpoint.record(source_key(kind, source), scraper.news[before:])
+    if results:
+        queue.mark_merged([result_id for result_id, _, _, _ in results])
+    return added
+
+
+def coordinate(scraper, workers: int, path: str = QUEUE_FILE, lease_seconds: float = LEASE_SECONDS,
+               sources_file: Optional[str] = None, budget=None, checkpoint=None) -> bool:
+    """
+    Enqueue the sources, start ``workers`` processes and merge their results.
+    Returns False if ``budget`` ran out first: the run stays in the queue and the
+    next call with a resumed ``checkpoint`` continues it.
+    """
+    import multiprocessing
+
+    queue = WorkQueue(path, lease_seconds)
+    # Seul le run de la file noté dans le checkpoint est repris (pas celui d'un run en mode pipeline)
+    run_id = queue.resume_run(checkpoint.run_id) if checkpoint is not None and checkpoint.resumed else None
+    if run_id:
+        logger.info(f"♻️  Reprise du run {run_id} de la file")
+    else:
+        # Checkpoint d'un run en mode pipeline : ses sources terminées ne sont pas remises en file
+        run_id = queue.start_run(scraper.sources, checkpoint.done if checkpoint is not None else ())
+        if checkpoint is not None:
+            checkpoint.run_id = run_id
+            checkpoint.save()
+    sources_file = sources_file or os.environ.get('IA_NEWS_SOURCES')
+    processes = [
+        multiprocessing.Process(target=_worker_process, name=f'scrape-worker-{i}', daemon=True,
+                                args=(path, default_worker_id(i), sources_file, lease_seconds))
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    added = 0
+    complete = True
+    coordinator_id = default_worker_id(workers)
+    try:
+        while not queue.finished(run_id):
+            if budget is not None and budget.expired():
+                complete = False
+                break
+            added += merge_results(queue, run_id, scraper, checkpoint)
+            if not any(process.is_alive() for process in processes):
+                # Plus aucun worker : le coordinateur traite lui-même les tâches restantes
+                task = queue.lease(coordinator_id)
+                if task is not None:
+                    process_task(queue, task, scraper)
+                    continue
+            time.sleep(POLL_SECONDS)
+        added += merge_results(queue, run_id, scraper, checkpoint)
+    finally:
+        for process in processes:
+            # Budget épuisé : les tâches en cours sont abandonnées, reprises au prochain run
+            process.join(timeout=5 if complete else 0)
+            if process.is_alive():
+                process.terminate()
+
+    counts = queue.counts(run_id)
+    logger.info(f"📬 File: {counts.get('done', 0)} sources traitées, {counts.get('failed', 0)} en échec, "
+                f"{added} articles ajoutés")
+    return complete
+
+
+def main(argv=None) -> int:
+    from .scraper import IANewsScraper, setup_logging
+
+    parser = argparse.ArgumentParser(description="File de travail du scraping réparti")
+    parser.add_argument('command', choices=['worker', 'status'])
+    parser.add_argument('--queue', default=QUEUE_FILE, help="Fichier SQLite de la file")
+    parser.add_argument('--lease', type=float, default=LEASE_SECONDS, help="Durée des leases en secondes")
+    parser.add_argument('--wait', action='store_true', help="Worker : attendre de nouvelles tâches au lieu de s'arrêter")
+    args = parser.parse_args(argv)
+
+    queue = WorkQueue(args.queue, args.lease)
+    if args.command == 'status':
+        run_id = queue.latest_run()
+        print(f"Dernier run: {run_id or '-'}")
+        for state, count in sorted(queue.counts(run_id).items()):
+            print(f"  {state:<10} {count}")
+        return 0
+
+    setup_logging()
+    done = work(queue, default_worker_id(), IANewsScraper(), wait=args.wait)
+    print(f"✅ {done} sources traitées")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
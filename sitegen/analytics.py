@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Columnar analytics of the article store (NumPy), for ``/api/stats`` and the
+sources page.
+
+``ArticleFrame`` reads the articles once into columns: publication times as
+a ``datetime64[s]`` array (NaT when unknown) and, for ``source``,
+``category`` and ``source_type``, an integer code per article plus the
+sorted labels. Every statistic is then a vectorized operation on those
+arrays, with no loop over the articles:
+
+- counts and last publication per label (``bincount``, ``maximum.at``);
+- daily time series per label over the last ``days`` days: one
+  ``bincount`` on ``code * days + day offset``, reshaped to a
+  ``labels x days`` matrix;
+- publishing rates (articles per day over a window) and rolling trends
+  (moving average by cumulative sums, change against the previous window).
+
+Series end on the day of the newest article rather than today, so a build
+without new articles produces the same numbers. Only the steps that compute
+stats import this module (numpy is slow to import); the defaults live in
+``sitegen.api``.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from sitegen.api import SERIES_DAYS, TREND_WINDOW
+
+COLUMNS = ('source', 'category', 'source_type')
+DEFAULTS = {'source': 'Unknown', 'category': 'general', 'source_type': 'unknown'}
+
+
+class ArticleFrame:
+    """Columns of the article store: timestamps and categorical codes"""
+
+    def __init__(self, articles: Iterable):
+        published = []
+        values = {name: [] for name in COLUMNS}
+        for article in articles:
+            # Horodatage canonique « AAAA-MM-JJTHH:MM:SSZ » : le 'Z' est retiré par la troncature U19
+            published.append(article.get('published_at') or 'NaT')
+            for name in COLUMNS:
+                values[name].append(article.get(name) or DEFAULTS[name])
+        self.published = np.array(published, dtype='U19').astype('datetime64[s]')
+        self.days = self.published.astype('datetime64[D]')
+        self.labels: Dict[str, np.ndarray] = {}
+        self.codes: Dict[str, np.ndarray] = {}
+        for name in COLUMNS:
+            labels, codes = np.unique(np.array(values[name], dtype=str), return_inverse=True)
+            self.labels[name] = labels
+            self.codes[name] = codes.reshape(-1).astype(np.int64)
+
+    def __len__(self) -> int:
+        return len(self.published)
+
+    @property
+    def last_day(self) -> Optional[np.datetime64]:
+        """Day of the newest article (end of the series), None without dated article"""
+        dated = self.days[~np.isnat(self.days)]
+        return dated.max() if len(dated) else None
+
+    # --- Agrégats par modalité ---
+
+    def counts(self, column: str) -> Dict[str, int]:
+        counts = np.bincount(self.codes[column], minlength=len(self.labels[column]))
+        return {str(label): int(count) for label, count in zip(self.labels[column], counts)}
+
+    def last_published(self, column: str) -> Dict[str, Optional[str]]:
+        """Newest publication time of each label (canonical UTC string)"""
+        seconds = self.published.astype(np.int64)  # NaT -> plus petit entier : jamais retenu
+        newest = np.full(len(self.labels[column]), np.iinfo(np.int64).min, dtype=np.int64)
+        np.maximum.at(newest, self.codes[column], seconds)
+        stamps = newest.astype('datetime64[s]')
+        return {str(label): (None if np.isnat(stamp) else f"{stamp}Z")
+                for label, stamp in zip(self.labels[column], stamps)}
+
+    def dominant(self, column: str, by: str) -> Dict[str, str]:
+        """Most frequent ``by`` label of each ``column`` label (category of each source…)"""
+        rows, cols = len(self.labels[column]), len(self.labels[by])
+        if not rows:
+            return {}
+        table = np.bincount(self.codes[column] * cols + self.codes[by], minlength=rows * cols).reshape(rows, cols)
+        return {str(label): str(self.labels[by][index])
+                for label, index in zip(self.labels[column], table.argmax(axis=1))}
+
+    # --- Séries temporelles ---
+
+    def daily(self, column: Optional[str] = None, days: int = SERIES_DAYS,
+              end: Optional[np.datetime64] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        ``(dates, counts)`` over the ``days`` days ending on ``end`` (default: newest article).
+        ``counts`` is ``labels x days`` for a column, a single row of totals without one.
+        """
+        end = self.last_day if end is None else np.datetime64(end, 'D')
+        if end is None:
+            rows = 1 if column is None else len(self.labels[column])
+            return np.array([], dtype='datetime64[D]'), np.zeros((rows, 0), dtype=np.int64)
+        start = end - np.timedelta64(days - 1, 'D')
+        in_range = (self.days >= start) & (self.days <= end)  # NaT : toujours hors période
+        offsets = (self.days[in_range] - start).astype(np.int64)
+        codes = np.zeros(len(offsets), dtype=np.int64) if column is None else self.codes[column][in_range]
+        rows = 1 if column is None else len(self.labels[column])
+        counts = np.bincount(codes * days + offsets, minlength=rows * days).reshape(rows, days)
+        return np.arange(start, end + np.timedelta64(1, 'D')), counts
+
+    def rolling(self, column: Optional[str] = None, days: int = SERIES_DAYS, window: int = TREND_WINDOW,
+                end: Optional[np.datetime64] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Moving average over ``window`` days of the daily series (same shape as ``daily``)"""
+        dates, counts = self.daily(column, days + window - 1, end)
+        totals = np.cumsum(np.pad(counts, ((0, 0), (1, 0))), axis=1)
+        return dates[window - 1:], (totals[:, window:] - totals[:, :-window]) / window
+
+    def trends(self, column: str, window: int = TREND_WINDOW,
+               end: Optional[np.datetime64] = None) -> Dict[str, Dict]:
+        """
+        Publishing rate of each label (articles per day over the last ``window`` days),
+        rate of the window before, and relative change (None when the previous rate is 0)
+        """
+        if not len(self.labels[column]):
+            return {}
+        _, counts = self.daily(column, 2 * window, end)
+        previous = counts[:, :window].sum(axis=1) / window
+        recent = counts[:, window:].sum(axis=1) / window
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change = np.where(previous > 0, recent / previous - 1, np.nan)
+        return {
+            str(label): {
+                'rate': round(float(rate), 2),
+                'previous_rate': round(float(before), 2),
+                'change': None if np.isnan(delta) else round(float(delta), 3),
+            }
+            for label, rate, before, delta in zip(self.labels[column], recent, previous, change)
+        }
+
+    # --- Vues ---
+
+    def summary(self, days: int = SERIES_DAYS, window: int = TREND_WINDOW) -> Dict:
+        """Counts of ``/api/stats`` plus daily series, rolling averages and trends"""
+        dates, totals = self.daily(None, days)
+        _, rolling = self.rolling(None, days, window)
+        last_day = self.last_day
+        newest = self.published[~np.isnat(self.published)]
+        series = {'dates': [str(day) for day in dates], 'total': totals[0].tolist(),
+                  'total_rolling': np.round(rolling[0], 2).tolist()}
+        for column in ('category', 'source'):
+            _, counts = self.daily(column, days)
+            series[column] = {str(label): row.tolist() for label, row in zip(self.labels[column], counts)}
+        return {
+            'total_articles': len(self),
+            'categories': self.counts('category'),
+            'sources': self.counts('source'),
+            'source_types': self.counts('source_type'),
+            # Date du contenu (article le plus récent) : stable d'un build à l'autre
+            'last_updated': f"{newest.max()}Z" if len(newest) else None,
+            'period': {'start': series['dates'][0] if series['dates'] else None,
+                       'end': None if last_day is None else str(last_day), 'days': days, 'window': window},
+            'daily': series,
+            'trends': {'categories': self.trends('category', window), 'sources': self.trends('source', window)},
+        }
+
+    def sources(self, days: int = SERIES_DAYS, window: int = TREND_WINDOW) -> Dict[str, Dict]:
+        """Rows of the sources page, most prolific source first"""
+        if not len(self.labels['source']):
+            return {}
+        counts = self.counts('source')
+        last = self.last_published('source')
+        categories = self.dominant('source', 'category')
+        types = self.dominant('source', 'source_type')
+        trends = self.trends('source', window)
+        _, series = self.daily('source', days)
+        rows = {}
+        for label, row in sorted(zip(self.labels['source'], series), key=lambda item: -counts[str(item[0])]):
+            name = str(label)
+            rows[name] = {
+                'count': counts[name],
+                'last_update': last[name][:10] if last[name] else 'N/A',
+                'category': categories[name],
+                'type': types[name],
+                'series': row.tolist(),
+                'sparkline': sparkline(row.tolist()),
+                **trends[name],
+            }
+        return rows
+
+
+def sparkline(values: List[int], width: int = 100, height: int = 24) -> str:
+    """SVG polyline points of a daily series, scaled to ``width`` x ``height``"""
+    if not values:
+        return ''
+    data = np.asarray(values, dtype=float)
+    peak = data.max() or 1.0
+    xs = np.linspace(0, width, len(data)) if len(data) > 1 else np.array([width / 2])
+    ys = height - data / peak * height
+    return ' '.join(f"{x:.1f},{y:.1f}" for x, y in zip(xs, ys))
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Static JSON API written by the build under ``public/api/v1/``.
+
+The static site has no server, so the build publishes the data the Flask
+``/api/news`` and ``/api/stats`` routes compute on demand:
+
+- ``news/<category>/<page>.json``: listings, newest first, ``PAGE_SIZE``
+  articles per page, ``all`` for every category (pages numbered from 1);
+- ``article/<slug>.json``: the full record of each article;
+- ``stats.json``: counts per category, source and source type, daily
+  series and publishing trends (``sitegen.analytics``);
+- ``manifest.json``: page counts and a content hash for every file.
+
+Files are compact (no whitespace, keys always in the same order) so they
+compress well, and their content only changes when the data does: clients
+and the CDN can revalidate with the manifest hashes instead of downloading
+pages again.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, List
+
+from sitegen.archives import category_key
+
+API_VERSION = 'v1'
+PAGE_SIZE = 50
+# Statistiques (sitegen.analytics) : jours des séries quotidiennes, fenêtre des tendances
+SERIES_DAYS = 30
+TREND_WINDOW = 7
+# Champs des listes : de quoi afficher une carte, le détail est dans article/<slug>.json
+LISTING_FIELDS = (
+    'id', 'slug', 'title', 'title_fr', 'description', 'description_fr', 'url', 'image_url',
+    'published_at', 'source', 'category', 'tags',
+)
+
+
+def _dumps(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def listing_item(article) -> Dict:
+    """Card-sized record of an article, for the listing pages"""
+    return {field: article.get(field) for field in LISTING_FIELDS if article.get(field) not in (None, '')}
+
+
+def compute_stats(articles: Iterable, frame=None) -> Dict:
+    """Same stats as Flask's ``/api/stats``, dated by the newest article"""
+    if frame is None:
+        # Import à la demande : numpy n'est chargé que par les étapes qui calculent des stats
+        from sitegen.analytics import ArticleFrame
+        frame = ArticleFrame(articles)
+    # Date du contenu et non du build : un build sans nouvel article ne change pas le fichier
+    return frame.summary()
+
+
+class ApiWriter:
+    """Writes the API files and records their hashes for the manifest"""
+
+    def __init__(self, output_dir: str):
+        self.root = os.path.join(output_dir, 'api', API_VERSION)
+        self.files = {}
+
+    def write(self, path: str, data) -> None:
+        payload = _dumps(data)
+        full_path = os.path.join(self.root, *path.split('/'))
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, 'wb') as f:
+            f.write(payload)
+        self.files[path] = {
+            'hash': hashlib.sha256(payload).hexdigest()[:16],
+            'bytes': len(payload),
+        }
+
+    def write_listing(self, category: str, articles: List) -> int:
+        """Paginate ``articles`` (already sorted) under ``news/<category>/``; return the page count"""
+        items = [listing_item(article) for article in articles]
+        pages = max(1, -(-len(items) // PAGE_SIZE))
+        for page in range(1, pages + 1):
+            self.write(f"news/{category}/{page}.json", {
+                'category': category,
+                'page': page,
+                'pages': pages,
+                'total': len(items),
+                'items': items[(page - 1) * PAGE_SIZE:page * PAGE_SIZE],
+            })
+        return pages
+
+
+def write_api(articles: Iterable, output_dir: str, frame=None) -> Dict:
+    """
+    Write the whole API under ``<output_dir>/api/v1/`` and return the manifest
+    (``frame``: ``ArticleFrame`` already built from the same articles, reused for the stats)
+    """
+    ordered = sorted(articles, key=lambda a: a.get('published_at') or '', reverse=True)
+    writer = ApiWriter(output_dir)
+
+    by_category = {}
+    for article in ordered:
+        by_category.setdefault(category_key(article.get('category', 'general')), []).append(article)
+        writer.write(f"article/{article['slug']}.json", article.to_dict() if hasattr(article, 'to_dict') else article)
+
+    page_counts = {'all': writer.write_listing('all', ordered)}
+    for category in sorted(by_category):
+        page_counts[category] = writer.write_listing(category, by_category[category])
+
+    writer.write('stats.json', compute_stats(ordered, frame))
+
+    manifest = {
+        'version': API_VERSION,
+        'page_size': PAGE_SIZE,
+        'categories': page_counts,
+        'files': dict(sorted(writer.files.items())),
+    }
+    writer.write('manifest.json', manifest)
+    return manifest
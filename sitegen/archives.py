@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Archive index of the static build (and of the Flask archive routes).
+
+Archived articles are sorted once, newest first, then dealt in a single pass
+into ``category -> month -> [articles]`` buckets that stay sorted. Pages are
+small: the archive home and each category page only show month counts, and
+articles are listed on one page per category and month
+(``/archives/<category>/<YYYY-MM>/``), so page size and build cost follow
+one month of one category rather than the whole history.
+
+The split between recent and archived articles, and the topic page size,
+live here too: the Flask app shares them without importing the build.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List
+
+from scraper.dates import normalize_dates, utcnow
+
+UNKNOWN_MONTH = 'unknown'
+RECENT_DAYS = 7  # Au-delà, un article passe dans les archives
+TOPIC_PAGE_SIZE = 60  # Articles les plus récents affichés par page thème
+
+
+def separate_articles_by_date(articles, timestamps=None):
+    """Sépare les articles en récents (< 7 jours) et archives (>= 7 jours)"""
+    if timestamps is None:
+        timestamps = normalize_dates(articles)
+    seven_days_ago = utcnow() - timedelta(days=RECENT_DAYS)
+
+    recent_articles = []
+    archived_articles = []
+
+    for article, published in zip(articles, timestamps):
+        if published is None or published >= seven_days_ago:
+            recent_articles.append(article)
+        else:
+            archived_articles.append(article)
+
+    return recent_articles, archived_articles
+
+
+def category_key(category: str) -> str:
+    """URL segment of a category"""
+    return category.lower().replace(' ', '-')
+
+
+def month_label(month_key: str) -> str:
+    if month_key == UNKNOWN_MONTH:
+        return 'Unknown Date'
+    return datetime.strptime(month_key, '%Y-%m').strftime('%B %Y')  # Format: October 2024
+
+
+class ArchiveIndex:
+    """category -> month -> article references, built in one pass"""
+
+    def __init__(self, articles: Iterable):
+        self.categories = {}
+        labels = {}
+        # Un seul tri global : chaque seau reçoit ensuite ses articles déjà dans l'ordre
+        ordered = sorted(articles, key=lambda a: a.get('published_at') or '', reverse=True)
+        for article in ordered:
+            published_at = article.get('published_at') or ''
+            # 'published_at' est canonique (YYYY-MM-DDTHH:MM:SSZ) : le mois est un simple préfixe
+            month_key = published_at[:7] or UNKNOWN_MONTH
+            if month_key not in labels:
+                labels[month_key] = month_label(month_key)
+            months = self.categories.setdefault(article.get('category', 'general'), {})
+            bucket = months.get(month_key)
+            if bucket is None:
+                bucket = months[month_key] = {'key': month_key, 'label': labels[month_key], 'articles': []}
+            bucket['articles'].append(article)
+        self.count = len(ordered)
+
+    def __len__(self):
+        return self.count
+
+    def summary(self) -> Dict[str, Dict]:
+        """
+        Counts only, for the index pages:
+        ``{category: {'count': n, 'months': [{'key', 'label', 'count'}, ...]}}``,
+        categories sorted by name and months newest first.
+        """
+        summary = {}
+        for category in sorted(self.categories):
+            months = [
+                {'key': bucket['key'], 'label': bucket['label'], 'count': len(bucket['articles'])}
+                for bucket in self.categories[category].values()
+            ]
+            summary[category] = {'count': sum(m['count'] for m in months), 'months': months}
+        return summary
+
+    def find_category(self, key: str):
+        """Category name from its URL segment, or None"""
+        for category in self.categories:
+            if category_key(category) == key:
+                return category
+        return None
+
+    def month(self, category: str, month_key: str):
+        """``{'key', 'label', 'articles'}`` bucket, or None"""
+        return self.categories.get(category, {}).get(month_key)
+
+    def pages(self) -> List:
+        """``(category, bucket)`` for every month page"""
+        return [
+            (category, bucket)
+            for category, months in self.categories.items()
+            for bucket in months.values()
+        ]
@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+"""
+Asset pipeline of the static build: bundles, minification, critical CSS.
+
+Pages are rendered with two markers (``<!-- assets:css <type> -->`` and
+``<!-- assets:js <type> <language> -->``) instead of the stylesheet and
+script tags. Once every page is written, ``AssetPipeline.finalize()``:
+
+1. groups pages by type (home, article, archives, topics, sources);
+2. builds one JS bundle per type and language: the strings of that language
+   only, precompiled into ``window.I18N_TRANSLATIONS``, followed by the
+   scripts the type needs, minified;
+3. prunes ``style.css`` per type, keeping only rules whose classes and ids
+   appear in the generated HTML or in the page scripts, and minifies it;
+4. inlines the critical CSS (rules that apply to the top of the page,
+   ``FOLD_BYTES`` of body markup) and loads the rest without blocking render;
+5. writes the tags after each marker, up to ``<!-- /assets -->``.
+
+The markers stay in the output, so a page kept from the previous build
+(incremental builds, ``sitegen.incremental``) gives back its rendered markup
+and takes part in the next ``finalize()`` like a new one; only the pages
+whose final markup changed are rewritten.
+
+Bundles are written under ``static/bundles/`` with a content hash in their
+name, so they can be cached forever. The minifiers are deliberately
+conservative (comments and whitespace only), with no external dependency.
+"""
+
+import hashlib
+import json
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sitegen.incremental import write_text_atomic
+
+# Template rendu -> type de page (un bundle par type)
+PAGE_TYPES = {
+    'index.html': 'home',
+    'article.html': 'article',
+    'archives.html': 'archives',
+    'topics.html': 'topics',
+    'sources.html': 'sources',
+}
+_BASE_SCRIPTS = ['i18n.js', 'search.js']
+SCRIPTS = {
+    'home': _BASE_SCRIPTS + ['filters.js', 'badge-styler.js'],
+    'archives': _BASE_SCRIPTS + ['filters.js', 'badge-styler.js'],
+    'topics': _BASE_SCRIPTS + ['filters.js', 'badge-styler.js'],
+    'article': _BASE_SCRIPTS + ['badge-styler.js'],
+    'sources': _BASE_SCRIPTS + ['badge-styler.js'],
+}
+STYLESHEET = 'style.css'
+FOLD_BYTES = 14 * 1024      # Début du <body> considéré au-dessus de la ligne de flottaison
+# Classes posées par le script de thème avant le premier affichage
+CRITICAL_STATE_CLASSES = {'dark-mode'}
+
+MARKER = re.compile(r'<!-- assets:(css|js) ([\w-]+)(?: ([\w-]+))? -->')
+MARKER_END = '<!-- /assets -->'
+# Marqueur suivi des balises d'un build précédent : retiré pour retrouver la page rendue
+_ASSET_BLOCK = re.compile(r'(<!-- assets:(?:css|js) [\w-]+(?: [\w-]+)? -->).*?' + re.escape(MARKER_END), re.S)
+_CLASS_ATTR = re.compile(r'class="([^"]*)"')
+_ID_ATTR = re.compile(r'id="([^"]*)"')
+_INLINE_SCRIPT = re.compile(r'<script>(.*?)</script>', re.S)
+_JS_STRING = re.compile(r"'(?:\\.|[^'\\\n])*'|\"(?:\\.|[^\"\\\n])*\"|`(?:\\.|[^`\\])*`")
+_NAME = re.compile(r'-?[A-Za-z_][\w-]*')
+_SELECTOR_NAMES = re.compile(r'([.#])(-?[A-Za-z_][\w-]*)')
+_PARENS = re.compile(r'\([^()]*\)')
+_CSS_STRING = re.compile(r"'(?:\\.|[^'\\])*'|\"(?:\\.|[^\"\\])*\"")
+
+
+# --- Minification ---
+
+def minify_css(css: str) -> str:
+    """Minify a stylesheet (comments and whitespace; strings kept as is)"""
+    return ''.join(_serialize(rule) for rule in parse_css(css))
+
+
+def _strip_js_comments(source: str) -> Iterable[Tuple[str, str]]:
+    """Split a script into ``(kind, text)`` tokens ('code', 'string', 'regex'), comments removed"""
+    i, n = 0, len(source)
+    code = []
+    last = ''  # Dernier caractère significatif, pour distinguer regex et division
+    while i < n:
+        ch = source[i]
+        if ch in '\'"`':
+            if code:
+                yield 'code', ''.join(code)
+                code = []
+            j = i + 1
+            while j < n and source[j] != ch:
+                j += 2 if source[j] == '\\' else 1
+            yield 'string', source[i:j + 1]
+            i = j + 1
+            last = ch
+        elif source.startswith('//', i):
+            while i < n and source[i] != '\n':
+                i += 1
+        elif source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            end = n if end == -1 else end + 2
+            if '\n' in source[i:end]:
+                code.append('\n')
+            i = end
+        elif ch == '/' and (not last or last in '(,=:[!&|?{};+-*%<>~^'):
+            if code:
+                yield 'code', ''.join(code)
+                code = []
+            j, in_class = i + 1, False
+            while j < n and (in_class or source[j] != '/'):
+                if source[j] == '\\':
+                    j += 1
+                elif source[j] == '[':
+                    in_class = True
+                elif source[j] == ']':
+                    in_class = False
+                j += 1
+            j += 1
+            while j < n and (source[j].isalnum()):
+                j += 1  # Drapeaux (g, i, m...)
+            yield 'regex', source[i:j]
+            i = j
+            last = 'a'
+        else:
+            code.append(ch)
+            if not ch.isspace():
+                last = ch
+            i += 1
+    if code:
+        yield 'code', ''.join(code)
+
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum() or ch in '_$\\'
+
+
+def minify_js(source: str) -> str:
+    """
+    Minify a script: comments, indentation and blank lines are removed and
+    spaces are kept only where needed. Line breaks are kept, so automatic
+    semicolon insertion behaves exactly as in the source.
+    """
+    tokens = list(_strip_js_comments(source))
+    out = []
+    for position, (kind, text) in enumerate(tokens):
+        if kind != 'code':
+            out.append(text)
+            continue
+        following = tokens[position + 1][1][:1] if position + 1 < len(tokens) else ''
+        i = 0
+        while i < len(text):
+            ch = text[i]
+            if ch == '\n' or not ch.isspace():
+                out.append(ch)
+                i += 1
+                continue
+            j = i
+            while j < len(text) and text[j].isspace() and text[j] != '\n':
+                j += 1
+            nxt = text[j] if j < len(text) else following
+            prev = out[-1][-1] if out and out[-1] else ''
+            # Espace conservé entre deux mots (ou chaînes) et dans "+ +" / "- -"
+            if (_is_word(prev) or prev in '\'"`') and (_is_word(nxt) or nxt in '\'"`'):
+                out.append(' ')
+            elif prev and prev == nxt and prev in '+-':
+                out.append(' ')
+            i = j
+    lines = (line.strip() for line in ''.join(out).split('\n'))
+    return '\n'.join(line for line in lines if line) + '\n'
+
+
+# --- CSS : analyse, élagage, CSS critique ---
+
+def parse_css(css: str) -> List:
+    """
+    Parse a stylesheet into nodes: ``('rule', selectors, declarations)``,
+    ``('block', at_prelude, children)`` for @media/@supports and
+    ``('raw', text)`` for other at-rules (@keyframes, @font-face, @import...)
+    """
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    nodes, _ = _parse_block(css, 0)
+    return nodes
+
+
+def _scan_to(css: str, i: int, stops: str) -> int:
+    """Index of the next character of ``stops`` outside strings and parentheses"""
+    depth = 0
+    while i < len(css):
+        ch = css[i]
+        if ch in '\'"':
+            end = css.find(ch, i + 1)
+            i = len(css) if end == -1 else end + 1
+            continue
+        if ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif depth <= 0 and ch in stops:
+            return i
+        i += 1
+    return i
+
+
+def _matching_brace(css: str, i: int) -> int:
+    depth = 0
+    while i < len(css):
+        i = _scan_to(css, i, '{}')
+        if i >= len(css):
+            return i
+        depth += 1 if css[i] == '{' else -1
+        if depth == 0:
+            return i
+        i += 1
+    return i
+
+
+def _collapse(text: str) -> str:
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def _parse_block(css: str, i: int):
+    nodes = []
+    while True:
+        while i < len(css) and css[i].isspace():
+            i += 1
+        if i >= len(css) or css[i] == '}':
+            return nodes, i + 1
+        stop = _scan_to(css, i, '{;}')
+        prelude = _collapse(css[i:stop])
+        if stop >= len(css) or css[stop] in ';}':
+            # Instruction sans bloc (@import, @charset...)
+            if prelude:
+                nodes.append(('raw', prelude + ';'))
+            i = stop + 1 if stop < len(css) and css[stop] == ';' else stop
+            continue
+        if prelude.startswith('@media') or prelude.startswith('@supports'):
+            children, i = _parse_block(css, stop + 1)
+            nodes.append(('block', prelude, children))
+        elif prelude.startswith('@'):
+            end = _matching_brace(css, stop)
+            body = _minify_raw_body(css[stop + 1:end])
+            nodes.append(('raw', f"{prelude}{{{body}}}"))
+            i = end + 1
+        else:
+            end = _scan_to(css, stop + 1, '}')
+            selectors = [_minify_selector(s) for s in prelude.split(',') if s.strip()]
+            nodes.append(('rule', selectors, _minify_declarations(css[stop + 1:end])))
+            i = end + 1
+
+
+def _minify_selector(selector: str) -> str:
+    selector = _collapse(selector)
+    return re.sub(r'\s*([>+~])\s*', r'\1', selector)
+
+
+def _minify_value(value: str) -> str:
+    """Collapse whitespace and the spaces around commas, outside strings"""
+    parts = []
+    position = 0
+    for match in _CSS_STRING.finditer(value):
+        parts.append(re.sub(r'\s*,\s*', ',', re.sub(r'\s+', ' ', value[position:match.start()])))
+        parts.append(match.group())
+        position = match.end()
+    parts.append(re.sub(r'\s*,\s*', ',', re.sub(r'\s+', ' ', value[position:])))
+    return ''.join(parts).strip()
+
+
+def _minify_declarations(body: str) -> str:
+    declarations = []
+    i = 0
+    while i < len(body):
+        # ';' et ':' dans une chaîne ou un url(data:…;base64,…) ne séparent rien
+        end = _scan_to(body, i, ';')
+        declaration = body[i:end]
+        i = end + 1
+        colon = _scan_to(declaration, 0, ':')
+        if colon >= len(declaration):
+            continue
+        value = _minify_value(declaration[colon + 1:]).replace(' !important', '!important')
+        declarations.append(f"{declaration[:colon].strip()}:{value}")
+    return ';'.join(declarations)
+
+
+def _minify_raw_body(body: str) -> str:
+    """Body of a raw at-rule (keyframes: nested ``selector{declarations}``)"""
+    if '{' not in body:
+        return _minify_declarations(body)
+    nodes, _ = _parse_block(body, 0)
+    return ''.join(_serialize(node) for node in nodes)
+
+
+def _serialize(node) -> str:
+    if node[0] == 'rule':
+        return f"{','.join(node[1])}{{{node[2]}}}" if node[2] else ''
+    if node[0] == 'block':
+        inner = ''.join(_serialize(child) for child in node[2])
+        return f"{node[1]}{{{inner}}}" if inner else ''
+    return node[1]
+
+
+def selector_names(selector: str) -> Set[str]:
+    """Classes and ids a selector requires (the content of ``:not(...)`` is ignored)"""
+    previous = None
+    while previous != selector:
+        previous, selector = selector, _PARENS.sub('', selector)
+    return {prefix + name for prefix, name in _SELECTOR_NAMES.findall(selector)}
+
+
+def prune(nodes: List, used: Set[str]) -> List:
+    """Keep the selectors whose classes and ids all belong to ``used``"""
+    kept = []
+    for node in nodes:
+        if node[0] == 'rule':
+            selectors = [s for s in node[1] if selector_names(s) <= used]
+            if selectors:
+                kept.append(('rule', selectors, node[2]))
+        elif node[0] == 'block':
+            children = prune(node[2], used)
+            if children:
+                kept.append(('block', node[1], children))
+        else:
+            kept.append(node)
+    return _drop_unused_keyframes(kept)
+
+
+def _drop_unused_keyframes(nodes: List) -> List:
+    text = ''.join(_serialize(node) for node in nodes if not _keyframes_name(node))
+    return [node for node in nodes if not _keyframes_name(node) or re.search(
+        r'\b' + re.escape(_keyframes_name(node)) + r'\b', text)]
+
+
+def _keyframes_name(node) -> Optional[str]:
+    if node[0] == 'raw':
+        match = re.match(r'@(?:-\w+-)?keyframes\s+([\w-]+)', node[1])
+        if match:
+            return match.group(1)
+    return None
+
+
+# --- Pages ---
+
+def html_names(documents: Iterable[str]) -> Set[str]:
+    """``.class`` and ``#id`` names used by a set of pages"""
+    class_values, ids = set(), set()
+    for html in documents:
+        class_values.update(_CLASS_ATTR.findall(html))
+        ids.update(_ID_ATTR.findall(html))
+    names = {'.' + name for value in class_values for name in value.split()}
+    names.update('#' + value.strip() for value in ids)
+    return names
+
+
+def script_names(script: str) -> Set[str]:
+    """Every identifier-like word of the strings of a script, as class and id"""
+    names = set()
+    for literal in _JS_STRING.findall(script):
+        for word in _NAME.findall(literal):
+            names.add('.' + word)
+            names.add('#' + word)
+    return names
+
+
+def above_the_fold(html: str) -> str:
+    start = html.find('<body')
+    return html[start:start + FOLD_BYTES] if start != -1 else html[:FOLD_BYTES]
+
+
+class AssetPipeline:
+    """Per page type bundles and critical CSS for the static build"""
+
+    def __init__(self, static_dir: str, translations_file: str, output_dir: str):
+        self.static_dir = static_dir
+        self.translations_file = translations_file
+        self.output_dir = output_dir
+        self.bundles_dir = os.path.join(output_dir, 'static', 'bundles')
+        self._minified = {}
+
+    def _write_bundle(self, extension: str, content: str) -> str:
+        """Write a bundle named by its content hash (types with the same bundle share it)"""
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:16]
+        name = f"{digest}.{extension}"
+        os.makedirs(self.bundles_dir, exist_ok=True)
+        with open(os.path.join(self.bundles_dir, name), 'w', encoding='utf-8') as f:
+            f.write(content)
+        return f"/static/bundles/{name}"
+
+    def build_script(self, page_type: str, language: str) -> str:
+        with open(self.translations_file, 'r', encoding='utf-8') as f:
+            strings = json.load(f).get(language, {})
+        translations = json.dumps({language: strings}, ensure_ascii=False, separators=(',', ':'))
+        parts = [f"window.I18N_TRANSLATIONS={translations};\n"]
+        for name in SCRIPTS[page_type]:
+            if name not in self._minified:
+                with open(os.path.join(self.static_dir, 'js', name), 'r', encoding='utf-8') as f:
+                    # ";" final : deux scripts concaténés ne peuvent pas fusionner leurs instructions
+                    self._minified[name] = minify_js(f.read()).rstrip('\n') + ';\n'
+            parts.append(self._minified[name])
+        return ''.join(parts)
+
+    def _pages(self) -> Dict[str, List[Tuple[str, str, str]]]:
+        """``{page type: [(path, rendered html, current html)]}`` of the pages holding asset markers"""
+        pages = {}
+        for directory, _, files in os.walk(self.output_dir):
+            for name in files:
+                if name.endswith('.html'):
+                    path = os.path.join(directory, name)
+                    with open(path, 'r', encoding='utf-8') as f:
+                        current = f.read()
+                    html = _ASSET_BLOCK.sub(r'\1', current)
+                    match = MARKER.search(html)
+                    if match:
+                        pages.setdefault(match.group(2), []).append((path, html, current))
+        return pages
+
+    def finalize(self) -> Dict[str, Dict[str, int]]:
+        """Write the bundles and rewrite the markers of every page; return sizes per type"""
+        with open(os.path.join(self.static_dir, 'css', STYLESHEET), 'r', encoding='utf-8') as f:
+            stylesheet = parse_css(f.read())
+
+        report = {}
+        inline_names = {}  # Scripts en ligne identiques d'une page à l'autre : analysés une fois
+        for page_type, pages in sorted(self._pages().items()):
+            # Un bundle JS par langue (ses seules chaînes), un CSS commun aux langues
+            languages = sorted({match.group(3) or '' for _, html, _ in pages
+                                for match in MARKER.finditer(html) if match.group(1) == 'js'})
+            scripts = {language: self.build_script(page_type, language) for language in languages}
+            used = html_names(html for _, html, _ in pages)
+            for script in scripts.values():
+                used |= script_names(script)
+            fold = html_names(above_the_fold(html) for _, html, _ in pages)
+            fold |= {'.' + name for name in CRITICAL_STATE_CLASSES}
+            for _, html, _ in pages:
+                for inline in _INLINE_SCRIPT.findall(html):
+                    if inline not in inline_names:
+                        inline_names[inline] = script_names(inline)
+                    used |= inline_names[inline]
+
+            css = ''.join(_serialize(node) for node in prune(stylesheet, used))
+            critical = ''.join(_serialize(node) for node in prune(stylesheet, fold))
+            css_url = self._write_bundle('css', css)
+            css_tag = (
+                f'<style>{critical}</style>\n'
+                f'    <link rel="preload" href="{css_url}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">\n'
+                f'    <noscript><link rel="stylesheet" href="{css_url}"></noscript>'
+            )
+            js_tags = {language: f'<script src="{self._write_bundle("js", script)}"></script>'
+                       for language, script in scripts.items()}
+            written = 0
+            for path, html, current in pages:
+                final = MARKER.sub(lambda m: m.group(0) + (css_tag if m.group(1) == 'css' else js_tags[m.group(3) or ''])
+                                   + MARKER_END, html)
+                # Page inchangée (build incrémental) : le fichier du build précédent est gardé tel quel
+                if final != current:
+                    write_text_atomic(path, final)
+                    written += 1
+            report[page_type] = {
+                'pages': len(pages),
+                'written': written,
+                'css_bytes': len(css.encode('utf-8')),
+                'critical_bytes': len(critical.encode('utf-8')),
+                'js_bytes': max((len(script.encode('utf-8')) for script in scripts.values()), default=0),
+            }
+        return report
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Digest-based delta deploys of the static build.
+
+Every build output file gets a SHA-1 digest (the digest used by Netlify's
+file digest API). Comparing two digest manifests gives the files added,
+changed and removed, and each deploy mode only ships that delta:
+
+- ``git``: syncs ``public/`` into the committed ``docs/`` tree, copying and
+  staging only the files whose digest changed, then commits (and pushes);
+- ``api``: Netlify-style digest deploy: the whole manifest is posted, the
+  host answers with the digests it does not have yet, and only those files
+  are uploaded;
+- ``stub``: a local server implementing that upload API, to exercise the
+  ``api`` mode without a hosting account. ``check`` runs two ``api``
+  deploys against it and fails unless the second one uploads nothing.
+
+The build records its manifest in ``data/deploy_manifest.json`` and reports
+the delta against the previous build::
+
+    python3 -m sitegen.deploy diff
+    python3 -m sitegen.deploy git --push
+    python3 -m sitegen.deploy stub --port 8787 &
+    python3 -m sitegen.deploy api --api-url http://localhost:8787/api/v1 --site local
+    python3 -m sitegen.deploy check
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import quote, unquote
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUTPUT_DIR = os.path.join(ROOT_DIR, 'public')
+GIT_TARGET_DIR = os.path.join(ROOT_DIR, 'docs')  # Arborescence publiée, versionnée dans le dépôt
+MANIFEST_FILE = os.path.join(ROOT_DIR, 'data', 'deploy_manifest.json')
+STUB_STORE_DIR = os.path.join(ROOT_DIR, 'data', 'deploy_stub')
+DEFAULT_API_URL = 'https://api.netlify.com/api/v1'
+CHUNK_SIZE = 1 << 16
+
+
+def file_digest(path: str) -> str:
+    hasher = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def tree_manifest(root: str) -> Dict[str, str]:
+    """``{relative posix path: sha1}`` of every file under ``root`` (empty if missing)"""
+    manifest = {}
+    if not os.path.isdir(root):
+        return manifest
+    for directory, _, files in os.walk(root):
+        for name in files:
+            path = os.path.join(directory, name)
+            manifest[os.path.relpath(path, root).replace(os.sep, '/')] = file_digest(path)
+    return dict(sorted(manifest.items()))
+
+
+class Delta:
+    """Files added, changed and removed between two manifests"""
+
+    def __init__(self, old: Dict[str, str], new: Dict[str, str]):
+        self.added = sorted(path for path in new if path not in old)
+        self.changed = sorted(path for path in new if path in old and old[path] != new[path])
+        self.removed = sorted(path for path in old if path not in new)
+        self.unchanged = len(new) - len(self.added) - len(self.changed)
+
+    def __bool__(self):
+        return bool(self.added or self.changed or self.removed)
+
+    def paths(self) -> List[str]:
+        return self.added + self.changed + self.removed
+
+    def summary(self) -> str:
+        return (f"+{len(self.added)} ajoutés, ~{len(self.changed)} modifiés, "
+                f"-{len(self.removed)} supprimés, {self.unchanged} inchangés")
+
+
+def load_manifest(path: str = MANIFEST_FILE) -> Dict[str, str]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('files', {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest: Dict[str, str], path: str = MANIFEST_FILE) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'algorithm': 'sha1', 'files': manifest}, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def record_build(output_dir: str = OUTPUT_DIR, manifest_file: str = MANIFEST_FILE) -> Delta:
+    """Digest the build output, save its manifest and return the delta against the previous build"""
+    manifest = tree_manifest(output_dir)
+    delta = Delta(load_manifest(manifest_file), manifest)
+    save_manifest(manifest, manifest_file)
+    return delta
+
+
+# --- Mode git : seul le delta est copié, indexé et commité ---
+
+def sync_tree(source: str, target: str, delta: Delta) -> None:
+    """Apply ``delta`` (computed from ``source`` against ``target``) to ``target``"""
+    for path in delta.added + delta.changed:
+        destination = os.path.join(target, *path.split('/'))
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        shutil.copy2(os.path.join(source, *path.split('/')), destination)
+    for path in delta.removed:
+        os.remove(os.path.join(target, *path.split('/')))
+    # Dossiers vidés par les suppressions
+    for directory, _, _ in sorted(os.walk(target), key=lambda entry: len(entry[0]), reverse=True):
+        if directory != target and not os.listdir(directory):
+            os.rmdir(directory)
+
+
+def _git(args: List[str], repo: str, stdin: Optional[str] = None, check: bool = True):
+    return subprocess.run(['git'] + args, cwd=repo, input=stdin, text=True, check=check, capture_output=True)
+
+
+def git_deploy(source: str = OUTPUT_DIR, target: str = GIT_TARGET_DIR, extra_paths: Iterable[str] = (),
+               message: str = "Update news and regenerate site", push: bool = False,
+               repo: str = ROOT_DIR) -> Delta:
+    """Sync ``source`` into ``target`` and commit only the files that changed"""
+    delta = Delta(tree_manifest(target), tree_manifest(source))
+    sync_tree(source, target, delta)
+
+    prefix = os.path.relpath(target, repo).replace(os.sep, '/')
+    pathspecs = [f"{prefix}/{path}" for path in delta.paths()]
+    pathspecs += [os.path.relpath(os.path.join(repo, path), repo).replace(os.sep, '/') for path in extra_paths]
+    if pathspecs:
+        # Liste des chemins via stdin : pas de limite de longueur de ligne de commande
+        _git(['add', '--all', '--pathspec-from-file=-'], repo, stdin='\n'.join(pathspecs) + '\n')
+    if _git(['diff', '--cached', '--quiet'], repo, check=False).returncode == 0:
+        return delta
+    _git(['commit', '-m', f"{message}\n\n{delta.summary()}"], repo)
+    if push:
+        _git(['push'], repo)
+    return delta
+
+
+# --- Mode API : déploiement par empreintes, façon Netlify ---
+
+class DigestDeployClient:
+    """Client of a Netlify-style file digest deploy API"""
+
+    def __init__(self, api_url: str, site_id: str, token: Optional[str] = None, session=None):
+        import requests
+
+        self.api_url = api_url.rstrip('/')
+        self.site_id = site_id
+        self.session = session or requests.Session()
+        if token:
+            self.session.headers['Authorization'] = f"Bearer {token}"
+
+    def deploy(self, source: str = OUTPUT_DIR, manifest: Optional[Dict[str, str]] = None) -> Dict:
+        """Post the manifest, upload the files the host asks for; return the deploy and uploaded paths"""
+        manifest = manifest if manifest is not None else tree_manifest(source)
+        response = self.session.post(
+            f"{self.api_url}/sites/{self.site_id}/deploys",
+            json={'files': {f"/{path}": digest for path, digest in manifest.items()}},
+            timeout=60,
+        )
+        response.raise_for_status()
+        deploy = response.json()
+        required = set(deploy.get('required', []))
+
+        uploaded = []
+        for path, digest in manifest.items():
+            if digest not in required:
+                continue
+            required.discard(digest)  # Fichiers identiques : un seul envoi par empreinte
+            with open(os.path.join(source, *path.split('/')), 'rb') as f:
+                upload = self.session.put(
+                    f"{self.api_url}/deploys/{deploy['id']}/files/{quote(path)}",
+                    data=f, headers={'Content-Type': 'application/octet-stream'}, timeout=120,
+                )
+            upload.raise_for_status()
+            uploaded.append(path)
+        return {'deploy': deploy, 'uploaded': uploaded}
+
+
+class DigestApiStub:
+    """
+    Local stand-in for the hosting upload API. Blobs are stored by digest,
+    so a digest uploaded by any previous deploy is never required again.
+    """
+
+    def __init__(self, store_dir: str = STUB_STORE_DIR):
+        self.store_dir = store_dir
+        self.blobs_dir = os.path.join(store_dir, 'blobs')
+        os.makedirs(self.blobs_dir, exist_ok=True)
+        self.deploys = {}
+        self.lock = threading.Lock()
+
+    def has_blob(self, digest: str) -> bool:
+        return os.path.exists(os.path.join(self.blobs_dir, digest))
+
+    def create_deploy(self, site_id: str, files: Dict[str, str]) -> Dict:
+        with self.lock:
+            deploy_id = f"{site_id}-{len(self.deploys) + 1}"
+            required = sorted({digest for digest in files.values() if not self.has_blob(digest)})
+            self.deploys[deploy_id] = {'id': deploy_id, 'site_id': site_id, 'files': files, 'required': required}
+            self._finish_if_ready(deploy_id)
+            return dict(self.deploys[deploy_id])
+
+    def upload(self, deploy_id: str, path: str, content: bytes) -> Dict:
+        with self.lock:
+            deploy = self.deploys[deploy_id]
+            digest = hashlib.sha1(content).hexdigest()
+            if deploy['files'].get(f"/{path}") != digest:
+                raise ValueError(f"empreinte inattendue pour /{path}")
+            with open(os.path.join(self.blobs_dir, digest), 'wb') as f:
+                f.write(content)
+            deploy['required'] = [d for d in deploy['required'] if d != digest]
+            self._finish_if_ready(deploy_id)
+            return {'id': deploy_id, 'path': f"/{path}", 'sha': digest}
+
+    def _finish_if_ready(self, deploy_id: str) -> None:
+        deploy = self.deploys[deploy_id]
+        deploy['state'] = 'uploading' if deploy['required'] else 'ready'
+        if not deploy['required']:
+            # Le site publié devient ce déploiement (manifeste conservé sur disque)
+            with open(os.path.join(self.store_dir, f"{deploy['site_id']}.json"), 'w', encoding='utf-8') as f:
+                json.dump(deploy['files'], f, separators=(',', ':'))
+
+    def serve(self, port: int = 8787, host: str = '127.0.0.1'):
+        """Serve the API on a background thread; return the HTTP server"""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, status: int, payload: Dict):
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _body(self) -> bytes:
+                return self.rfile.read(int(self.headers.get('Content-Length') or 0))
+
+            def do_POST(self):
+                parts = self.path.strip('/').split('/')
+                if parts[-1:] != ['deploys'] or len(parts) < 3 or parts[-3] != 'sites':
+                    return self._reply(404, {'error': 'not found'})
+                files = json.loads(self._body() or b'{}').get('files', {})
+                self._reply(200, stub.create_deploy(parts[-2], files))
+
+            def do_PUT(self):
+                head, _, path = self.path.partition('/files/')
+                path = unquote(path)
+                deploy_id = head.rstrip('/').split('/')[-1]
+                if not path or deploy_id not in stub.deploys:
+                    return self._reply(404, {'error': 'not found'})
+                try:
+                    self._reply(200, stub.upload(deploy_id, path, self._body()))
+                except ValueError as e:
+                    self._reply(422, {'error': str(e)})
+
+            def do_GET(self):
+                deploy_id = self.path.rstrip('/').split('/')[-1]
+                if deploy_id not in stub.deploys:
+                    return self._reply(404, {'error': 'not found'})
+                deploy = stub.deploys[deploy_id]
+                self._reply(200, {key: deploy[key] for key in ('id', 'state', 'required')})
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+# Arborescence d'exemple de la vérification : noms à échapper dans l'URL, fichiers identiques
+SAMPLE_TREE = {
+    'index.html': '<!DOCTYPE html><title>IA News</title>',
+    'fr/article/l’ia en #1 ?.html': '<!DOCTYPE html><title>Article</title>',
+    'static/css/style.css': 'body{margin:0}',
+    'static/css/copy.css': 'body{margin:0}',
+}
+
+
+def check_stub(source: Optional[str] = None) -> List[str]:
+    """
+    Deploy ``source`` (default: ``SAMPLE_TREE``) twice to a local stub on a free port:
+    the first deploy uploads each digest once, the second uploads nothing. Returns the problems found.
+    """
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as workdir:
+        if source is None:
+            source = os.path.join(workdir, 'site')
+            for path, content in SAMPLE_TREE.items():
+                destination = os.path.join(source, *path.split('/'))
+                os.makedirs(os.path.dirname(destination), exist_ok=True)
+                with open(destination, 'w', encoding='utf-8') as f:
+                    f.write(content)
+        manifest = tree_manifest(source)
+        stub = DigestApiStub(os.path.join(workdir, 'stub'))
+        server = stub.serve(port=0)
+        try:
+            client = DigestDeployClient(f"http://127.0.0.1:{server.server_port}/api/v1", 'check')
+            results = [client.deploy(source, manifest) for _ in range(2)]
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    problems = []
+    expected = len(set(manifest.values()))
+    for number, result in enumerate(results, 1):
+        uploaded = len(result['uploaded'])
+        print(f"🚚 Déploiement {number} : {uploaded} fichiers envoyés sur {len(manifest)}")
+        if stub.deploys[result['deploy']['id']]['state'] != 'ready':
+            problems.append(f"déploiement {number} incomplet : {stub.deploys[result['deploy']['id']]['required']}")
+    if len(results[0]['uploaded']) != expected:
+        problems.append(f"premier déploiement : {len(results[0]['uploaded'])} fichiers envoyés, {expected} attendus")
+    if results[1]['uploaded']:
+        problems.append(f"second déploiement : {len(results[1]['uploaded'])} fichiers renvoyés "
+                        f"({', '.join(results[1]['uploaded'][:5])})")
+    return problems
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Déploiements incrémentaux du site statique (empreintes SHA-1)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    diff_parser = subparsers.add_parser('diff', help="Delta entre le build et la cible (ou le dernier build)")
+    diff_parser.add_argument('--source', default=OUTPUT_DIR)
+    diff_parser.add_argument('--target', default=None, help="Dossier à comparer (défaut : manifeste du dernier build)")
+
+    git_parser = subparsers.add_parser('git', help="Synchroniser public/ dans docs/ et commiter le delta")
+    git_parser.add_argument('--source', default=OUTPUT_DIR)
+    git_parser.add_argument('--target', default=GIT_TARGET_DIR)
+    git_parser.add_argument('--include', action='append', default=[], help="Autre fichier à commiter (répétable)")
+    git_parser.add_argument('--message', default="Update news and regenerate site")
+    git_parser.add_argument('--push', action='store_true')
+
+    api_parser = subparsers.add_parser('api', help="Déploiement par empreintes (API type Netlify)")
+    api_parser.add_argument('--source', default=OUTPUT_DIR)
+    api_parser.add_argument('--api-url', default=os.environ.get('DEPLOY_API_URL', DEFAULT_API_URL))
+    api_parser.add_argument('--site', default=os.environ.get('NETLIFY_SITE_ID'))
+    api_parser.add_argument('--token', default=os.environ.get('NETLIFY_AUTH_TOKEN'))
+
+    stub_parser = subparsers.add_parser('stub', help="Serveur local imitant l'API d'upload")
+    stub_parser.add_argument('--port', type=int, default=8787)
+    stub_parser.add_argument('--store', default=STUB_STORE_DIR)
+
+    check_parser = subparsers.add_parser('check', help="Deux déploiements sur l'API locale : le second n'envoie rien")
+    check_parser.add_argument('--source', default=None, help="Dossier à déployer (défaut : arborescence d'exemple)")
+    args = parser.parse_args(argv)
+
+    if args.command == 'diff':
+        old = tree_manifest(args.target) if args.target else load_manifest()
+        delta = Delta(old, tree_manifest(args.source))
+        for label, paths in (('+', delta.added), ('~', delta.changed), ('-', delta.removed)):
+            for path in paths:
+                print(f"{label} {path}")
+        print(delta.summary())
+    elif args.command == 'git':
+        delta = git_deploy(args.source, args.target, args.include, args.message, args.push)
+        print(f"🚚 Git : {delta.summary()}" if delta else "✅ Aucun changement à déployer")
+    elif args.command == 'api':
+        if not args.site:
+            parser.error("--site (ou NETLIFY_SITE_ID) est requis")
+        result = DigestDeployClient(args.api_url, args.site, args.token).deploy(args.source)
+        print(f"🚚 Déploiement {result['deploy']['id']} : {len(result['uploaded'])} fichiers envoyés")
+    elif args.command == 'check':
+        problems = check_stub(args.source)
+        for problem in problems:
+            print(f"❌ {problem}")
+        if not problems:
+            print("✅ Second déploiement sans envoi")
+        return 1 if problems else 0
+    else:
+        server = DigestApiStub(args.store).serve(args.port)
+        print(f"🧪 API de déploiement locale sur http://127.0.0.1:{args.port}/api/v1 (Ctrl+C pour arrêter)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Rendered fragment cache shared by the static build and the Flask app.
+
+Article cards, archive list items and related-article cards are rendered
+from small partial templates (``_card.html``, ``_archive_item.html``,
+``_related_card.html``). Each fragment is rendered once per article content
+and template version, then spliced into listing pages as a string:
+listing renders become mostly string joins.
+
+The cache key is the hash of the article fields, of the partial template and
+of every template it imports, plus a salt for the rendering context (static
+vs Flask URLs, placeholder image) and the page language (each language tree
+has its own fragments). The static build persists the cache
+between builds; the Flask app keeps it in memory. When the environment
+auto-reloads templates (Flask debug, the daemon's long-lived environment),
+template versions are recomputed as soon as a partial changes on disk.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, Optional
+
+from jinja2 import meta, pass_context
+from markupsafe import Markup
+
+from scraper import profiling
+
+FRAGMENTS = {
+    'card': '_card.html',
+    'archive_item': '_archive_item.html',
+    'related_card': '_related_card.html',
+}
+MAX_MEMORY_ENTRIES = 20000  # Borne du cache en mémoire (serveur Flask)
+
+
+def article_digest(article) -> str:
+    """Hash of every field of an article (dict or Article)"""
+    data = article.to_dict() if hasattr(article, 'to_dict') else article
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class FragmentCache:
+    """Render-once cache of per-article fragments for one Jinja environment"""
+
+    def __init__(self, env, cache_file: Optional[str] = None, salt: str = ''):
+        self.env = env
+        self.cache_file = cache_file
+        self.salt = salt
+        self.entries = self._load()
+        self.used = set()
+        self.hits = 0
+        self.misses = 0
+        self._versions = {}  # Template -> (empreinte, fonctions « à jour ? » du loader)
+
+    def _load(self) -> Dict[str, str]:
+        if self.cache_file and os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                return {}
+        return {}
+
+    def save(self):
+        """Persist the fragments used by this build (the others are dropped)"""
+        if not self.cache_file:
+            return
+        os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+        kept = {key: self.entries[key] for key in self.used}
+        tmp_path = f"{self.cache_file}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(kept, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.cache_file)
+
+    def _template_sources(self, name: str, seen, checks) -> None:
+        if name in seen:
+            return
+        source, _, uptodate = self.env.loader.get_source(self.env, name)
+        seen[name] = source
+        if uptodate is not None:
+            checks.append(uptodate)
+        for child in meta.find_referenced_templates(self.env.parse(source)):
+            if child:
+                self._template_sources(child, seen, checks)
+
+    def version(self, name: str) -> str:
+        """Hash of a partial template, of the templates it imports and of the salt"""
+        cached = self._versions.get(name)
+        # Rechargement auto : un template modifié sur disque change la version (et donc les clés)
+        if cached is not None and self.env.auto_reload and not all(check() for check in cached[1]):
+            cached = None
+        if cached is None:
+            sources, checks = {}, []
+            self._template_sources(name, sources, checks)
+            hasher = hashlib.blake2b(self.salt.encode('utf-8'), digest_size=8)
+            for template_name in sorted(sources):
+                hasher.update(template_name.encode('utf-8'))
+                hasher.update(sources[template_name].encode('utf-8'))
+            cached = self._versions[name] = (hasher.hexdigest(), checks)
+        return cached[0]
+
+    def render(self, fragment: str, article, **options) -> Markup:
+        name = FRAGMENTS[fragment]
+        key = f"{fragment}:{self.version(name)}:{article_digest(article)}"
+        if options:
+            key += ':' + ','.join(f"{k}={v}" for k, v in sorted(options.items()))
+        html = self.entries.get(key)
+        if html is None:
+            self.misses += 1
+            with profiling.active().timed('fragments', name):
+                html = self.env.get_template(name).render(article=article, **options)
+            if not self.cache_file and len(self.entries) >= MAX_MEMORY_ENTRIES:
+                self.entries.clear()
+                self.used.clear()
+            self.entries[key] = html
+        else:
+            self.hits += 1
+        self.used.add(key)
+        return Markup(html)
+
+    def install(self):
+        """Expose ``render_card``, ``render_archive_item`` and ``render_related_card`` to templates"""
+        # La langue de la page appelante fait partie de la clé et du contexte du fragment
+        @pass_context
+        def render_card(context, article, variant='grid'):
+            return self.render('card', article, variant=variant, lang=context.get('lang'))
+
+        @pass_context
+        def render_archive_item(context, article):
+            return self.render('archive_item', article, lang=context.get('lang'))
+
+        @pass_context
+        def render_related_card(context, article):
+            return self.render('related_card', article, lang=context.get('lang'))
+
+        self.env.globals.update(
+            render_card=render_card,
+            render_archive_item=render_archive_item,
+            render_related_card=render_related_card,
+        )
+        return self
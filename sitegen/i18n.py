@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Per-language page trees shared by the static build and the Flask app.
+
+Every page exists once per language, under ``/fr/…`` and ``/en/…``, and
+links to its other versions with ``hreflang`` alternates. A page carries
+only its own language:
+
+- article text: ``localized(article, field)`` picks ``<field>_fr`` in the
+  French tree (the translation stored at scraping), the original field in
+  the English one;
+- interface strings: templates keep their ``data-i18n`` keys and English
+  fallback text; ``localize()`` fills them from ``translations.json`` when
+  the page is rendered, so nothing is swapped in the browser;
+- scripts: only the language's strings are inlined (or bundled), for the
+  few texts ``search.js`` builds at runtime.
+"""
+
+import html as html_lib
+import json
+import os
+import re
+from typing import Dict, Optional
+
+from markupsafe import escape
+
+LANGUAGES = ('fr', 'en')
+DEFAULT_LANGUAGE = 'fr'
+TRANSLATIONS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                 'website', 'i18n', 'translations.json')
+
+# Élément à texte traduit : <tag … data-i18n="clé" …>texte</tag> (sans balise imbriquée)
+_I18N_TEXT = re.compile(r'<(?P<tag>\w+)(?P<attrs>[^>]*?\sdata-i18n="(?P<key>[^"]+)"[^>]*)>[^<]*</(?P=tag)>')
+_I18N_PARAMS = re.compile(r"""\sdata-i18n-params='([^']*)'""")
+_I18N_PLACEHOLDER = re.compile(r'<(?:input|textarea)[^>]*\sdata-i18n-placeholder="(?P<key>[^"]+)"[^>]*>')
+_PLACEHOLDER_ATTR = re.compile(r'\splaceholder="[^"]*"')
+
+_cache: Dict[str, Dict] = {}
+
+
+def load_translations(path: str = TRANSLATIONS_FILE) -> Dict[str, Dict]:
+    """``{language: strings}``, read once per process"""
+    if path not in _cache:
+        with open(path, 'r', encoding='utf-8') as f:
+            _cache[path] = json.load(f)
+    return _cache[path]
+
+
+def lookup(strings: Dict, key: str, params: Optional[Dict] = None) -> Optional[str]:
+    """Nested key (``"nav.home"``) with ``{{name}}`` interpolation, as i18n.js does; None if missing"""
+    value = strings
+    for part in key.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    if not isinstance(value, str):
+        return None
+    for name, param in (params or {}).items():
+        value = value.replace('{{' + name + '}}', str(param))
+    return value
+
+
+def localize(page: str, strings: Dict) -> str:
+    """Fill the ``data-i18n`` texts and placeholders of a rendered page with one language's strings"""
+    def text(match):
+        params = _I18N_PARAMS.search(match.group('attrs'))
+        try:
+            values = json.loads(html_lib.unescape(params.group(1))) if params else None
+        except ValueError:
+            values = None
+        value = lookup(strings, html_lib.unescape(match.group('key')), values)
+        if value is None:
+            return match.group()
+        return f"<{match.group('tag')}{match.group('attrs')}>{escape(value)}</{match.group('tag')}>"
+
+    def placeholder(match):
+        value = lookup(strings, match.group('key'))
+        if value is None:
+            return match.group()
+        return _PLACEHOLDER_ATTR.sub(lambda _: f' placeholder="{escape(value)}"', match.group(), count=1)
+
+    return _I18N_PLACEHOLDER.sub(placeholder, _I18N_TEXT.sub(text, page))
+
+
+def localized(article, field: str, lang: Optional[str]) -> str:
+    """Text of an article field in the page language (original text if not translated)"""
+    if lang and lang != 'en':
+        translated = article.get(f'{field}_{lang}')
+        if translated:
+            return translated
+    return article.get(field) or ''
+
+
+def page_path(path: str) -> str:
+    """Path of a page inside its language tree: ``/fr/topics/x/`` -> ``/topics/x/``"""
+    parts = path.split('/', 2)
+    if len(parts) > 1 and parts[1] in LANGUAGES:
+        return '/' + (parts[2] if len(parts) > 2 else '')
+    return path
+
+
+def install_i18n(env) -> None:
+    """Expose the languages and ``localized`` to the templates of ``env``"""
+    env.globals.update(
+        languages=LANGUAGES,
+        default_language=DEFAULT_LANGUAGE,
+        localized=localized,
+    )
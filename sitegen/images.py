@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Optional image stage of the static build.
+
+Each article image is downloaded once into a content-addressed cache
+(``<sha256>`` of the bytes), then resized into WebP (and AVIF when Pillow
+supports it) thumbnails at card and article widths. Templates get local
+``srcset`` attributes instead of hotlinking multi-megabyte publisher images.
+
+Recent articles are revalidated concurrently with conditional requests
+(ETag / Last-Modified); archived ones are served from the cache without any
+network access. Pillow is optional: without it the stage is skipped.
+"""
+
+import hashlib
+import io
+import json
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+import requests
+
+try:
+    from PIL import Image, features
+except ImportError:  # Pillow est optionnel
+    Image = None
+    features = None
+
+# Largeurs générées par usage (srcset 1x / 2x)
+SIZES = {
+    'card': (400, 800),
+    'article': (800, 1600),
+}
+WEBP_QUALITY = 78
+AVIF_QUALITY = 55
+MAX_IMAGE_BYTES = 15 * 1024 * 1024
+USER_AGENT = 'Mozilla/5.0 (compatible; IANewsBuild/1.0)'
+
+
+def available() -> bool:
+    """True when Pillow with WebP support is installed"""
+    return Image is not None and features.check('webp')
+
+
+def _formats() -> List[str]:
+    formats = ['webp']
+    if features.check('avif'):
+        formats.insert(0, 'avif')
+    return formats
+
+
+class ImageCache:
+    """Content-addressed store of original images plus their thumbnails"""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self.originals_dir = os.path.join(cache_dir, 'originals')
+        self.thumbs_dir = os.path.join(cache_dir, 'thumbs')
+        self.index_file = os.path.join(cache_dir, 'index.json')
+        os.makedirs(self.originals_dir, exist_ok=True)
+        os.makedirs(self.thumbs_dir, exist_ok=True)
+        self.index = self._load_index()
+        self._lock = threading.Lock()
+        self._session = requests.Session()
+        self._session.headers['User-Agent'] = USER_AGENT
+
+    def _load_index(self) -> Dict:
+        if os.path.exists(self.index_file):
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                return {}
+        return {}
+
+    def save_index(self):
+        tmp_path = f"{self.index_file}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.index_file)
+
+    def original_path(self, digest: str) -> str:
+        return os.path.join(self.originals_dir, digest)
+
+    def fetch(self, url: str, revalidate: bool = True) -> Optional[str]:
+        """Return the digest of ``url``'s content, downloading it only if needed"""
+        entry = self.index.get(url) or {}
+        digest = entry.get('sha256')
+        cached = bool(digest) and os.path.exists(self.original_path(digest))
+        if cached and not revalidate:
+            return digest
+        if entry.get('failed') and not revalidate:
+            return None
+
+        headers = {}
+        if cached and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if cached and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+        try:
+            response = self._session.get(url, headers=headers, timeout=15, stream=True)
+            if response.status_code == 304 and cached:
+                return digest
+            if response.status_code != 200:
+                raise ValueError(f"HTTP {response.status_code}")
+            content = response.raw.read(MAX_IMAGE_BYTES + 1, decode_content=True)
+            if len(content) > MAX_IMAGE_BYTES:
+                raise ValueError("image trop volumineuse")
+        except Exception as e:
+            print(f"   ⚠️  Image ignorée ({str(e)[:60]}): {url[:80]}")
+            with self._lock:
+                self.index[url] = dict(entry, failed=True, checked_at=int(time.time()))
+            return digest if cached else None
+
+        digest = hashlib.sha256(content).hexdigest()
+        path = self.original_path(digest)
+        if not os.path.exists(path):
+            with open(f"{path}.tmp", 'wb') as f:
+                f.write(content)
+            os.replace(f"{path}.tmp", path)
+
+        with self._lock:
+            self.index[url] = {
+                'sha256': digest,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'checked_at': int(time.time()),
+            }
+        return digest
+
+    def thumbnails(self, digest: str, usage: str) -> Dict[str, List]:
+        """
+        Generate (once) the thumbnails of an original for one usage.
+        Returns ``{format: [(filename, width), ...]}`` with the real width of each file:
+        an original narrower than a target size is never enlarged, and gives one file
+        for all the sizes it does not reach.
+        """
+        with Image.open(self.original_path(digest)) as original:
+            original_width = original.width  # Lecture de l'en-tête seulement
+        widths = []
+        for width in SIZES[usage]:
+            # Jamais d'agrandissement : on plafonne à la largeur d'origine
+            target_width = min(width, original_width)
+            if target_width not in widths:
+                widths.append(target_width)
+
+        variants = {}
+        image = None
+        for fmt in _formats():
+            files = []
+            for target_width in widths:
+                filename = f"{digest[:32]}-{target_width}.{fmt}"
+                path = os.path.join(self.thumbs_dir, filename)
+                if not os.path.exists(path):
+                    if image is None:
+                        image = Image.open(self.original_path(digest))
+                        image.load()
+                        if image.mode not in ('RGB', 'RGBA'):
+                            image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+                    height = max(1, round(image.height * target_width / image.width))
+                    resized = image.resize((target_width, height), Image.LANCZOS)
+                    buffer = io.BytesIO()
+                    if fmt == 'avif':
+                        resized.save(buffer, 'AVIF', quality=AVIF_QUALITY)
+                    else:
+                        resized.save(buffer, 'WEBP', quality=WEBP_QUALITY, method=4)
+                    with open(f"{path}.tmp", 'wb') as f:
+                        f.write(buffer.getvalue())
+                    os.replace(f"{path}.tmp", path)
+                files.append((filename, target_width))
+            variants[fmt] = files
+        return variants
+
+
+def _srcset(files, url_prefix: str) -> str:
+    return ', '.join(f"{url_prefix}/{filename} {width}w" for filename, width in files)
+
+
+def _picture(variants, url_prefix: str) -> Dict:
+    """Template-ready description of a responsive image"""
+    sources = [
+        {'type': f"image/{fmt}", 'srcset': _srcset(files, url_prefix)}
+        for fmt, files in variants.items()
+    ]
+    fallback = variants['webp'][0][0]
+    return {'src': f"{url_prefix}/{fallback}", 'sources': sources}
+
+
+def process_images(articles: Iterable, recent_articles: Iterable, output_dir: str, cache_dir: str,
+                   default_image: Optional[str] = None, max_workers: int = 8) -> Dict:
+    """
+    Download, cache and resize article images, then attach
+    ``article['image_local'] = {'card': picture, 'article': picture}``.
+
+    Returns the pictures of ``default_image`` (or an empty dict), for use as
+    placeholder. Thumbnails used by this build are copied to
+    ``<output_dir>/static/images/cache``.
+    """
+    if not available():
+        print("⚠️  Pillow (avec WebP) n'est pas installé : étape images ignorée.")
+        return {}
+
+    cache = ImageCache(cache_dir)
+    url_prefix = '/static/images/cache'
+    output_images_dir = os.path.join(output_dir, 'static', 'images', 'cache')
+    os.makedirs(output_images_dir, exist_ok=True)
+
+    articles = [a for a in articles if a.get('image_url')]
+    recent_urls = {a.get('image_url') for a in recent_articles if a.get('image_url')}
+    urls = sorted({a['image_url'] for a in articles})
+
+    # Réseau : les images récentes sont revalidées en parallèle, les autres lues du cache
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        digests = dict(zip(urls, executor.map(lambda u: cache.fetch(u, revalidate=u in recent_urls), urls)))
+    cache.save_index()
+
+    used_files = set()
+
+    def pictures_for(digest):
+        pictures = {}
+        for usage in SIZES:
+            variants = cache.thumbnails(digest, usage)
+            pictures[usage] = _picture(variants, url_prefix)
+            used_files.update(filename for files in variants.values() for filename, _ in files)
+        return pictures
+
+    by_digest = {}
+    processed = 0
+    for article in articles:
+        digest = digests.get(article['image_url'])
+        if not digest:
+            continue
+        if digest not in by_digest:
+            try:
+                by_digest[digest] = pictures_for(digest)
+            except Exception as e:
+                print(f"   ⚠️  Miniature impossible ({str(e)[:60]}): {article['image_url'][:80]}")
+                by_digest[digest] = None
+        if by_digest[digest]:
+            article['image_local'] = by_digest[digest]
+            processed += 1
+
+    placeholder = {}
+    if default_image and os.path.exists(default_image):
+        with open(default_image, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        if not os.path.exists(cache.original_path(digest)):
+            shutil.copyfile(default_image, cache.original_path(digest))
+        placeholder = pictures_for(digest)
+
+    for filename in used_files:
+        shutil.copyfile(os.path.join(cache.thumbs_dir, filename), os.path.join(output_images_dir, filename))
+
+    print(f"🖼️  Images: {processed}/{len(articles)} articles, {len(urls)} URLs, "
+          f"{len(used_files)} miniatures en {time.time() - start:.1f}s")
+    return placeholder
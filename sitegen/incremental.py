@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Incremental static builds into a staging tree swapped in at the end.
+
+A build never writes into the published tree (``public/``):
+
+- ``stage()`` creates ``public.next`` and hard-links the pages of the
+  previous build into it (no copy, no rendering);
+- ``PageCache`` records, for every page, a digest of its inputs: page
+  template and the templates it uses, card partials, translations, language,
+  path and render context (articles by content digest). A page whose digest
+  did not change is kept as is; the others are rendered and written to a
+  new file (``os.replace``), so the hard-linked files of the live tree are
+  never modified in place. Pages the build no longer produces are pruned;
+- ``publish()`` swaps the staging tree with the published one in a single
+  ``renameat2(RENAME_EXCHANGE)`` where available (two renames otherwise),
+  so readers see either the whole previous build or the whole new one.
+
+The digests are saved in ``data/page_state.json`` once the new tree is
+published, and the previous state is deleted just before the swap: a build
+that fails leaves the published tree untouched, and one interrupted during
+the swap renders every page at the next build.
+"""
+
+import ctypes
+import hashlib
+import json
+import os
+import shutil
+from typing import Dict, Iterable
+
+from sitegen.fragments import FRAGMENTS, article_digest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGE_STATE_FILE = os.path.join(ROOT_DIR, 'data', 'page_state.json')
+STAGING_SUFFIX = '.next'
+
+_AT_FDCWD = -100
+_RENAME_EXCHANGE = 2
+
+
+def write_text_atomic(path: str, text: str) -> None:
+    """Write through a temporary file: a hard-linked previous version is replaced, not truncated"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def _link_or_copy(source: str, destination: str) -> None:
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+
+
+def stage(output_dir: str, keep: Iterable[str] = ()) -> str:
+    """Empty staging tree next to ``output_dir``, with the ``keep`` subtrees of the previous build linked in"""
+    staging = output_dir.rstrip(os.sep) + STAGING_SUFFIX
+    shutil.rmtree(staging, ignore_errors=True)  # Build précédent interrompu
+    os.makedirs(staging)
+    for name in keep:
+        previous = os.path.join(output_dir, name)
+        if os.path.isdir(previous):
+            shutil.copytree(previous, os.path.join(staging, name), copy_function=_link_or_copy)
+    return staging
+
+
+def _exchange(first: str, second: str) -> bool:
+    """Atomically swap two paths (Linux renameat2); False when unavailable"""
+    try:
+        renameat2 = ctypes.CDLL(None, use_errno=True).renameat2
+    except (OSError, AttributeError):
+        return False
+    return renameat2(_AT_FDCWD, os.fsencode(first), _AT_FDCWD, os.fsencode(second), _RENAME_EXCHANGE) == 0
+
+
+def publish(staging: str, output_dir: str) -> None:
+    """Replace ``output_dir`` with the staging tree and delete the previous build"""
+    if not os.path.exists(output_dir):
+        os.rename(staging, output_dir)
+        return
+    if _exchange(staging, output_dir):
+        shutil.rmtree(staging)  # Contient maintenant l'ancien build
+        return
+    # Sans échange atomique : deux renommages, l'arborescence manque le temps d'un appel système
+    previous = output_dir.rstrip(os.sep) + '.old'
+    shutil.rmtree(previous, ignore_errors=True)
+    os.rename(output_dir, previous)
+    os.rename(staging, output_dir)
+    shutil.rmtree(previous)
+
+
+class PageCache:
+    """Input digests of the pages of a build, to skip the pages that did not change"""
+
+    def __init__(self, root: str, fragments, extra: Iterable = (), state_file: str = PAGE_STATE_FILE):
+        """
+        ``fragments``: the build's FragmentCache, for template versions (page templates and card partials).
+        ``extra``: other inputs shared by every page (translations, build options), JSON-serializable.
+        """
+        self.root = root
+        self.fragments = fragments
+        shared = [sorted(fragments.version(name) for name in FRAGMENTS.values()), list(extra)]
+        self.salt = hashlib.blake2b(json.dumps(shared, sort_keys=True, ensure_ascii=False).encode('utf-8'),
+                                    digest_size=16).hexdigest()
+        self.state_file = state_file
+        self.previous = self._load()
+        self.current: Dict[str, str] = {}
+        self.rendered = 0
+        self.skipped = 0
+        self._articles: Dict[int, str] = {}  # id(article) -> empreinte, valable le temps du build
+
+    def _load(self) -> Dict[str, str]:
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get('pages', {})
+        except (OSError, ValueError):
+            return {}
+
+    def _encode(self, value):
+        # Articles : par empreinte de contenu, calculée une fois par build
+        if hasattr(value, 'to_dict'):
+            key = id(value)
+            if key not in self._articles:
+                self._articles[key] = article_digest(value)
+            return self._articles[key]
+        return str(value)
+
+    def digest(self, path: str, template_name: str, context: Dict) -> str:
+        """Digest of everything a page is rendered from"""
+        version = self.fragments.version(template_name)
+        payload = json.dumps([self.salt, version, path, context], sort_keys=True,
+                             ensure_ascii=False, default=self._encode)
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+    def unchanged(self, path: str, digest: str) -> bool:
+        """True (and the page is kept) if the previous build wrote it from the same inputs"""
+        if self.previous.get(path) != digest or not os.path.exists(os.path.join(self.root, *path.split('/'))):
+            return False
+        self.current[path] = digest
+        self.skipped += 1
+        return True
+
+    def write(self, path: str, html: str, digest: str) -> None:
+        write_text_atomic(os.path.join(self.root, *path.split('/')), html)
+        self.current[path] = digest
+        self.rendered += 1
+
+    def prune(self, directories: Iterable[str]) -> int:
+        """Delete the files of ``directories`` this build did not produce; return their count"""
+        removed = 0
+        for name in directories:
+            top = os.path.join(self.root, name)
+            for directory, _, files in os.walk(top, topdown=False):
+                for file_name in files:
+                    path = os.path.join(directory, file_name)
+                    if os.path.relpath(path, self.root).replace(os.sep, '/') not in self.current:
+                        os.remove(path)
+                        removed += 1
+                if directory != top and not os.listdir(directory):
+                    os.rmdir(directory)
+        return removed
+
+    def forget(self) -> None:
+        """Delete the saved state (before swapping trees: the previous digests stop describing the output)"""
+        if os.path.exists(self.state_file):
+            os.remove(self.state_file)
+
+    def save(self) -> None:
+        """Record the digests of the pages now published"""
+        write_text_atomic(self.state_file, json.dumps({'pages': dict(sorted(self.current.items()))},
+                                                      separators=(',', ':')))
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Ranking of the home listing and of the trending list.
+
+Articles are scored once, at build time (and when the Flask app reloads its
+data), instead of being reordered in each browser after page load:
+
+- source weight: editorial priority of the source (``SOURCE_WEIGHTS``);
+- coverage: the same story reported by several sources (titles sharing most
+  of their significant words, published within ``COVERAGE_WINDOW_HOURS``)
+  gets a bonus per extra source;
+- recency: the sum decays exponentially with age (``HALF_LIFE_HOURS``).
+
+To avoid long runs of one source at the top, the n-th article of a source
+is multiplied by ``SOURCE_REPEAT_DECAY ** n``. The trending list keeps the
+best article of each story among those of the last ``TRENDING_HOURS``.
+Everything is deterministic: every visitor and the CDN get the same order.
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+from scraper.dates import parse_timestamp, utcnow
+from scraper.topics import normalize
+
+# Priorité éditoriale par source (reprise de l'ancien article-randomizer.js)
+SOURCE_WEIGHTS = {
+    'OpenAI Blog': 10,
+    'Anthropic News': 10,
+    'Google AI Blog': 9,
+    'Hugging Face Blog': 8,
+    'The Verge AI': 7,
+    'TechCrunch AI': 7,
+    'NVIDIA Blog': 7,
+    'VentureBeat AI': 6,
+    'MIT Technology Review AI': 6,
+    'PetaPixel - AI': 6,
+    'RunwayML Blog': 6,
+    'Ars Technica': 5,
+    'Wired AI': 5,
+    'AI News': 5,
+    'Journal du Net - IA': 4,
+    'Siècle Digital - IA': 4,
+    'Maddyness - IA': 3,
+    'Webflow Blog': 3,
+    'Bubble Blog': 3,
+}
+DEFAULT_WEIGHT = 3
+COVERAGE_BONUS = 3          # Points par source supplémentaire couvrant la même info
+COVERAGE_WINDOW_HOURS = 48
+HALF_LIFE_HOURS = 36
+UNDATED_AGE_HOURS = 168     # Articles sans date : traités comme vieux d'une semaine
+SOURCE_REPEAT_DECAY = 0.85
+TRENDING_HOURS = 24
+TRENDING_SIZE = 5
+
+# Mots trop fréquents pour rapprocher deux titres
+_STOPWORDS = {
+    'about', 'after', 'with', 'from', 'that', 'this', 'what', 'will', 'your', 'into', 'over', 'more', 'than',
+    'have', 'just', 'says', 'they', 'their', 'dans', 'pour', 'avec', 'sans', 'plus', 'vous', 'nous', 'sont',
+    'leur', 'cette', 'comme', 'entre', 'selon',
+}
+MIN_SHARED_WORDS = 3
+MIN_SIMILARITY = 0.5        # Jaccard des mots significatifs des titres
+MAX_POSTING = 200           # Mots présents dans plus de titres ignorés (trop communs)
+
+
+def title_words(title: str) -> frozenset:
+    return frozenset(w for w in normalize(title).split() if len(w) > 3 and w not in _STOPWORDS)
+
+
+def publisher(article) -> str:
+    """Site of an article: two feeds of the same site are not independent coverage"""
+    host = urlparse(article.get('url') or '').netloc.lower()
+    return host[4:] if host.startswith('www.') else host or (article.get('source') or '')
+
+
+class Ranking:
+    """Scores, home order and trending list of a set of articles"""
+
+    def __init__(self, articles: Iterable, now: Optional[datetime] = None,
+                 weights: Optional[Dict[str, int]] = None):
+        self.articles = list(articles)
+        self.now = now or utcnow()
+        self.weights = weights if weights is not None else SOURCE_WEIGHTS
+        self.ages = [self._age_hours(article) for article in self.articles]
+        self.publishers = [publisher(article) for article in self.articles]
+        self.stories = self._cluster()
+        story_sources = {}
+        for index, story in enumerate(self.stories):
+            story_sources.setdefault(story, set()).add(self.publishers[index])
+        self.coverage = [len(story_sources[story]) for story in self.stories]
+        self.scores = [self._score(i) for i in range(len(self.articles))]
+        self.ordered = self._order()
+        self.trending = self._trending()
+
+    def _age_hours(self, article) -> float:
+        published = parse_timestamp(article.get('published_at'))
+        if published is None:
+            return UNDATED_AGE_HOURS
+        return max(0.0, (self.now - published).total_seconds() / 3600)
+
+    def _cluster(self) -> List[int]:
+        """Story id of each article: union-find over titles that match across sources"""
+        parent = list(range(len(self.articles)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        words = [title_words(article.get('title', '')) for article in self.articles]
+        postings = {}
+        for index, article_words in enumerate(words):
+            for word in article_words:
+                postings.setdefault(word, []).append(index)
+
+        for index, article_words in enumerate(words):
+            # Candidats : titres partageant des mots, via l'index inversé (pas de comparaison n²)
+            shared = {}
+            for word in article_words:
+                posting = postings[word]
+                if len(posting) > MAX_POSTING:
+                    continue
+                for other in posting:
+                    if other > index:
+                        shared[other] = shared.get(other, 0) + 1
+            for other, count in shared.items():
+                if count < MIN_SHARED_WORDS:
+                    continue
+                if self.publishers[other] == self.publishers[index]:
+                    continue
+                if abs(self.ages[other] - self.ages[index]) > COVERAGE_WINDOW_HOURS:
+                    continue
+                if count / len(article_words | words[other]) >= MIN_SIMILARITY:
+                    parent[find(other)] = find(index)
+        return [find(i) for i in range(len(self.articles))]
+
+    def _score(self, index: int) -> float:
+        article = self.articles[index]
+        base = self.weights.get(article.get('source'), DEFAULT_WEIGHT)
+        base += COVERAGE_BONUS * (self.coverage[index] - 1)
+        return base * 0.5 ** (self.ages[index] / HALF_LIFE_HOURS)
+
+    def _order(self) -> List:
+        # À score égal : le plus récent d'abord, puis l'id (ordre stable d'un build à l'autre)
+        newest_first = sorted(
+            range(len(self.articles)),
+            key=lambda i: (self.articles[i].get('published_at') or '', self.articles[i].get('id') or ''),
+            reverse=True,
+        )
+        by_score = sorted(newest_first, key=lambda i: -self.scores[i])
+        # Diversité : chaque nouvel article d'une même source pèse un peu moins
+        seen = {}
+        adjusted = {}
+        for index in by_score:
+            source = self.articles[index].get('source')
+            adjusted[index] = self.scores[index] * SOURCE_REPEAT_DECAY ** seen.get(source, 0)
+            seen[source] = seen.get(source, 0) + 1
+        return [self.articles[i] for i in sorted(by_score, key=lambda i: -adjusted[i])]
+
+    def _trending(self) -> List:
+        position = {id(article): rank for rank, article in enumerate(self.ordered)}
+        candidates = sorted(
+            (i for i in range(len(self.articles)) if self.ages[i] <= TRENDING_HOURS
+             and parse_timestamp(self.articles[i].get('published_at')) is not None),
+            key=lambda i: (-self.scores[i], position[id(self.articles[i])]),
+        )
+        trending = []
+        stories = set()
+        for index in candidates:
+            if self.stories[index] in stories:
+                continue
+            stories.add(self.stories[index])
+            trending.append(self.articles[index])
+            if len(trending) == TRENDING_SIZE:
+                break
+        return trending
+
@@ -7,43 +7,48 @@ Ce script est destiné à être exécuté par cron pour mettre à jour réguliè
 import os
 import sys
 import logging
+import argparse
 from datetime import datetime
 from scraper.scraper import IANewsScraper
+from scraper import profiling
+from build_static import build_site
+from sitegen.deploy import git_deploy
 
-# Configuration du logging
-log_dir = os.path.join(os.path.dirname(__file__), 'logs')
-os.makedirs(log_dir, exist_ok=True)
-log_file = os.path.join(log_dir, 'update.log')
+def setup_logging():
+    """Journal dans logs/update.log (configuré au lancement, pas à l'import)"""
+    log_dir = os.path.join(os.path.dirname(__file__), 'logs')
+    os.makedirs(log_dir, exist_ok=True)
+    log_file = os.path.join(log_dir, 'update.log')
 
-logging.basicConfig(
-    filename=log_file,
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+    logging.basicConfig(
+        filename=log_file,
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
 
-def main():
+def main(profile=False, budget=None, fulltext=False):
     """Fonction principale pour exécuter la mise à jour des actualités"""
+    if profile:
+        profiling.start('update_news')
     try:
         logging.info("Démarrage de la mise à jour des actualités IA...")
         start_time = datetime.now()
         
         # Exécuter le scraper
         scraper = IANewsScraper()
-        num_news = scraper.run()
+        num_news = scraper.run(budget=budget, fulltext=fulltext)
         
         end_time = datetime.now()
         duration = (end_time - start_time).total_seconds()
         
         logging.info(f"Mise à jour terminée. {num_news} articles trouvés en {duration:.2f} secondes.")
         
-        # Commit and push changes to Git
+        # Régénérer le site puis ne commiter que les fichiers modifiés
         try:
+            build_site()
             logging.info("Commiting changes to git...")
-            subprocess.run(["git", "add", "data/ia_news.json", "public"], check=True, cwd=os.getcwd())
-            subprocess.run(["git", "commit", "-m", "Update news and regenerate site"], check=True, cwd=os.getcwd())
-            logging.info("Pushing changes to git...")
-            subprocess.run(["git", "push"], check=True, cwd=os.getcwd())
-            logging.info("Changes pushed to git successfully.")
+            delta = git_deploy(extra_paths=['data/ia_news.json'], push=True)
+            logging.info(f"Déploiement git : {delta.summary()}")
         except Exception as git_err:
             logging.error(f"Erreur lors du commit/push Git : {str(git_err)}")
         
@@ -51,6 +56,28 @@ def main():
     except Exception as e:
         logging.error(f"Erreur lors de la mise à jour : {str(e)}")
         return 1
+    finally:
+        if profile:
+            logging.info(f"Profil enregistré dans {profiling.stop()}")
 
 if __name__ == "__main__":
-    sys.exit(main())
+    parser = argparse.ArgumentParser(description="Mise à jour des actualités IA (cron)")
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help="Profiler le scraping (phases, mémoire, temps par source) dans data/profiles/"
+    )
+    parser.add_argument(
+        '--budget',
+        type=float,
+        default=None,
+        help="Durée maximale du scraping en secondes ; les sources restantes passent au run suivant"
+    )
+    parser.add_argument(
+        '--fulltext',
+        action='store_true',
+        help="Télécharger le texte intégral des nouveaux articles (cache data/fulltext.sqlite)"
+    )
+    args = parser.parse_args()
+    setup_logging()
+    sys.exit(main(profile=args.profile, budget=args.budget, fulltext=args.fulltext))
@@ -1,4 +1,4 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, abort, g, redirect, url_for
 import json
 import os
 import sys
@@ -8,33 +8,125 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from scraper.scraper import IANewsScraper
+from scraper.article import dump_articles, load_articles
+from scraper.dates import normalize_dates, utcnow
+from scraper.slugs import backfill_identities
+from scraper.store import ArticleStore, write_store
+from sitegen.api import SERIES_DAYS, TREND_WINDOW
+from sitegen.archives import TOPIC_PAGE_SIZE, ArchiveIndex, separate_articles_by_date
+from sitegen.fragments import FragmentCache
+from sitegen.i18n import DEFAULT_LANGUAGE, LANGUAGES, install_i18n, load_translations, localize, page_path
+from sitegen.ranking import Ranking
+from scraper.topics import TOPIC_LABELS, tag_articles, topic_index
 
 app = Flask(__name__)
 app.secret_key = 'your-secret-key-change-me'
 
+# Rendered cards are cached in memory, keyed by article content and template version
+fragments = FragmentCache(app.jinja_env, salt='flask').install()
+install_i18n(app.jinja_env)
+
 # Configuration
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / 'data'
 NEWS_FILE = DATA_DIR / 'ia_news.json'
 
+# Offset-indexed store: single-article reads without parsing the whole JSON
+store = ArticleStore(str(DATA_DIR))
+
+def _store_outdated():
+    return NEWS_FILE.exists() and (
+        not store.exists() or os.path.getmtime(store.index_path) < NEWS_FILE.stat().st_mtime
+    )
+
+def get_store():
+    """Return the indexed store, rebuilding it if it is missing or older than the JSON file"""
+    if _store_outdated():
+        with store.lock:
+            # Requêtes concurrentes : une seule reconstruit, les autres lisent le résultat
+            if _store_outdated():
+                write_store(load_news(), str(DATA_DIR))
+    return store
+
 def load_news():
     """Load news from JSON file"""
     try:
         if NEWS_FILE.exists():
             with open(NEWS_FILE, 'r', encoding='utf-8') as f:
-                news = json.load(f)
-                # Sort by published_date (newest first)
-                news.sort(key=lambda x: x.get('published_date', ''), reverse=True)
+                news = load_articles(json.load(f))
+                # Backfill the canonical UTC timestamp, then sort newest first
+                normalize_dates(news)
+                # Slugs are persisted at ingestion; only legacy records need one
+                backfill_identities(news)
+                # Topics are tagged at ingestion; only legacy records need it
+                tag_articles(news)
+                news.sort(key=lambda x: x.get('published_at', ''), reverse=True)
                 return news
     except Exception as e:
         print(f"Error loading news: {e}")
     return []
 
+# Home ranking, recomputed when the data file changes (and hourly, for the recency decay)
+_ranking_cache = {'key': None, 'ranking': None}
+
+def load_ranking():
+    """Ranked home listing and trending list"""
+    mtime = NEWS_FILE.stat().st_mtime if NEWS_FILE.exists() else None
+    key = (mtime, utcnow().strftime('%Y-%m-%dT%H'))
+    if _ranking_cache['key'] != key:
+        _ranking_cache['ranking'] = Ranking(load_news())
+        _ranking_cache['key'] = key
+    return _ranking_cache['ranking']
+
+# Columnar view of the store for /api/stats, rebuilt only when the data file changes
+_frame_cache = {'key': None, 'frame': None}
+
+def load_frame():
+    """NumPy columns of the articles (timestamps, source/category/type codes)"""
+    # Import à la demande : numpy n'est chargé que par le premier appel à /api/stats
+    from sitegen.analytics import ArticleFrame
+    key = NEWS_FILE.stat().st_mtime if NEWS_FILE.exists() else None
+    if _frame_cache['key'] != key or _frame_cache['frame'] is None:
+        _frame_cache['frame'] = ArticleFrame(load_news())
+        _frame_cache['key'] = key
+    return _frame_cache['frame']
+
+# Sections servies sans préfixe de langue avant les arborescences par langue (cf. netlify.toml)
+LEGACY_SECTIONS = ('article', 'archives', 'topics', 'sources', 'category', 'search')
+
+def legacy_redirect():
+    """301 from an URL of before the language trees to the same page of the French tree"""
+    return redirect(f"/{DEFAULT_LANGUAGE}{request.full_path.rstrip('?')}", code=301)
+
+@app.url_value_preprocessor
+def pull_language(endpoint, values):
+    """Language of the page tree (/fr/…, /en/…), taken out of the view arguments"""
+    lang = values.pop('lang', None) if values else None
+    if lang is not None and lang not in LANGUAGES:
+        # /archives/, /topics/… correspondent aux routes /<lang>/… : anciennes URL
+        abort(legacy_redirect() if lang in LEGACY_SECTIONS else 404)
+    g.lang = lang
+
+@app.url_defaults
+def add_language(endpoint, values):
+    """url_for() stays in the tree of the current page"""
+    if 'lang' not in values and app.url_map.is_endpoint_expecting(endpoint, 'lang'):
+        values['lang'] = g.get('lang') or DEFAULT_LANGUAGE
+
+def render_page(template, **context):
+    """Render a page and fill its interface strings in the page language"""
+    return localize(render_template(template, **context), load_translations()[g.get('lang') or DEFAULT_LANGUAGE])
+
 @app.route('/')
+def index():
+    """Redirect to the tree of the browser language"""
+    return redirect(url_for('home', lang=request.accept_languages.best_match(LANGUAGES) or DEFAULT_LANGUAGE))
+
+@app.route('/<lang>/')
 def home():
     """Home page with all news"""
-    news = load_news()
+    ranking = load_ranking()
+    news = ranking.ordered
 
     # Count by category
     categories = {}
@@ -42,9 +134,10 @@ def home():
         cat = article.get('category', 'general')
         categories[cat] = categories.get(cat, 0) + 1
 
-    return render_template(
+    return render_page(
         'index.html',
         news=news,
+        trending=ranking.trending,
         categories=categories,
         total_articles=len(news),
         last_updated=datetime.now().strftime("%d %B %Y à %H:%M")
@@ -60,38 +153,24 @@ def api_news():
     if category != 'all':
         news = [n for n in news if n.get('category') == category]
 
-    return jsonify(news[:limit])
+    return jsonify(dump_articles(news[:limit]))
 
 @app.route('/api/stats')
 def api_stats():
-    """API endpoint for statistics"""
-    news = load_news()
-
-    categories = {}
-    sources = {}
-    source_types = {}
-
-    for article in news:
-        cat = article.get('category', 'general')
-        categories[cat] = categories.get(cat, 0) + 1
-
-        src = article.get('source', 'Unknown')
-        sources[src] = sources.get(src, 0) + 1
-
-        stype = article.get('source_type', 'unknown')
-        source_types[stype] = source_types.get(stype, 0) + 1
-
-    return jsonify({
-        'total_articles': len(news),
-        'categories': categories,
-        'sources': sources,
-        'source_types': source_types,
-        'last_updated': datetime.now().isoformat()
-    })
+    """API endpoint for statistics: counts, daily series and publishing trends"""
+    days = min(max(request.args.get('days', type=int, default=SERIES_DAYS), 1), 365)
+    window = min(max(request.args.get('window', type=int, default=TREND_WINDOW), 1), days)
+    stats = load_frame().summary(days=days, window=window)
+    stats['last_updated'] = datetime.now().isoformat()
+    return jsonify(stats)
 
 @app.route('/refresh')
 def refresh():
     """Manually trigger scraper"""
+    # Import à la demande : requests, bs4, feedparser et le traducteur ne
+    # sont chargés par les workers que si /refresh est appelé
+    from scraper.scraper import IANewsScraper
+
     try:
         scraper = IANewsScraper()
         count = scraper.run()
@@ -106,13 +185,13 @@ def refresh():
             'message': str(e)
         }), 500
 
-@app.route('/category/<category>')
+@app.route('/<lang>/category/<category>')
 def category(category):
     """Category page"""
     all_news = load_news()
     news = [n for n in all_news if n.get('category') == category]
 
-    return render_template(
+    return render_page(
         'index.html',
         news=news,
         current_category=category,
@@ -120,6 +199,88 @@ def category(category):
     )
 
 @app.route('/search')
+@app.route('/<any(article, archives, topics, sources, category, search):section>/<path:rest>')
+def legacy_page(section=None, rest=None):
+    """Pages from before the language trees (the section roots go through pull_language)"""
+    return legacy_redirect()
+
+@app.route('/<lang>/article/<article_slug>')
+def article_detail_page(article_slug):
+    """Article page, read from the indexed store without loading the other articles"""
+    if article_slug.endswith('.html'):
+        article_slug = article_slug[:-len('.html')]
+    article = get_store().get_by_slug(article_slug)
+    if article is None:
+        abort(404)
+    # Full text, when the full-text stage fetched it: read for this page only, never with the listings
+    from scraper.fulltext import read_body
+
+    return render_page('article.html', article=article, body=read_body(article['url']), related_articles=[])
+
+def load_archive_index():
+    """Index of the archived articles (older than 7 days)"""
+    _, archived = separate_articles_by_date(load_news())
+    return ArchiveIndex(archived)
+
+def render_archives(index, category='all', month=None):
+    return render_page(
+        'archives.html',
+        category=category,
+        month=month,
+        archive_index=index.summary(),
+        archive_count=len(index)
+    )
+
+@app.route('/<lang>/archives/')
+def archives():
+    """Archives home: month counts of every category"""
+    return render_archives(load_archive_index())
+
+@app.route('/<lang>/archives/<category>/')
+def archives_category(category):
+    """Archives of a single category: month counts"""
+    index = load_archive_index()
+    name = index.find_category(category)
+    if name is None:
+        abort(404)
+    return render_archives(index, category=name)
+
+@app.route('/<lang>/archives/<category>/<month>/')
+def archives_month(category, month):
+    """Archived articles of a category for one month (YYYY-MM)"""
+    index = load_archive_index()
+    name = index.find_category(category)
+    bucket = index.month(name, month) if name else None
+    if bucket is None:
+        abort(404)
+    return render_archives(index, category=name, month=bucket)
+
+def render_topics(topic=None):
+    by_topic = topic_index(load_news())
+    if topic is not None and topic not in by_topic:
+        abort(404)
+    items = by_topic.get(topic, [])
+    return render_page(
+        'topics.html',
+        topic=topic,
+        topic_label=TOPIC_LABELS.get(topic),
+        total=len(items),
+        news=items[:TOPIC_PAGE_SIZE],
+        topic_counts={name: len(articles) for name, articles in by_topic.items()},
+        topic_labels=TOPIC_LABELS
+    )
+
+@app.route('/<lang>/topics/')
+def topics():
+    """Topic index: article count per detected topic"""
+    return render_topics()
+
+@app.route('/<lang>/topics/<topic>/')
+def topic(topic):
+    """Latest articles of one topic"""
+    return render_topics(topic)
+
+@app.route('/<lang>/search')
 def search():
     """Search news"""
     query = request.args.get('q', '').lower()
@@ -132,7 +293,7 @@ def search():
             or query in n.get('description', '').lower()
         ]
 
-    return render_template(
+    return render_page(
         'index.html',
         news=news,
         search_query=query,
@@ -184,14 +345,18 @@ def rss():
 @app.errorhandler(404)
 def not_found(error):
     """404 error handler"""
-    return render_template('404.html'), 404
+    return render_page('404.html'), 404
 
 @app.context_processor
 def inject_globals():
     """Inject global variables into templates"""
+    lang = g.get('lang') or DEFAULT_LANGUAGE
     return {
         'current_year': datetime.now().year,
-        'app_name': 'IA News'
+        'app_name': 'IA News',
+        'lang': lang,
+        'page_path': page_path(request.path),
+        'i18n_strings': load_translations()[lang]
     }
 
 if __name__ == '__main__':
@@ -202,7 +367,7 @@ if __name__ == '__main__':
     print("\n" + "="*60)
     print("🚀 IA News Web Server")
     print("="*60)
-    print("📍 http://localhost:8001")
+    print("📍 http://localhost:8001 (/fr/, /en/)")
     print("🔄 RSS: http://localhost:8001/rss")
     print("📊 API: http://localhost:8001/api/news")
     print("="*60 + "\n")
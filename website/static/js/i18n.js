@@ -1,24 +1,22 @@
 /**
  * Simple i18n system for AI News
  * Supports FR (default) and EN
- * Uses localStorage for persistence
+ * Each language has its own page tree (/fr/…, /en/…), already translated
+ * server-side: the page language comes from <html lang>, the page only
+ * embeds that language's strings (for texts built at runtime), and
+ * switching language opens the hreflang alternate of the page.
  */
 
 class I18n {
     constructor() {
         this.translations = {};
-        this.currentLanguage = localStorage.getItem('language') || 'fr';
+        this.currentLanguage = document.documentElement.lang || 'fr';
         this.init();
     }
 
-    async init() {
-        try {
-            const response = await fetch('/static/i18n/translations.json');
-            this.translations = await response.json();
-            this.applyLanguage();
-        } catch (error) {
-            console.error('Error loading translations:', error);
-        }
+    init() {
+        // Strings of the page language, inlined in the page or precompiled into its bundle
+        this.translations = window.I18N_TRANSLATIONS || {};
     }
 
     /**
@@ -50,21 +48,19 @@ class I18n {
     }
 
     /**
-     * Set language and update all translatable elements
+     * Open the same page in another language (its hreflang alternate)
      */
     setLanguage(lang) {
-        if (lang === 'fr' || lang === 'en') {
-            this.currentLanguage = lang;
-            localStorage.setItem('language', lang);
-            this.applyLanguage();
-
-            // Trigger language changed event
-            window.dispatchEvent(new CustomEvent('languageChanged', { detail: { language: lang } }));
+        if (lang === this.currentLanguage) return;
+        const alternate = document.querySelector(`link[rel="alternate"][hreflang="${lang}"]`);
+        if (alternate) {
+            window.location.href = alternate.getAttribute('href');
         }
     }
 
     /**
-     * Apply translations to all elements with data-i18n attribute
+     * Apply translations to elements with data-i18n attribute
+     * (server-rendered pages are already translated: for elements built at runtime)
      */
     applyLanguage() {
         // Update elements with data-i18n
@@ -23,11 +23,6 @@ class SearchEngine {
         // Setup search elements
         this.setupSearchUI();
 
-        // Listen for language changes
-        window.addEventListener('languageChanged', () => {
-            this.updateSearchUI();
-        });
-
         // Keyboard shortcut: Ctrl/Cmd + K
         document.addEventListener('keydown', (e) => {
             if ((e.ctrlKey || e.metaKey) && e.key === 'k') {
@@ -134,6 +129,11 @@ class SearchEngine {
                 navActions.insertBefore(searchBtn, navActions.firstChild);
             }
         }
+
+        // Search UI is built at runtime: translate it in the page language
+        if (typeof i18n !== 'undefined') {
+            i18n.applyLanguage();
+        }
     }
 
     /**
@@ -256,18 +256,6 @@ class SearchEngine {
         }
     }
 
-    /**
-     * Update search UI after language change
-     */
-    updateSearchUI() {
-        if (i18n) {
-            const searchInput = document.getElementById('searchInput');
-            if (searchInput) {
-                searchInput.placeholder = i18n.t('search.filter_by_source');
-            }
-        }
-        this.performSearch();
-    }
 }
 
 // Initialize search globally when DOM is ready